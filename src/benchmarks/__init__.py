@@ -0,0 +1,6 @@
+"""
+Benchmarks for the blockchain implementation
+
+Run them from the src folder, for instance:
+python -m benchmarks.bench_block_hash
+"""
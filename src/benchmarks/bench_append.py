@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+import argparse
+import datetime
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def make_batches(blocks: int, txs_per_block: int):
+    token = Token.intern("Tekra", "TEK", 100.0)
+    return [
+        [Transaction("Mathieu", "Franck", token, float(i), "2025-07-15T12:00:00") for i in range(b * txs_per_block, (b + 1) * txs_per_block)]
+        for b in range(blocks)
+    ]
+
+
+def new_blockchain():
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    return BlockChain([genesis], genesis)
+
+
+def rebuild_on_append(blockchain: BlockChain, transactions: list):
+    """What add_block did before: the caller's block was thrown away and built again"""
+    last = blockchain.get_last()
+    block = Block(last.index + 1, datetime.datetime.now().isoformat(), transactions, last.hash, "")
+    new = Block(last.index + 1, datetime.datetime.now().isoformat(), block.transactions, last.hash, block.hash)
+    blockchain.blocks.append(new)
+    blockchain.find_transaction(transactions[0].txid)
+    blockchain.balance("Franck", "TEK")
+
+
+def verify_as_is(blockchain: BlockChain, transactions: list):
+    blockchain.add_block(blockchain.new_block(transactions))
+
+
+def builder(blockchain: BlockChain, transactions: list):
+    blockchain.append_transactions(transactions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Appending blocks one by one: rebuilt block vs verified as is vs builder")
+    parser.add_argument("--blocks", type=int, default=200, help="blocks appended")
+    parser.add_argument("--txs", type=int, default=1_000, help="transactions per block")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path, the best one is kept")
+    args = parser.parse_args()
+
+    runs = [
+        ("block rebuilt on append", rebuild_on_append),
+        ("add_block, verified as is", verify_as_is),
+        ("append_transactions", builder),
+    ]
+    for label, append in runs:
+        best = float("inf")
+        for _ in range(args.repeat):
+            # fresh transactions, their cached txids would favour the later runs
+            batches = make_batches(args.blocks, args.txs)
+            blockchain = new_blockchain()
+            start = time.perf_counter()
+            for transactions in batches:
+                append(blockchain, transactions)
+            # a block verified on append is not checked again
+            assert blockchain.validate()
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:26}: {args.blocks / best:10.0f} appends/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import argparse
+import random
+import time
+from crypto import batch as batch_module
+from crypto.batch import TransactionBatch
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def sum_by_token_objects(transactions):
+    totals = {}
+    for tx in transactions:
+        totals[tx.token.symbol] = totals.get(tx.token.symbol, 0.0) + tx.amount
+    return totals
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics: Transaction objects vs TransactionBatch columns")
+    parser.add_argument("--transactions", type=int, default=1_000_000, help="transactions in the batch")
+    parser.add_argument("--accounts", type=int, default=1_000, help="distinct accounts")
+    args = parser.parse_args()
+
+    tokens = [Token.intern("Tekra", "TEK", 100.0), Token.intern("Bitcoin", "BTC", 1.0), Token.intern("Ethereum", "ETH", 2.0)]
+    accounts = [f"account-{i}" for i in range(args.accounts)]
+    transactions = [
+        Transaction(random.choice(accounts), random.choice(accounts), random.choice(tokens), random.random() * 100,
+                    f"2025-07-{random.randint(1, 28):02d}T12:00:00")
+        for _ in range(args.transactions)
+    ]
+
+    start = time.perf_counter()
+    batch = TransactionBatch.from_transactions(transactions)
+    print(f"  build batch              : {(time.perf_counter() - start) * 1000:9.1f} ms")
+    print(f"  sum by token, objects    : {timed(sum_by_token_objects, transactions):9.1f} ms")
+    print(f"  sum by token, batch      : {timed(batch.sum_by_token):9.1f} ms ({'numpy' if batch_module.np is not None else 'pure python'})")
+    print(f"  sum by sender, batch     : {timed(batch.sum_by_account):9.1f} ms")
+    print(f"  time range filter, batch : {timed(batch.between, '2025-07-10T00:00:00', '2025-07-20T00:00:00'):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
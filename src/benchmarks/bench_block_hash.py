@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+import argparse
+import hashlib
+import time
+from crypto.block import Block
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def legacy_hash(block):
+    """
+    Hash of a block as it was computed before the canonical encoding (dataclass repr)
+    """
+    block_string = f"{block.index}{block.timestamp}{block.transactions}{block.previous_hash}".encode()
+    return hashlib.sha256(block_string).hexdigest()
+
+
+def canonical_hash(block):
+    """
+    Hash of a block over the canonical encoding, Merkle tree and txids included
+    (assigning the transactions drops the cached tree)
+    """
+    for tx in block.transactions:
+        tx._txid = None
+    block.transactions = block.transactions
+    return block.compute_hash()
+
+
+def txid_tree_hash(block):
+    """
+    Hash of a block whose Merkle tree is rebuilt from the cached txids
+    """
+    block.transactions = block.transactions
+    return block.compute_hash()
+
+
+def make_block(nb_transactions):
+    """
+    Build a block holding nb_transactions transactions
+    """
+    token = Token("Tekra", "TEK", 100.0)
+    transactions = [
+        Transaction(f"sender{i}", f"receiver{i}", token, float(i), "2025-07-15T12:00:00")
+        for i in range(nb_transactions)
+    ]
+    return Block(1, "2025-07-15T12:00:00", transactions, "Genesis", "")
+
+
+def hashes_per_sec(func, block, repeat):
+    # the fastest of repeat hashes (like timeit), the least disturbed by the rest of the machine
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(block)
+        best = min(best, time.perf_counter() - start)
+    return 1 / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block hashing throughput: dataclass repr vs canonical encoding")
+    parser.add_argument("--transactions", type=int, default=10_000, help="transactions per block")
+    parser.add_argument("--repeat", type=int, default=20, help="hashes per measure (the fastest one is kept)")
+    args = parser.parse_args()
+
+    block = make_block(args.transactions)
+    legacy = hashes_per_sec(legacy_hash, block, args.repeat)
+    canonical = hashes_per_sec(canonical_hash, block, args.repeat)
+    txids = hashes_per_sec(txid_tree_hash, block, args.repeat)
+    cached = hashes_per_sec(Block.compute_hash, block, args.repeat)
+
+    print(f"Block with {args.transactions} transactions")
+    print(f"  repr hashing      : {legacy:10.2f} hashes/sec")
+    print(f"  canonical hashing : {canonical:10.2f} hashes/sec (Merkle tree rebuilt)")
+    print(f"  cached txids      : {txids:10.2f} hashes/sec (Merkle tree rebuilt from Transaction.txid)")
+    print(f"  header re-hashing : {cached:10.2f} hashes/sec (cached Merkle root)")
+    print(f"  speedup           : {canonical / legacy:10.2f}x / {cached / legacy:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
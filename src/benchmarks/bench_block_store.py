@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+import argparse
+import random
+import tempfile
+import time
+from crypto.block import Block
+from crypto.store import BlockStore
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block store: open time and random reads vs loading the whole chain")
+    parser.add_argument("--blocks", type=int, default=100_000, help="blocks in the store")
+    parser.add_argument("--transactions", type=int, default=10, help="transactions per block")
+    parser.add_argument("--reads", type=int, default=10_000, help="random reads")
+    args = parser.parse_args()
+
+    token = Token("Tekra", "TEK", 100.0)
+    with tempfile.TemporaryDirectory() as directory:
+        with BlockStore(directory) as store:
+            previous = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+            store.append(previous)
+            for i in range(1, args.blocks):
+                transactions = [Transaction("Mathieu", "Franck", token, float(j), "2025-07-15T12:00:00") for j in range(args.transactions)]
+                previous = Block(i, "2025-07-15T12:00:00", transactions, previous.hash, "")
+                store.append(previous)
+
+        start = time.perf_counter()
+        store = BlockStore(directory)
+        print(f"  open          : {(time.perf_counter() - start) * 1000:10.2f} ms for {len(store)} blocks")
+
+        positions = [random.randrange(len(store)) for _ in range(args.reads)]
+        start = time.perf_counter()
+        for position in positions:
+            store[position]
+        elapsed = time.perf_counter() - start
+        print(f"  random reads  : {args.reads / elapsed:10.0f} blocks/sec")
+
+        start = time.perf_counter()
+        store.load_blockchain()
+        print(f"  full load     : {(time.perf_counter() - start) * 1000:10.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+import argparse
+import io
+import json
+import time
+import tracemalloc
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+from exporter import block_to_dict, write_blockchain
+
+
+def dump_dict(blockchain, f, compact):
+    data = {'genesis': block_to_dict(blockchain.genesis), 'blocks': [block_to_dict(b) for b in blockchain.blocks]}
+    if compact:
+        json.dump(data, f, separators=(',', ':'))
+    else:
+        json.dump(data, f, indent=2)
+
+
+class _NullWriter(io.TextIOBase):
+    """Discard the output, only the exporter's own memory is measured"""
+
+    def write(self, s):
+        return len(s)
+
+
+def measure(export, blockchain, compact):
+    tracemalloc.start()
+    start = time.perf_counter()
+    export(blockchain, _NullWriter(), compact)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Results export: whole dict + json.dump vs streaming, time and peak memory")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[1_000, 10_000], help="chain lengths")
+    parser.add_argument("--transactions", type=int, default=10, help="transactions per block")
+    args = parser.parse_args()
+
+    token = Token("Tekra", "TEK", 100.0)
+    for length in args.blocks:
+        genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+        blocks = [genesis]
+        for i in range(1, length):
+            transactions = [Transaction("Mathieu", "Franck", token, float(j), "2025-07-15T12:00:00") for j in range(args.transactions)]
+            blocks.append(Block(i, "2025-07-15T12:00:00", transactions, blocks[-1].hash, ""))
+        blockchain = BlockChain(blocks, genesis)
+
+        print(f"{length} blocks:")
+        for compact in (False, True):
+            for name, export in (("dict + json.dump", dump_dict), ("streaming", write_blockchain)):
+                elapsed, peak = measure(export, blockchain, compact)
+                mode = "compact" if compact else "indent "
+                print(f"  {mode} {name:16}: {elapsed * 1000:9.1f} ms, peak {peak / 2 ** 20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import argparse
+import random
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.ledger import apply_transactions
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balances: replay from genesis vs ledger and snapshots")
+    parser.add_argument("--blocks", type=int, default=50_000, help="blocks in the chain")
+    parser.add_argument("--transactions", type=int, default=10, help="transactions per block")
+    parser.add_argument("--queries", type=int, default=100, help="random state_at queries")
+    args = parser.parse_args()
+
+    tokens = [Token.intern("Tekra", "TEK", 100.0), Token.intern("Bitcoin", "BTC", 1.0)]
+    accounts = [f"account-{i}" for i in range(100)]
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    blocks = [genesis]
+    for i in range(1, args.blocks):
+        transactions = [Transaction(random.choice(accounts), random.choice(accounts), random.choice(tokens), 1.0, "2025-07-15T12:00:00")
+                        for _ in range(args.transactions)]
+        blocks.append(Block.restore(i, "2025-07-15T12:00:00", transactions, blocks[-1].hash, f"{i:064x}"))
+    blockchain = BlockChain(blocks, genesis)
+
+    start = time.perf_counter()
+    balances = {}
+    for block in blocks:
+        apply_transactions(balances, block.transactions)
+    replay = time.perf_counter() - start
+    print(f"  replay from genesis  : {replay * 1000:9.1f} ms per balance query")
+
+    start = time.perf_counter()
+    blockchain.ledger
+    print(f"  ledger catch-up      : {(time.perf_counter() - start) * 1000:9.1f} ms once, then O(1) per balance query")
+
+    heights = [random.randrange(len(blocks)) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for height in heights:
+        blockchain.state_at(height)
+    elapsed = (time.perf_counter() - start) / args.queries
+    print(f"  state_at (snapshots) : {elapsed * 1000:9.1f} ms per query vs {replay / 2 * 1000:.1f} ms replaying half the chain on average")
+
+
+if __name__ == "__main__":
+    main()
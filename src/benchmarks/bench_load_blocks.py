@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+import argparse
+import time
+from crypto.block_chain import BlockChain
+from crypto.block import Block
+
+
+def legacy_blocks_setter(value):
+    """
+    Type checks of the blocks setter before the batch check (one isinstance per block)
+    """
+    if not isinstance(value, list):
+        raise TypeError("Blocks must be a list")
+    for block in value:
+        if not isinstance(block, Block):
+            raise TypeError("All items in blocks must be Block instances")
+
+
+def make_blocks(nb_blocks):
+    """
+    Build nb_blocks linked blocks without transactions, genesis included
+    """
+    blocks = [Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")]
+    for i in range(1, nb_blocks):
+        blocks.append(Block(i, "2025-07-15T12:00:00", [], blocks[-1].hash, ""))
+    return blocks
+
+
+def timed(label, func, nb_blocks):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:32s}: {elapsed * 1000:9.1f} ms  {nb_blocks / elapsed:14.0f} blocks/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loading a large list of blocks into a BlockChain")
+    parser.add_argument("--blocks", type=int, default=1_000_000, help="blocks to load")
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.blocks)
+    genesis_block = blocks[0]
+    print(f"Loading {args.blocks} blocks")
+
+    def legacy():
+        # what loading cost before: the per-block setter loop, then add_block-like checks per append
+        legacy_blocks_setter(blocks)
+        chain = BlockChain([genesis_block], genesis_block)
+        for block in blocks[1:]:
+            if block.previous_hash != chain.blocks[-1].hash:
+                raise ValueError("Block's previous hash does not match the last block's hash")
+            chain.blocks.append(block)
+
+    timed("before: per-block setter/append", legacy, args.blocks)
+    timed("after: BlockChain(blocks)", lambda: BlockChain(blocks, genesis_block), args.blocks)
+    timed("after: extend(blocks)", lambda: BlockChain([], genesis_block).extend(blocks), args.blocks)
+    timed("after: extend(blocks, trusted=True)", lambda: BlockChain([], genesis_block).extend(blocks, trusted=True), args.blocks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+import argparse
+import io
+import json
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+from exporter import write_blockchain
+
+
+def rebuild_hashing(data):
+    """The previous loader: every Block constructor re-computes its hash"""
+    def block(d):
+        transactions = [Transaction(tx['sender'], tx['receiver'], Token(*tx['token'].values()), tx['amount'], tx['timestamp']) for tx in d['transactions']]
+        return Block(d['index'], d['timestamp'], transactions, d['previous_hash'], d['hash'], d['nonce'], d['difficulty'])
+    genesis = block(data['genesis'])
+    return BlockChain([block(d) for d in data['blocks']], genesis)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Restart time: rebuilding a chain from its results JSON")
+    parser.add_argument("--blocks", type=int, default=20_000, help="blocks in the chain")
+    parser.add_argument("--transactions", type=int, default=10, help="transactions per block")
+    args = parser.parse_args()
+
+    token = Token("Tekra", "TEK", 100.0)
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    blocks = [genesis]
+    for i in range(1, args.blocks):
+        transactions = [Transaction("Mathieu", "Franck", token, float(j), "2025-07-15T12:00:00") for j in range(args.transactions)]
+        blocks.append(Block(i, "2025-07-15T12:00:00", transactions, blocks[-1].hash, ""))
+    output = io.StringIO()
+    write_blockchain(BlockChain(blocks, genesis), output, compact=True)
+
+    start = time.perf_counter()
+    data = json.loads(output.getvalue())
+    parse = time.perf_counter() - start
+    print(f"  json parse                 : {parse * 1000:9.1f} ms")
+    for name, load in (("Block() re-hashing", rebuild_hashing),
+                       ("from_dict verify", BlockChain.from_dict),
+                       ("from_dict trusted", lambda d: BlockChain.from_dict(d, trust_stored_hashes=True))):
+        start = time.perf_counter()
+        load(data)
+        print(f"  {name:27}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+import argparse
+import random
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.mempool import Mempool
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block assembly: one transaction per block vs mempool blocks")
+    parser.add_argument("--transactions", type=int, default=100_000, help="pending transactions")
+    parser.add_argument("--block-txs", type=int, default=5_000, help="transactions per mempool block")
+    args = parser.parse_args()
+
+    token = Token.intern("Tekra", "TEK", 100.0)
+    transactions = [Transaction("Mathieu", "Franck", token, float(i), "2025-07-15T12:00:00") for i in range(args.transactions)]
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+
+    blockchain = BlockChain([genesis], genesis)
+    start = time.perf_counter()
+    for tx in transactions:
+        last = blockchain.get_last()
+        blockchain.extend([Block(last.index + 1, "2025-07-15T12:00:00", [tx], last.hash, "")])
+    elapsed = time.perf_counter() - start
+    print(f"  one transaction per block : {args.transactions / elapsed:10.0f} tx/sec, {len(blockchain.blocks)} blocks")
+
+    blockchain = BlockChain([genesis], genesis)
+    mempool = Mempool(blockchain)
+    start = time.perf_counter()
+    for tx in transactions:
+        mempool.add(tx, fee=random.random())
+    added = time.perf_counter() - start
+    while len(mempool):
+        blockchain.extend([mempool.build_block(max_txs=args.block_txs)])
+    elapsed = time.perf_counter() - start
+    print(f"  mempool add               : {args.transactions / added:10.0f} tx/sec")
+    label = f"mempool, {args.block_txs} tx blocks"
+    print(f"  {label:26}: {args.transactions / elapsed:10.0f} tx/sec, {len(blockchain.blocks)} blocks")
+
+
+if __name__ == "__main__":
+    main()
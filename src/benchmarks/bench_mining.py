@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import argparse
+import hashlib
+import os
+import time
+from crypto.block import Block
+from crypto.encoding import encode_block_header
+from crypto.mining import mine
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def naive_hashes_per_sec(block, attempts):
+    """
+    Hash rate when the whole header is re-encoded and re-hashed for every nonce
+    """
+    start = time.perf_counter()
+    for nonce in range(attempts):
+        block.nonce = nonce
+        hashlib.sha256(encode_block_header(block)).digest()
+    return attempts / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proof of work hash rate per core")
+    parser.add_argument("--attempts", type=int, default=500_000, help="nonces tried per worker")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="highest number of processes tried")
+    parser.add_argument("--difficulty", type=int, default=0, help="also mine a block at this difficulty")
+    args = parser.parse_args()
+
+    token = Token("Tekra", "TEK", 100.0)
+    transactions = [Transaction("Mathieu", "Franck", token, float(i), "2025-07-15T12:00:00") for i in range(1000)]
+    # nothing can reach a 256 bits difficulty, the whole range is searched
+    block = Block(1, "2025-07-15T12:00:00", transactions, "Genesis", "", 0, 256)
+
+    print(f"  naive (full header)  : {naive_hashes_per_sec(block, args.attempts // 10):12.0f} hashes/sec")
+    counts = [1 << i for i in range(args.max_workers.bit_length()) if 1 << i < args.max_workers] + [args.max_workers]
+    for workers in counts:
+        result = mine(block, workers=workers, max_nonce=args.attempts * workers)
+        print(f"  {workers:3d} worker(s) midstate: {result.hashes_per_sec:12.0f} hashes/sec  {result.hashes_per_sec_per_core:12.0f} hashes/sec/core")
+
+    if args.difficulty:
+        block.difficulty = args.difficulty
+        result = mine(block, workers=args.max_workers)
+        print(f"Difficulty {args.difficulty}: nonce {result.nonce} after {result.attempts} attempts in {result.seconds:.2f}s, hash {result.hash}")
+
+
+if __name__ == "__main__":
+    main()
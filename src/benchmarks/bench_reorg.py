@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+import argparse
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.block_tree import BlockTree
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def grow(parent: Block, length: int, receiver: str, token: Token):
+    blocks = []
+    for _ in range(length):
+        tx = Transaction("Mathieu", receiver, token, float(parent.index + 1), "2025-07-15T12:00:00")
+        parent = Block(parent.index + 1, "2025-07-15T12:00:00", [tx], parent.hash, "")
+        blocks.append(parent)
+    return blocks
+
+
+def warm(blockchain: BlockChain):
+    """Build the derived state: ledger, block and txid indexes"""
+    blockchain.balance("Franck", "TEK")
+    blockchain.get_by_hash(blockchain.get_last().hash)
+    blockchain.find_transaction(blockchain.get_last().transactions[0].txid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reorganisation: diverging suffix switch vs rebuild from genesis")
+    parser.add_argument("--blocks", type=int, default=100_000, help="blocks in the active chain")
+    parser.add_argument("--depth", type=int, default=3, help="blocks replaced by the competing branch")
+    args = parser.parse_args()
+
+    token = Token.intern("Tekra", "TEK", 100.0)
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    main_branch = grow(genesis, args.blocks, "Franck", token)
+    fork = main_branch[-args.depth - 1]
+    side = grow(fork, args.depth + 1, "Sarah", token)
+
+    blockchain = BlockChain([genesis] + main_branch, genesis)
+    warm(blockchain)
+    tree = BlockTree(blockchain, prefer="length")
+    start = time.perf_counter()
+    for block in side:
+        tree.add(block)
+    warm(blockchain)
+    elapsed = time.perf_counter() - start
+    print(f"  suffix switch       : {elapsed * 1000:10.2f} ms")
+
+    start = time.perf_counter()
+    rebuilt = BlockChain([genesis] + main_branch[:-args.depth] + side, genesis)
+    warm(rebuilt)
+    elapsed = time.perf_counter() - start
+    print(f"  rebuild from genesis: {elapsed * 1000:10.2f} ms")
+    assert rebuilt.balance("Sarah", "TEK") == blockchain.balance("Sarah", "TEK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import time
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.tokens import Token
+from crypto.transactions import Transaction
+from network.sync import SyncServer, sync_from
+
+
+def build_chain(blocks: int, txs_per_block: int):
+    token = Token.intern("Tekra", "TEK", 100.0)
+    genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    blockchain = BlockChain([genesis], genesis)
+    for index in range(1, blocks + 1):
+        transactions = [Transaction("Mathieu", "Franck", token, float(i), "2025-07-15T12:00:00") for i in range(txs_per_block)]
+        blockchain.extend([Block(index, "2025-07-15T12:00:00", transactions, blockchain.blocks[-1].hash, "")])
+    return genesis, blockchain
+
+
+async def timed_sync(source: BlockChain, genesis: Block, **options):
+    target = BlockChain([genesis], genesis)
+    async with SyncServer(source) as server:
+        await server.start()
+        start = time.perf_counter()
+        appended = await sync_from(target, *server.address, **options)
+        return appended, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block sync between two nodes over localhost TCP")
+    parser.add_argument("--blocks", type=int, default=5_000, help="blocks to sync")
+    parser.add_argument("--txs", type=int, default=10, help="transactions per block")
+    args = parser.parse_args()
+
+    genesis, source = build_chain(args.blocks, args.txs)
+    runs = [
+        ("one block per request", dict(body_batch=1, connections=1)),
+        ("batched, 1 connection", dict(connections=1)),
+        ("batched, 4 connections", dict(connections=4)),
+    ]
+    for label, options in runs:
+        appended, elapsed = asyncio.run(timed_sync(source, genesis, **options))
+        print(f"  {label:24}: {appended / elapsed:10.0f} blocks/sec")
+
+
+if __name__ == "__main__":
+    main()
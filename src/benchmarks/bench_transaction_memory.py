@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+# the previous layout: regular dataclasses, one __dict__ per instance
+@dataclass
+class DictToken:
+    _name: str
+    _symbol: str
+    _value: float
+
+
+@dataclass
+class DictTransaction:
+    _sender: str
+    _receiver: str
+    _token: DictToken
+    _amount: float
+    _timestamp: str
+
+
+TOKENS = [("Tekra", "TEK", 100.0), ("Bitcoin", "BTC", 1.0), ("Ethereum", "ETH", 2.0)]
+
+
+def build(count, make_token, make_transaction):
+    # senders, receivers and timestamps are shared strings, as after JSON parsing with few distinct accounts
+    return [make_transaction("Mathieu", "Franck", make_token(*TOKENS[i % len(TOKENS)]), float(i), "2025-07-15T12:00:00")
+            for i in range(count)]
+
+
+def bytes_per_transaction(count, make_token, make_transaction):
+    tracemalloc.start()
+    transactions = build(count, make_token, make_transaction)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del transactions
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per transaction: dict dataclasses vs slotted, with and without interned tokens")
+    parser.add_argument("--transactions", type=int, default=200_000, help="transactions to build")
+    args = parser.parse_args()
+
+    for name, make_token, make_transaction in (
+        ("dict dataclasses", DictToken, DictTransaction),
+        ("slotted", Token, Transaction),
+        ("slotted + Token.intern", Token.intern, Transaction),
+    ):
+        print(f"  {name:23}: {bytes_per_transaction(args.transactions, make_token, make_transaction):7.1f} bytes/transaction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+import argparse
+import os
+import time
+from crypto.block_chain import BlockChain
+from crypto.block import Block
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+
+def make_chain(nb_blocks):
+    """
+    Build a valid chain of nb_blocks blocks holding one transaction each
+    """
+    token = Token("Tekra", "TEK", 100.0)
+    genesis_block = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    blocks = [genesis_block]
+    previous_hash = genesis_block.hash
+    for i in range(1, nb_blocks):
+        tx = Transaction("Mathieu", "Franck", token, float(i), "2025-07-15T12:00:00")
+        block = Block(i, "2025-07-15T12:00:00", [tx], previous_hash, "")
+        blocks.append(block)
+        previous_hash = block.hash
+    return BlockChain(blocks, genesis_block)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full chain verification scaling with the number of processes")
+    parser.add_argument("--blocks", type=int, default=1_000_000, help="blocks in the chain")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="highest number of processes tried")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    blockchain = make_chain(args.blocks)
+    print(f"Built a chain of {args.blocks} blocks in {time.perf_counter() - start:.1f}s")
+
+    # 1, 2, 4, ... up to max_workers
+    counts = [1 << i for i in range(args.max_workers.bit_length()) if 1 << i < args.max_workers] + [args.max_workers]
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        report = blockchain.verify_parallel(workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        assert report, report
+        print(f"  {workers:3d} worker(s): {elapsed:7.2f}s  {args.blocks / elapsed:12.0f} blocks/sec  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+CHECKPOINT_VERSION = 1
+HASH_BUFFER_SIZE = 1 << 20
+
+
+def file_digest(file_path):
+    """
+    SHA-256 of a file content, read by chunks
+
+    Args:
+    file_path (str): the path to the file
+
+    Returns:
+    str: the hex digest
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(HASH_BUFFER_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    """
+    Manifest of an ingestion run, so the next run only ingests new or changed files
+
+    Attributes:
+    files (dict): file name -> {'size', 'mtime_ns', 'sha256'} of every ingested file
+    chain_file (str): the results snapshot holding the chain, relative to the results folder
+    last_block_hash (str): hash of the last block of that chain
+    """
+    files: dict = field(default_factory=dict)
+    chain_file: str = None
+    last_block_hash: str = None
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a checkpoint
+
+        Args:
+        file_path (str): the path to the checkpoint
+
+        Returns:
+        Checkpoint: the checkpoint, None if there is none (or from another version)
+        """
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION:
+            return None
+        return cls(data['files'], data['chain_file'], data['last_block_hash'])
+
+    def save(self, file_path):
+        """
+        Write the checkpoint atomically (a crash never leaves a half-written manifest)
+
+        Args:
+        file_path (str): the path to the checkpoint
+        """
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'chain_file': self.chain_file,
+            'last_block_hash': self.last_block_hash,
+            'files': self.files
+        }
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, file_path)
+
+    def is_ingested(self, directory, filename):
+        """
+        Check if a file was already ingested with the same content.
+        Size and mtime are compared first, the content is only hashed when the file was touched.
+
+        Args:
+        directory (str): the folder of the file
+        filename (str): the file name
+
+        Returns:
+        bool: True if the file can be skipped
+        """
+        entry = self.files.get(filename)
+        if entry is None:
+            return False
+        stat = os.stat(os.path.join(directory, filename))
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+        if file_digest(os.path.join(directory, filename)) != entry['sha256']:
+            return False
+        # same content, only touched: no need to hash it next time
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def record(self, directory, filename):
+        """
+        Record a file as ingested
+
+        Args:
+        directory (str): the folder of the file
+        filename (str): the file name
+        """
+        file_path = os.path.join(directory, filename)
+        stat = os.stat(file_path)
+        self.files[filename] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(file_path)}
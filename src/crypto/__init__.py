@@ -6,16 +6,44 @@ This module contains the core blockchain components:
 - Block: Individual block implementation
 - Transaction: Transaction handling
 - Token: Token system
+- MerkleTree: Merkle tree of the transactions of a block
+- mine: proof of work nonce search
+- BlockStore: append-only, memory-mapped block storage
+- SQLiteRepository: SQLite persistence with indexed transaction queries
+- TransactionBatch: columnar transactions for bulk analytics
+- Ledger: account balances per token, with snapshots
+- Mempool: pending transactions, drained into blocks by priority
+- BlockTree: every known block with side branches, reorganising the chain to the best tip
 """
 
-from .block_chain import BlockChain
+from .block_chain import BlockChain, ValidationReport
 from .block import Block
 from .transactions import Transaction
 from .tokens import Token
+from .merkle import MerkleTree, verify_proof
+from .mining import mine, MiningResult
+from .store import BlockStore
+from .repository import SQLiteRepository
+from .batch import TransactionBatch
+from .ledger import Ledger, SpendReport
+from .mempool import Mempool
+from .block_tree import BlockTree
 
 __all__ = [
     'BlockChain',
+    'ValidationReport',
     'Block',
     'Transaction', 
-    'Token'
+    'Token',
+    'MerkleTree',
+    'verify_proof',
+    'mine',
+    'MiningResult',
+    'BlockStore',
+    'SQLiteRepository',
+    'TransactionBatch',
+    'Ledger',
+    'SpendReport',
+    'Mempool',
+    'BlockTree'
 ] 
\ No newline at end of file
@@ -0,0 +1,311 @@
+import math
+from array import array
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from .tokens import Token
+from .transactions import Transaction
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+# epoch of the timestamps that are not ISO 8601, they never match a time filter
+NO_TIME = -(1 << 63)
+
+_FLOAT = 0
+_INT = 1
+
+
+def to_epoch(timestamp: str):
+    """
+    Convert an ISO 8601 timestamp to microseconds since the epoch (naive timestamps are read as UTC)
+
+    Args:
+    timestamp (str): the timestamp
+
+    Returns:
+    int: the microseconds since the epoch, None if the timestamp is not ISO 8601
+    """
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+@lru_cache(maxsize=4096)
+def _encode_timestamp(timestamp: str):
+    """
+    Return the epoch column value of a timestamp and whether it converts back to the same string
+    (cached: the timestamps of a chain repeat a lot)
+    """
+    epoch = to_epoch(timestamp)
+    if epoch is None:
+        return NO_TIME, False
+    return epoch, from_epoch(epoch) == timestamp
+
+
+def from_epoch(microseconds: int):
+    """
+    Convert microseconds since the epoch back to a naive ISO 8601 timestamp
+
+    Args:
+    microseconds (int): the microseconds since the epoch
+
+    Returns:
+    str: the timestamp
+    """
+    return (_NAIVE_EPOCH + timedelta(microseconds=microseconds)).isoformat()
+
+
+class TransactionBatch:
+    """
+    Columnar transactions, for bulk analytics without a Python object per transaction.
+
+    Accounts and tokens are dictionary-encoded: the columns hold small integer ids into
+    accounts and tokens. Amounts are doubles and timestamps microseconds since the epoch,
+    the aggregations run on NumPy views of the columns when NumPy is installed.
+    The conversion back to transactions is lossless: int amounts are flagged, and the few
+    values a column cannot hold exactly (huge ints, non-ISO or non-canonical timestamps)
+    are kept aside as they were.
+
+    Attributes:
+    accounts (list[str]): the senders and receivers, by id
+    tokens (list[Token]): the tokens, by id
+    sender_ids (array): the sender id of each transaction
+    receiver_ids (array): the receiver id of each transaction
+    token_ids (array): the token id of each transaction
+    amounts (array): the amount of each transaction, as a double
+    timestamps (array): the timestamp of each transaction, in microseconds since the epoch (NO_TIME if not ISO 8601)
+    """
+
+    def __init__(self):
+        self.accounts = []
+        self.tokens = []
+        self.sender_ids = array('I')
+        self.receiver_ids = array('I')
+        self.token_ids = array('I')
+        self.amounts = array('d')
+        self.timestamps = array('q')
+        self._amount_types = array('b')
+        # row -> original value, when the column does not hold it exactly
+        self._exact_amounts = {}
+        self._exact_timestamps = {}
+        self._account_ids = {}
+        self._token_keys = {}
+
+    def __len__(self):
+        return len(self.amounts)
+
+    @classmethod
+    def from_transactions(cls, transactions: list):
+        """
+        Build a batch from transactions
+
+        Args:
+        transactions (list[Transaction]): the transactions
+
+        Returns:
+        TransactionBatch: the batch
+        """
+        batch = cls()
+        for transaction in transactions:
+            batch.append(transaction)
+        return batch
+
+    def _account_id(self, account: str):
+        account_id = self._account_ids.get(account)
+        if account_id is None:
+            account_id = self._account_ids[account] = len(self.accounts)
+            self.accounts.append(account)
+        return account_id
+
+    def _token_id(self, token: Token):
+        key = (token.name, token.symbol, token.value)
+        token_id = self._token_keys.get(key)
+        if token_id is None:
+            token_id = self._token_keys[key] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def append(self, transaction: Transaction):
+        """
+        Add a transaction at the end of the batch
+
+        Args:
+        transaction (Transaction): the transaction
+        """
+        if not isinstance(transaction, Transaction):
+            raise TypeError("Transaction must be an instance of Transaction class")
+        row = len(self.amounts)
+        self.sender_ids.append(self._account_id(transaction.sender))
+        self.receiver_ids.append(self._account_id(transaction.receiver))
+        self.token_ids.append(self._token_id(transaction.token))
+
+        amount = transaction.amount
+        if type(amount) is float:
+            self.amounts.append(amount)
+            self._amount_types.append(_FLOAT)
+        else:
+            try:
+                approximation = float(amount)
+            except OverflowError:
+                approximation = math.inf if amount > 0 else -math.inf
+            self.amounts.append(approximation)
+            self._amount_types.append(_INT)
+            if type(amount) is not int or approximation != amount:
+                self._exact_amounts[row] = amount
+
+        epoch, exact = _encode_timestamp(transaction.timestamp)
+        self.timestamps.append(epoch)
+        if not exact:
+            self._exact_timestamps[row] = transaction.timestamp
+
+    def amount(self, row: int):
+        """
+        Get the exact amount of a transaction
+
+        Args:
+        row (int): the position of the transaction
+
+        Returns:
+        float: the amount, as it was in the transaction
+        """
+        if row in self._exact_amounts:
+            return self._exact_amounts[row]
+        if self._amount_types[row] == _INT:
+            return int(self.amounts[row])
+        return self.amounts[row]
+
+    def timestamp(self, row: int):
+        """
+        Get the exact timestamp of a transaction
+
+        Args:
+        row (int): the position of the transaction
+
+        Returns:
+        str: the timestamp, as it was in the transaction
+        """
+        if row in self._exact_timestamps:
+            return self._exact_timestamps[row]
+        return from_epoch(self.timestamps[row])
+
+    def to_transactions(self):
+        """
+        Convert the batch back to transactions, equal to the ones it was built from
+
+        Returns:
+        list[Transaction]: the transactions
+        """
+        accounts = self.accounts
+        tokens = self.tokens
+        return [
+            Transaction(accounts[self.sender_ids[row]], accounts[self.receiver_ids[row]], tokens[self.token_ids[row]],
+                        self.amount(row), self.timestamp(row))
+            for row in range(len(self))
+        ]
+
+    def _sum_by(self, ids: array, size: int, rows=None):
+        """
+        Sum the amounts by id (a list indexed by id), only over rows when given
+        """
+        if np is not None and len(self):
+            weights = np.frombuffer(self.amounts, dtype=self.amounts.typecode)
+            keys = np.frombuffer(ids, dtype=ids.typecode)
+            if rows is not None:
+                weights, keys = weights[rows], keys[rows]
+            return np.bincount(keys, weights=weights, minlength=size).tolist()
+        totals = [0.0] * size
+        amounts = self.amounts
+        for row in (range(len(self)) if rows is None else rows):
+            totals[ids[row]] += amounts[row]
+        return totals
+
+    def _rows_of_symbol(self, symbol: str):
+        token_ids = {token_id for token_id, token in enumerate(self.tokens) if token.symbol == symbol}
+        if np is not None and len(self):
+            return np.flatnonzero(np.isin(np.frombuffer(self.token_ids, dtype=self.token_ids.typecode), list(token_ids)))
+        return [row for row, token_id in enumerate(self.token_ids) if token_id in token_ids]
+
+    def sum_by_token(self):
+        """
+        Total amount transferred per token symbol
+
+        Returns:
+        dict: symbol -> total amount
+        """
+        totals = {}
+        for token, total in zip(self.tokens, self._sum_by(self.token_ids, len(self.tokens))):
+            totals[token.symbol] = totals.get(token.symbol, 0.0) + total
+        return totals
+
+    def sum_by_account(self, side: str = "sender", symbol: str = None):
+        """
+        Total amount sent (or received) per account
+
+        Args:
+        side (str): 'sender' or 'receiver'
+        symbol (str): only count the transfers of this token symbol (None for all)
+
+        Returns:
+        dict: account -> total amount, for the accounts on that side
+        """
+        if side not in ("sender", "receiver"):
+            raise ValueError("Side must be 'sender' or 'receiver'")
+        ids = self.sender_ids if side == "sender" else self.receiver_ids
+        rows = None if symbol is None else self._rows_of_symbol(symbol)
+        totals = self._sum_by(ids, len(self.accounts), rows)
+        present = set(ids) if rows is None else {ids[row] for row in rows}
+        return {self.accounts[account_id]: totals[account_id] for account_id in sorted(present)}
+
+    def between(self, start: str = None, end: str = None):
+        """
+        Select the transactions between two ISO 8601 timestamps (both included)
+
+        Args:
+        start (str): the earliest timestamp (None for no lower bound)
+        end (str): the latest timestamp (None for no upper bound)
+
+        Returns:
+        TransactionBatch: a new batch with the matching transactions, in order
+        """
+        low = NO_TIME + 1 if start is None else to_epoch(start)
+        high = (1 << 63) - 1 if end is None else to_epoch(end)
+        if low is None or high is None:
+            raise ValueError("Time bounds must be ISO 8601 timestamps")
+        if np is not None and len(self):
+            timestamps = np.frombuffer(self.timestamps, dtype=self.timestamps.typecode)
+            rows = np.flatnonzero((timestamps >= low) & (timestamps <= high)).tolist()
+        else:
+            rows = [row for row, epoch in enumerate(self.timestamps) if low <= epoch <= high]
+        return self.take(rows)
+
+    def take(self, rows: list):
+        """
+        Select transactions by position, the dictionaries are shared with the new batch
+
+        Args:
+        rows (list[int]): the positions, in the wanted order
+
+        Returns:
+        TransactionBatch: the new batch
+        """
+        batch = TransactionBatch()
+        batch.accounts, batch._account_ids = self.accounts, self._account_ids
+        batch.tokens, batch._token_keys = self.tokens, self._token_keys
+        for name in ("sender_ids", "receiver_ids", "token_ids", "amounts", "timestamps", "_amount_types"):
+            column = getattr(self, name)
+            setattr(batch, name, array(column.typecode, [column[row] for row in rows]))
+        for new_row, row in enumerate(rows):
+            if row in self._exact_amounts:
+                batch._exact_amounts[new_row] = self._exact_amounts[row]
+            if row in self._exact_timestamps:
+                batch._exact_timestamps[new_row] = self._exact_timestamps[row]
+        return batch
@@ -1,5 +1,7 @@
 import hashlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from .encoding import INT_MAX, INT_MIN, update_block_hash
+from .merkle import MerkleTree
 
 @dataclass
 class Block:
@@ -11,28 +13,62 @@ class Block:
     timestamp (str): datetime of the block creation
     transactions (list): list of transactions in the block
     previous_hash (str): the hash of the previous block
-    hash (str): the hash of the current block
+    hash (str): the hash of the current block (computed on first access and cached, given for the genesis)
+    nonce (int): the proof of work, found by crypto.mining
+    difficulty (int): the number of leading zero bits the hash must have
+    merkle_root (str): the Merkle root of the transactions (cached, covered by the hash)
     """
-    #IDEA: ajouter un nonce ? / add a nonce ?
-
     _index: int
     _timestamp: str
     _transactions: list
     _previous_hash: str
-    _hash: str
+    # equal contents give equal hashes, a hash not computed yet must not make blocks differ
+    _hash: str = field(compare=False)
+    _nonce: int = 0
+    _difficulty: int = 0
  
     # Forcing good types
     def __post_init__(self):
+        given = self._hash
+        self._hash = None
         self.index = self._index
         self.timestamp = self._timestamp
         self.transactions = self._transactions
         self.previous_hash = self._previous_hash
-        # except for the genesis, each block has a computed hash
-        if self._index == 0 and (self._previous_hash == '0' or self._hash == 'Genesis'):
-            self.hash = self._hash
+        self.nonce = self._nonce
+        self.difficulty = self._difficulty
+        # except for the genesis, the hash is computed from the content on first access
+        self._hash = given
+        if self.is_genesis():
+            self.hash = given
         else:
-            self.hash = self.compute_hash()
+            self._hash = None
+
+    def __repr__(self):
+        # the lazy hash is computed so that the representation always shows it
+        self.hash
+        return f"{type(self).__name__}({', '.join(f'{f.name}={getattr(self, f.name)!r}' for f in fields(self))})"
     
+    @classmethod
+    def restore(cls, index: int, timestamp: str, transactions: list, previous_hash: str, hash: str, nonce: int = 0, difficulty: int = 0):
+        """
+        Rebuild a stored block keeping its stored hash instead of computing it
+        (the fields are still type-checked, BlockChain.validate can check the hash later)
+
+        Returns:
+        Block: the block
+        """
+        block = cls.__new__(cls)
+        block._hash = None
+        block.index = index
+        block.timestamp = timestamp
+        block.transactions = transactions
+        block.previous_hash = previous_hash
+        block.nonce = nonce
+        block.difficulty = difficulty
+        block.hash = hash
+        return block
+
     @property
     def index(self):
         return self._index
@@ -51,31 +87,53 @@ class Block:
     
     @property
     def hash(self):
+        if self._hash is None:
+            self._hash = self.compute_hash()
         return self._hash
+
+    @property
+    def nonce(self):
+        return self._nonce
+
+    @property
+    def difficulty(self):
+        return self._difficulty
+
+    @property
+    def merkle_root(self):
+        return self._get_merkle_tree().root
     
     @index.setter
     def index(self, value: int):
         if not isinstance(value, int):
             raise TypeError("Block index must be an integer")
+        if not INT_MIN <= value <= INT_MAX:
+            raise ValueError("Block index must fit in a signed 64 bits integer")
         self._index = value
+        self._invalidate_hash()
 
     @timestamp.setter
     def timestamp(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Block timestamp must be a string")
         self._timestamp = value
+        self._invalidate_hash()
 
     @transactions.setter
     def transactions(self, value: list):
         if not isinstance(value, list):
             raise TypeError("Block transactions must be a list")
         self._transactions = value
+        # the tree is rebuilt on next use
+        self._merkle_tree = None
+        self._invalidate_hash()
 
     @previous_hash.setter
     def previous_hash(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Block previous hash must be a string")
         self._previous_hash = value
+        self._invalidate_hash()
     
     @hash.setter
     def hash(self, value: str):
@@ -83,10 +141,97 @@ class Block:
             raise TypeError("Block hash must be a string")
         self._hash = value
 
+    @nonce.setter
+    def nonce(self, value: int):
+        if not isinstance(value, int):
+            raise TypeError("Block nonce must be an integer")
+        if not INT_MIN <= value <= INT_MAX:
+            raise ValueError("Block nonce must fit in a signed 64 bits integer")
+        self._nonce = value
+        self._invalidate_hash()
+
+    @difficulty.setter
+    def difficulty(self, value: int):
+        if not isinstance(value, int):
+            raise TypeError("Block difficulty must be an integer")
+        if not 0 <= value <= 256:
+            raise ValueError("Block difficulty must be between 0 and 256")
+        self._difficulty = value
+        self._invalidate_hash()
+
+    def _invalidate_hash(self):
+        # a hashed field changed: the genesis keeps its given hash, the others are hashed again on next access
+        if self._hash is not None and not self.is_genesis():
+            self._hash = None
+
+    def is_hash_current(self):
+        """
+        Check, without hashing, if the block holds a hash that no hashed field changed since it was
+        computed or given (index, timestamp, transactions, previous hash, nonce and difficulty are
+        tracked through their setters, transactions mutated in place are not).
+        A stored hash is not compared with the content here, BlockChain.validate does.
+
+        Returns:
+        bool: True if the hash is held, False if it will be computed on next access
+        """
+        return self._hash is not None
+
+    def is_genesis(self):
+        """
+        Check if the block is a genesis block, whose hash is given instead of computed
+
+        Returns:
+        bool: True for a genesis block
+        """
+        return self._index == 0 and (self._previous_hash == '0' or self._hash == 'Genesis')
+
+    def meets_difficulty(self):
+        """
+        Check if the hash of the block has at least difficulty leading zero bits
+
+        Returns:
+        bool: True if the proof of work is enough
+        """
+        if self._difficulty == 0:
+            return True
+        try:
+            return int(self.hash, 16) >> (256 - self._difficulty) == 0
+        except ValueError:
+            return False
+
+    def _get_merkle_tree(self):
+        if self._merkle_tree is None:
+            self._merkle_tree = MerkleTree.from_transactions(self._transactions)
+        return self._merkle_tree
+
+    def compute_merkle_root(self):
+        """
+        Compute the Merkle root from the current transactions, ignoring the cache
+        (the cache is only reset when the transactions list is assigned, not when it is mutated in place)
+
+        Returns:
+        str: the Merkle root
+        """
+        return MerkleTree.from_transactions(self._transactions).root
+
+    def merkle_proof(self, tx_index: int):
+        """
+        Inclusion proof of a transaction, to be checked with crypto.merkle.verify_proof
+
+        Args:
+        tx_index (int): position of the transaction in the block
+
+        Returns:
+        list[tuple[str, bool]]: the sibling hashes from the leaf up to the Merkle root
+        """
+        return self._get_merkle_tree().proof(tx_index)
+
     def compute_hash(self):
         """
-        Compute the hash of the block using SHA-256
+        Compute the hash of the block using SHA-256 over its canonical header
+        (see crypto.encoding), the transactions are covered by the Merkle root
         """
-        block_string = f"{self.index}{self.timestamp}{self.transactions}{self.previous_hash}".encode()
-        return hashlib.sha256(block_string).hexdigest()
+        hasher = hashlib.sha256()
+        update_block_hash(hasher, self)
+        return hasher.hexdigest()
     
@@ -1,9 +1,93 @@
 import datetime
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from .block import Block
+from .ledger import Ledger
 from .tokens import Token
 from .transactions import Transaction
 
+@dataclass
+class ValidationReport:
+  """
+  Result of a blockchain validation, truthy when the chain is valid.
+
+  Attributes:
+  valid (bool): True if every checked block is valid
+  position (int): position in blocks of the first invalid block (None if valid)
+  reason (str): why that block is invalid (None if valid)
+  checked (int): number of blocks checked during this validation
+  """
+  valid: bool
+  position: int = None
+  reason: str = None
+  checked: int = 0
+
+  def __bool__(self):
+    return self.valid
+
+def _check_block(block: Block, previous: Block):
+  """
+  Check a block against its content and its previous block (None for the first block).
+  """
+  if previous is not None:
+    if block.previous_hash != previous.hash:
+      return "previous hash does not match the previous block's hash"
+    if block.index != previous.index + 1:
+      return "index does not follow the previous block's index"
+  if block.is_genesis():
+    return None if previous is None else "genesis block inside the chain"
+  # values not computed yet come from the content when read, only the cached or stored ones are checked
+  if block._merkle_tree is not None and block.merkle_root != block.compute_merkle_root():
+    return "Merkle root does not match the transactions"
+  if block.is_hash_current() and block.hash != block.compute_hash():
+    return "hash does not match the block content"
+  if not block.meets_difficulty():
+    return "hash does not meet the difficulty target"
+  return None
+
+def _check_block_types(blocks: list):
+  """
+  Check that every item is a Block, in a batch: the distinct types are collected
+  in C (set/map) so only a handful of isinstance checks run in Python.
+  """
+  for block_type in set(map(type, blocks)):
+    if not issubclass(block_type, Block):
+      raise TypeError("All items in blocks must be Block instances")
+
+def _block_from_dict(data: dict):
+  """
+  Rebuild a block from its results JSON dictionary, keeping its stored hash (nothing is hashed here).
+  """
+  transactions = [Transaction.from_dict(tx) for tx in data['transactions']]
+  return Block.restore(data['index'], data['timestamp'], transactions, data['previous_hash'], data['hash'],
+                       data.get('nonce', 0), data.get('difficulty', 0))
+
+# blocks shared with the verification workers (inherited when the workers are forked)
+_worker_blocks = None
+
+def _init_worker(blocks: list):
+  global _worker_blocks
+  _worker_blocks = blocks
+
+def _check_range(start: int, stop: int):
+  """
+  Check the blocks in [start, stop) of the worker's chain.
+
+  Returns:
+  tuple[int, str]: position and reason of the first invalid block, None if the range is valid
+  """
+  previous = _worker_blocks[start - 1] if start > 0 else None
+  for position in range(start, stop):
+    block = _worker_blocks[position]
+    reason = _check_block(block, previous)
+    if reason is not None:
+      return position, reason
+    previous = block
+  return None
+
 @dataclass
 class BlockChain:
   """
@@ -33,10 +117,13 @@ class BlockChain:
   def blocks(self, value: list[Block]):
     if not isinstance(value, list):
       raise TypeError("Blocks must be a list")
-    for block in value:
-      if not isinstance(block, Block):
-        raise TypeError("All items in blocks must be Block instances")
+    _check_block_types(value)
     self._blocks = value
+    # a new list has to be validated and indexed again
+    self._verified = 0
+    self._verified_tip = None
+    self._reset_indexes()
+    self._ledger = Ledger()
 
   @genesis.setter
   def genesis(self, value: Block): 
@@ -44,11 +131,59 @@ class BlockChain:
       raise TypeError("Genesis must be a Block instance")
     self._genesis = value
 
+  @classmethod
+  def from_dict(cls, data: dict, trust_stored_hashes: bool = False, workers: int = 1):
+    """
+    Rebuild a blockchain from its results JSON ({"genesis": ..., "blocks": [...]}).
+    Blocks are restored with their stored hashes instead of being re-hashed on construction.
+    By default (verify mode) the stored hashes are then checked, each block being hashed once,
+    so the next validate() has nothing left to check.
+
+    Args:
+    data (dict): the results JSON
+    trust_stored_hashes (bool): skip the hash verification, only the links are checked (restart time bound by I/O).
+    The stored blocks then count as verified: validate() only checks the blocks appended later, validate(full=True) audits them
+    workers (int): processes verifying the hashes (see verify_parallel)
+
+    Returns:
+    BlockChain: the blockchain
+    """
+    genesis = _block_from_dict(data['genesis'])
+    blocks = [_block_from_dict(block) for block in data['blocks']]
+    if blocks and blocks[0] == genesis:
+      blocks[0] = genesis
+    blockchain = cls([], genesis)
+    blockchain.extend(blocks)
+    if trust_stored_hashes:
+      blockchain._set_watermark(len(blockchain.blocks))
+    else:
+      report = blockchain.verify_parallel(workers) if workers > 1 else blockchain.validate(full=True)
+      if not report:
+        raise ValueError(f"Block {blocks[report.position].index} hash does not match its content ({report.reason})")
+    return blockchain
+
+  @classmethod
+  def from_file(cls, file_path: str, trust_stored_hashes: bool = False, workers: int = 1):
+    """
+    Load a blockchain from a results JSON file (see from_dict)
+
+    Args:
+    file_path (str): the path to the file
+    trust_stored_hashes (bool): skip the hash verification
+    workers (int): processes verifying the hashes
+
+    Returns:
+    BlockChain: the blockchain
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+      data = json.load(f)
+    return cls.from_dict(data, trust_stored_hashes, workers)
+
   def genesis_creation(self):
     """
     Create the genesis block and add it to the blockchain.
     """
-    block = Block(index=0, timestamp=datetime.datetime.now().isoformat(), transactions=[], previous_hash="0", hash="Genesis")
+    block = Block(0, datetime.datetime.now().isoformat(), [], "0", "Genesis")
     self.blocks.append(block)
   
   def get_last(self):
@@ -61,20 +196,382 @@ class BlockChain:
     if not self.blocks:
       raise ValueError("Blockchain is empty")
     return self.blocks[-1]
+
+  def new_block(self, transactions: list, timestamp: str = None):
+    """
+    Build the block following the last one: its index, timestamp and previous hash are set
+    once and it is hashed once, on first access. It is not appended (see append_transactions).
+
+    Args:
+    transactions (list[Transaction]): the transactions of the block
+    timestamp (str): the block timestamp (now by default)
+
+    Returns:
+    Block: the new block
+    """
+    last = self.get_last()
+    return Block(last.index + 1, timestamp or datetime.datetime.now().isoformat(), transactions, last.hash, "")
+
+  def append_transactions(self, transactions: list, timestamp: str = None):
+    """
+    Build the next block with new_block and append it. The block was built on the last block
+    from its own content, so it is not hashed again to be verified.
+
+    Args:
+    transactions (list[Transaction]): the transactions of the block
+    timestamp (str): the block timestamp (now by default)
+
+    Returns:
+    Block: the appended block
+    """
+    block = self.new_block(transactions, timestamp)
+    self._append(block)
+    return block
   
   def add_block(self, block: Block):
     """
-    Add a new block to the blockchain.
+    Add a new block to the blockchain, as it is (its timestamp and hash are kept).
+    It is verified first like validate does: link and index against the last block,
+    Merkle root, hash and proof of work.
     
     Args:
     block (Block): the block to add
     """
     if not isinstance(block, Block):
       raise TypeError("Block must be an instance of Block class")
-    if self.blocks:
-      last = self.get_last()
-      if block.previous_hash != last.hash:
-        raise ValueError("Block's previous hash does not match the last block's hash")
-      new = Block(index=last.index + 1, timestamp=datetime.datetime.now().isoformat(), transactions=block.transactions, previous_hash=last.hash, hash=block.hash)
-      self.blocks.append(new)
+    last = self.blocks[-1] if self.blocks else None
+    if last is not None and block.previous_hash != last.hash:
+      raise ValueError("Block's previous hash does not match the last block's hash")
+    reason = _check_block(block, last)
+    if reason is not None:
+      raise ValueError(f"Block {block.index} is invalid: {reason}")
+    self._append(block)
+
+  def _append(self, block: Block):
+    """
+    Append a verified block and bring the indexes and the ledger up to date
+    """
+    # a chain verified up to its tip stays verified, the block is not checked again by validate()
+    verified = self._verified == len(self.blocks) and (not self._verified or self.blocks[-1].hash == self._verified_tip)
+    self.blocks.append(block)
+    if verified:
+      self._set_watermark(len(self.blocks))
+    self._sync_indexes()
+    self._sync_ledger()
+
+  def extend(self, blocks: list, trusted: bool = False):
+    """
+    Append several blocks at once.
+    The blocks are type-checked in a batch and linked to each other like add_block does
+    (previous_hash of each block against the hash of the one before), nothing is appended if a check fails.
+    Their hashes are not recomputed here and they are not indexed yet: validate() and the lookups
+    catch up on the new blocks lazily.
+
+    Args:
+    blocks (list[Block]): the blocks to append, in order
+    trusted (bool): skip the type and link checks (e.g. blocks restored from our own storage)
+    """
+    blocks = list(blocks)
+    if not trusted:
+      _check_block_types(blocks)
+      previous = self.blocks[-1] if self.blocks else None
+      for block in blocks:
+        if previous is not None and block.previous_hash != previous.hash:
+          raise ValueError("Block's previous hash does not match the last block's hash")
+        previous = block
+    self.blocks.extend(blocks)
+
+  def truncate(self, length: int):
+    """
+    Drop the blocks from position length on (e.g. the diverging suffix of a reorganisation).
+    Their derived state is undone block by block, from the tip down to length: index entries,
+    ledger balances and validation watermark, so nothing is rebuilt from genesis.
+
+    Args:
+    length (int): the number of blocks kept
+
+    Returns:
+    list[Block]: the dropped blocks, in chain order
+    """
+    if not isinstance(length, int) or length < 0:
+      raise ValueError("Length must be a non-negative integer")
+    blocks = self.blocks
+    if length >= len(blocks):
+      return []
+
+    for position in range(length, min(self._indexed, len(blocks))):
+      block = blocks[position]
+      if self._hash_index.get(block.hash) == position:
+        del self._hash_index[block.hash]
+      if self._height_index.get(block.index) == position:
+        del self._height_index[block.index]
+    self._indexed = min(self._indexed, length)
+
+    for position in range(length, min(self._txids_indexed, len(blocks))):
+      for tx_position, tx in enumerate(blocks[position].transactions):
+        if self._txid_index.get(tx.txid) == (position, tx_position):
+          del self._txid_index[tx.txid]
+    self._txids_indexed = min(self._txids_indexed, length)
+
+    ledger = self._ledger
+    applied = ledger.applied
+    if applied <= len(blocks) and (not applied or blocks[applied - 1].hash == ledger.tip_hash):
+      for position in range(applied - 1, length - 1, -1):
+        ledger.revert(blocks[position], blocks[position - 1] if position else None)
+
+    verified = self._verified
+    # a watermark whose tip was replaced is not trusted for the kept part either
+    if verified > len(blocks) or (verified and blocks[verified - 1].hash != self._verified_tip):
+      verified = 0
+    dropped = blocks[length:]
+    del blocks[length:]
+    self._set_watermark(min(verified, length))
+    # a ledger out of step with the chain is rewound to a snapshot on the next sync
+    return dropped
+
+  def get_by_hash(self, block_hash: str):
+    """
+    Get a block by its hash in O(1).
+
+    Args:
+    block_hash (str): the hash of the block
+
+    Returns:
+    Block: the block with this hash
+    """
+    position = self._lookup("_hash_index", block_hash, lambda block: block.hash)
+    if position is None:
+      raise KeyError(f"No block with hash {block_hash}")
+    return self.blocks[position]
+
+  def get_by_index(self, index: int):
+    """
+    Get a block by its index (Block.index, not its position in blocks) in O(1).
+
+    Args:
+    index (int): the index of the block
+
+    Returns:
+    Block: the block with this index
+    """
+    position = self._lookup("_height_index", index, lambda block: block.index)
+    if position is None:
+      raise IndexError(f"No block with index {index}")
+    return self.blocks[position]
+
+  def _reset_indexes(self):
+    self._hash_index = {}
+    self._height_index = {}
+    self._indexed = 0
+    self._reset_txid_index()
+
+  def _reset_txid_index(self):
+    self._txid_index = {}
+    self._txids_indexed = 0
+
+  def _sync_indexes(self):
+    """
+    Index the blocks appended since the last sync, including the ones appended
+    directly to the blocks list. A truncated list is indexed again from scratch.
+    """
+    if self._indexed > len(self.blocks):
+      self._reset_indexes()
+    for position in range(self._indexed, len(self.blocks)):
+      block = self.blocks[position]
+      self._hash_index.setdefault(block.hash, position)
+      self._height_index.setdefault(block.index, position)
+    self._indexed = len(self.blocks)
+
+  def _lookup(self, index_name: str, key, get_key):
+    self._sync_indexes()
+    position = getattr(self, index_name).get(key)
+    if position is None or get_key(self.blocks[position]) == key:
+      return position
+    # the block was replaced in place behind the index
+    self._reset_indexes()
+    self._sync_indexes()
+    return getattr(self, index_name).get(key)
+
+  def _sync_txid_index(self):
+    """
+    Index the txids of the blocks appended since the last sync. It runs on the transaction
+    lookups only, not on append: a chain never searched by txid builds no entry per transaction
+    (the txids themselves are cached on the transactions when their block is hashed).
+    """
+    if self._txids_indexed > len(self.blocks):
+      self._reset_txid_index()
+    for position in range(self._txids_indexed, len(self.blocks)):
+      block = self.blocks[position]
+      for tx_position, tx in enumerate(block.transactions):
+        self._txid_index.setdefault(tx.txid, (position, tx_position))
+    self._txids_indexed = len(self.blocks)
+
+  def _locate_transaction(self, txid: str):
+    self._sync_txid_index()
+    location = self._txid_index.get(txid)
+    if location is None or self._holds(location, txid):
+      return location
+    # the block or the transaction was replaced behind the index
+    self._reset_txid_index()
+    self._sync_txid_index()
+    return self._txid_index.get(txid)
+
+  def _holds(self, location: tuple, txid: str):
+    position, tx_position = location
+    if position >= len(self.blocks):
+      return False
+    transactions = self.blocks[position].transactions
+    return tx_position < len(transactions) and transactions[tx_position].txid == txid
+
+  def find_transaction(self, txid: str):
+    """
+    Find where a transaction landed in O(1), by its txid.
+
+    Args:
+    txid (str): the txid of the transaction (Transaction.txid)
+
+    Returns:
+    tuple[int, int]: the index of its block and its position in the block
+    """
+    location = self._locate_transaction(txid)
+    if location is None:
+      raise KeyError(f"No transaction with txid {txid}")
+    position, tx_position = location
+    return self.blocks[position].index, tx_position
+
+  def _sync_ledger(self):
+    """
+    Apply the blocks appended since the last sync to the ledger. If the applied part was
+    truncated or replaced, the ledger is first rewound to its nearest snapshot still in the chain.
+    """
+    ledger = self._ledger
+    applied = ledger.applied
+    if applied > len(self.blocks) or (applied and self.blocks[applied - 1].hash != ledger.tip_hash):
+      ledger.rewind(self.blocks)
+    for position in range(ledger.applied, len(self.blocks)):
+      ledger.apply(self.blocks[position])
+
+  @property
+  def ledger(self):
+    """
+    The account balances ledger, caught up with the blocks.
+
+    Returns:
+    Ledger: the ledger
+    """
+    self._sync_ledger()
+    return self._ledger
+
+  def balance(self, account: str, symbol: str):
+    """
+    Get the current balance of an account in a token, without replaying the chain.
+
+    Args:
+    account (str): the account
+    symbol (str): the token symbol
+
+    Returns:
+    float: the balance
+    """
+    return self.ledger.balance(account, symbol)
+
+  def state_at(self, height: int):
+    """
+    Get the balances right after a block, rebuilt from the nearest ledger snapshot.
+
+    Args:
+    height (int): position of the block in blocks
+
+    Returns:
+    dict: (account, token symbol) -> balance
+    """
+    return self.ledger.state_at(height, self.blocks)
+
+  def check_transactions(self, transactions: list, issuers=()):
+    """
+    Check candidate transactions against the current balances before assembling a block:
+    overspends and non-positive amounts are rejected with a reason (see Ledger.check_transactions).
+
+    Args:
+    transactions (list[Transaction]): the candidate transactions, in order
+    issuers (iterable[str]): accounts allowed to go below zero
+
+    Returns:
+    SpendReport: the accepted and the rejected transactions
+    """
+    return self.ledger.check_transactions(transactions, issuers)
+
+  def check_block(self, position: int):
+    """
+    Check a single block: its hash, its Merkle root and its link to the previous block.
+
+    Args:
+    position (int): position of the block in blocks
+
+    Returns:
+    str: the reason why the block is invalid, None if it is valid
+    """
+    previous = self.blocks[position - 1] if position > 0 else None
+    return _check_block(self.blocks[position], previous)
+
+  def validate(self, full: bool = False):
+    """
+    Validate the blockchain by re-computing the hashes and checking the previous_hash links.
+    The valid prefix is remembered (watermark) so the next call only checks newly appended blocks.
+
+    Args:
+    full (bool): audit mode, re-check the whole chain from genesis
+
+    Returns:
+    ValidationReport: the result, truthy when the chain is valid
+    """
+    start = self._verified
+    # the watermark is dropped if the verified part was truncated or replaced
+    if full or start > len(self.blocks) or (start and self.blocks[start - 1].hash != self._verified_tip):
+      start = 0
+    for position in range(start, len(self.blocks)):
+      reason = self.check_block(position)
+      if reason is not None:
+        self._set_watermark(position)
+        return ValidationReport(False, position, reason, position - start + 1)
+    self._set_watermark(len(self.blocks))
+    return ValidationReport(True, checked=len(self.blocks) - start)
+
+  def _set_watermark(self, verified: int):
+    self._verified = verified
+    self._verified_tip = self.blocks[verified - 1].hash if verified else None
+
+  def verify_parallel(self, workers: int = None, chunks_per_worker: int = 4):
+    """
+    Validate the whole chain by re-computing the hashes in a process pool.
+    The chain is split into ranges checked independently, the first broken link is reported.
+
+    Args:
+    workers (int): number of processes (defaults to the number of CPUs), 1 checks in this process
+    chunks_per_worker (int): ranges per worker, more ranges balance the load better
+
+    Returns:
+    ValidationReport: the result, truthy when the chain is valid
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+      raise ValueError("Workers must be a positive integer")
+    total = len(self.blocks)
+    if workers == 1 or total < 2:
+      return self.validate(full=True)
+
+    chunk = max(1, -(-total // (workers * chunks_per_worker)))
+    ranges = [(start, min(start + chunk, total)) for start in range(0, total, chunk)]
+    # forked workers inherit the blocks instead of receiving them pickled
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(self.blocks,)) as executor:
+      results = executor.map(_check_range, *zip(*ranges))
+      broken = [result for result in results if result is not None]
 
+    if broken:
+      position, reason = min(broken)
+      self._set_watermark(position)
+      return ValidationReport(False, position, reason, total)
+    self._set_watermark(total)
+    return ValidationReport(True, checked=total)
@@ -0,0 +1,189 @@
+from .block import Block
+from .block_chain import BlockChain, _check_block
+
+PREFERENCES = ("work", "length")
+
+
+def block_work(block: Block):
+    """
+    Expected number of hashes behind a block: 2 ** difficulty (1 for a block that was not mined)
+
+    Args:
+    block (Block): the block
+
+    Returns:
+    int: the work
+    """
+    return 1 << block.difficulty
+
+
+class _Node:
+    __slots__ = ("block", "height", "work")
+
+    def __init__(self, block, height, work):
+        self.block = block
+        # position of the block in a chain going through it
+        self.height = height
+        # cumulative work from the first block
+        self.work = work
+
+
+class BlockTree:
+    """
+    Every known block keyed by hash, side branches included, on top of a blockchain holding
+    the best branch (the active chain).
+
+    The best tip has the most cumulative work (or the most blocks), the first seen wins a tie.
+    When a side branch overtakes the active chain, only the diverging suffix is switched:
+    the active chain is truncated back to the fork point (its ledger and indexes undo those
+    blocks) and the blocks of the branch are appended.
+
+    Attributes:
+    blockchain (BlockChain): the active chain, reorganised in place
+    prefer (str): 'work' or 'length'
+    on_reorg (callable): called with (disconnected blocks, connected blocks) after a reorganisation
+    """
+
+    def __init__(self, blockchain: BlockChain, prefer: str = "work", on_reorg=None):
+        if not isinstance(blockchain, BlockChain):
+            raise TypeError("Blockchain must be an instance of BlockChain class")
+        if prefer not in PREFERENCES:
+            raise ValueError(f"Preference must be one of {PREFERENCES}")
+        if not blockchain.blocks:
+            raise ValueError("Blockchain is empty")
+        self.blockchain = blockchain
+        self.prefer = prefer
+        self.on_reorg = on_reorg
+        self._nodes = {}
+        # branch heads, in the order they were seen (a dict keeps it)
+        self._leaves = {}
+        self._seen = 0
+        self._catch_up()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, block_hash: str):
+        return block_hash in self._nodes
+
+    @property
+    def tip(self):
+        """
+        The last block of the active chain
+        """
+        return self.blockchain.get_last()
+
+    def _insert(self, block: Block, height: int):
+        parent = self._nodes.get(block.previous_hash)
+        work = (parent.work if parent is not None else 0) + block_work(block)
+        self._nodes[block.hash] = _Node(block, height, work)
+        self._leaves.pop(block.previous_hash, None)
+        self._leaves[block.hash] = None
+        return self._nodes[block.hash]
+
+    def _catch_up(self):
+        """
+        Add the blocks appended to the active chain directly (e.g. by extend)
+        """
+        blocks = self.blockchain.blocks
+        self._seen = min(self._seen, len(blocks))
+        for position in range(self._seen, len(blocks)):
+            if blocks[position].hash not in self._nodes:
+                self._insert(blocks[position], position)
+        self._seen = len(blocks)
+
+    def _score(self, node: _Node):
+        return node.work if self.prefer == "work" else node.height
+
+    def _is_active(self, node: _Node):
+        blocks = self.blockchain.blocks
+        return node.height < len(blocks) and blocks[node.height].hash == node.block.hash
+
+    def _node(self, block_hash: str):
+        node = self._nodes.get(block_hash)
+        if node is None:
+            raise KeyError(f"No block with hash {block_hash}")
+        return node
+
+    def get(self, block_hash: str):
+        """
+        Get a known block, on any branch
+
+        Args:
+        block_hash (str): the hash of the block
+
+        Returns:
+        Block: the block
+        """
+        return self._node(block_hash).block
+
+    def work(self, block_hash: str):
+        """
+        Cumulative work of the branch ending with a block
+
+        Args:
+        block_hash (str): the hash of the block
+
+        Returns:
+        int: the work
+        """
+        return self._node(block_hash).work
+
+    def tips(self):
+        """
+        The last block of every branch, the best first (the first seen first on a tie)
+
+        Returns:
+        list[Block]: the blocks
+        """
+        nodes = sorted((self._nodes[leaf] for leaf in self._leaves), key=self._score, reverse=True)
+        return [node.block for node in nodes]
+
+    def add(self, block: Block):
+        """
+        Add a block on top of any known block. It is checked like in validate (hash, Merkle root,
+        link and index), then the active chain is extended or reorganised if its branch became the best.
+
+        Args:
+        block (Block): the block
+
+        Returns:
+        bool: True if the active chain changed, False if the block is already known or went to a side branch
+        """
+        if not isinstance(block, Block):
+            raise TypeError("Block must be an instance of Block class")
+        self._catch_up()
+        if block.hash in self._nodes:
+            return False
+        parent = self._nodes.get(block.previous_hash)
+        if parent is None:
+            raise ValueError("Block's previous hash does not match any known block")
+        reason = _check_block(block, parent.block)
+        if reason is not None:
+            raise ValueError(f"Block {block.index} is invalid: {reason}")
+
+        node = self._insert(block, parent.height + 1)
+        tip = self._nodes[self.tip.hash]
+        if parent is tip:
+            self.blockchain.extend([block], trusted=True)
+            self._seen = len(self.blockchain.blocks)
+            return True
+        if self._score(node) > self._score(tip):
+            self._reorganise(node)
+            return True
+        return False
+
+    def _reorganise(self, node: _Node):
+        """
+        Make the branch ending with node the active chain, switching only the blocks after the fork point
+        """
+        branch = []
+        while not self._is_active(node):
+            branch.append(node.block)
+            node = self._nodes[node.block.previous_hash]
+        branch.reverse()
+        disconnected = self.blockchain.truncate(node.height + 1)
+        self.blockchain.extend(branch, trusted=True)
+        self._seen = len(self.blockchain.blocks)
+        if self.on_reorg is not None:
+            self.on_reorg(disconnected, branch)
@@ -0,0 +1,291 @@
+import struct
+
+# Canonical binary encoding used for hashing.
+#
+# Every field is written with an explicit type and length so the byte stream
+# does not depend on the dataclass repr (which changes as soon as a field is
+# added). The version byte is written first so the format can evolve without
+# silently colliding with older hashes.
+#
+# Version history:
+# 1: header followed by every transaction
+# 2: header carries the Merkle root of the transactions instead
+# 3: header carries the difficulty, then the nonce last (proof of work)
+
+ENCODING_VERSION = 3
+
+_U32 = struct.Struct(">I")
+_I64 = struct.Struct(">q")
+# two u32 in one call: a transaction length and its first string length
+_U32_PAIR = struct.Struct(">II")
+
+# range of the 64 bits integers: the block header fields must fit, amounts outside take the big int tag
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+_F64 = struct.Struct(">d")
+# a tagged float in one call: _TAG_FLOAT + _F64
+_TAGGED_F64 = struct.Struct(">cd")
+
+# number tags, an int and a float with the same value must not collide
+_TAG_INT = b"i"
+_TAG_FLOAT = b"f"
+# an int outside of 64 bits, as length-prefixed two's complement bytes
+# (no 64 bits int is written this way, so the hashes of the other numbers do not change)
+_TAG_BIG_INT = b"I"
+
+
+def encode_str(value: str) -> bytes:
+    """
+    Encode a string as its UTF-8 bytes prefixed by their length
+
+    Args:
+    value (str): the string to encode
+
+    Returns:
+    bytes: the length-prefixed string
+    """
+    data = value.encode("utf-8")
+    return _U32.pack(len(data)) + data
+
+
+def encode_int(value: int) -> bytes:
+    """
+    Encode an integer as a signed 64 bits big-endian number
+
+    Args:
+    value (int): the integer to encode
+
+    Returns:
+    bytes: the encoded integer
+    """
+    try:
+        return _I64.pack(value)
+    except struct.error:
+        raise ValueError(f"Integer {value} does not fit in the canonical encoding") from None
+
+
+def encode_number(value: float) -> bytes:
+    """
+    Encode an int (of any size) or a float, tagged with its type
+
+    Args:
+    value (int | float): the number to encode
+
+    Returns:
+    bytes: the tag followed by the encoded number
+    """
+    if isinstance(value, float):
+        return _TAG_FLOAT + _F64.pack(value)
+    if INT_MIN <= value <= INT_MAX:
+        return _TAG_INT + _I64.pack(value)
+    data = value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True)
+    return _TAG_BIG_INT + _U32.pack(len(data)) + data
+
+
+def encode_token(token) -> bytes:
+    """
+    Encode a token (name, symbol, value), cached on the token until one of its fields changes
+
+    Args:
+    token (Token): the token to encode
+
+    Returns:
+    bytes: the encoded token
+    """
+    encoding = token._encoding
+    if encoding is None:
+        encoding = token._encoding = encode_str(token.name) + encode_str(token.symbol) + _F64.pack(token.value)
+    return encoding
+
+
+def encode_transaction(transaction) -> bytes:
+    """
+    Encode a transaction (sender, receiver, token, amount, timestamp)
+
+    Args:
+    transaction (Transaction): the transaction to encode
+
+    Returns:
+    bytes: the encoded transaction, length-prefixed so transactions can be concatenated
+    """
+    # hot path (every Merkle leaf): private fields are read directly to skip the property calls,
+    # the setters already guarantee their types, and the whole record is joined at once
+    u32 = _U32.pack
+    sender = transaction._sender.encode()
+    receiver = transaction._receiver.encode()
+    timestamp = transaction._timestamp.encode()
+    # most transactions share a handful of tokens, each one is encoded once
+    token = transaction._token._encoding or encode_token(transaction._token)
+    amount = transaction._amount
+    amount = _TAGGED_F64.pack(_TAG_FLOAT, amount) if amount.__class__ is float else encode_number(amount)
+    return b"".join((
+        _U32_PAIR.pack(len(sender) + len(receiver) + len(token) + len(amount) + len(timestamp) + 3 * _U32.size, len(sender)),
+        sender,
+        u32(len(receiver)), receiver,
+        token,
+        amount,
+        u32(len(timestamp)), timestamp,
+    ))
+
+
+def encode_block_prefix(block) -> bytes:
+    """
+    Encode the fields of a block header that do not change while mining (everything but the nonce):
+    the transactions are only committed through their Merkle root, the hash itself is excluded
+
+    Args:
+    block (Block): the block to encode
+
+    Returns:
+    bytes: the encoded prefix, starting with the encoding version
+    """
+    return b"".join((
+        bytes((ENCODING_VERSION,)),
+        encode_int(block.index),
+        encode_str(block.timestamp),
+        encode_str(block.previous_hash),
+        encode_str(block.merkle_root),
+        encode_int(block.difficulty),
+    ))
+
+
+def encode_block_header(block) -> bytes:
+    """
+    Encode the header of a block: its prefix followed by the nonce
+
+    Args:
+    block (Block): the block to encode
+
+    Returns:
+    bytes: the encoded header
+    """
+    return encode_block_prefix(block) + encode_int(block.nonce)
+
+
+def update_block_hash(hasher, block):
+    """
+    Feed the canonical encoding of a block into a hashlib object
+
+    Args:
+    hasher: a hashlib object (e.g. hashlib.sha256())
+    block (Block): the block to feed
+    """
+    hasher.update(encode_block_header(block))
+
+
+def encode_block(block) -> bytes:
+    """
+    Encode a whole block for storage: header fields, stored hash and every transaction
+
+    Args:
+    block (Block): the block to encode
+
+    Returns:
+    bytes: the encoded block, decoded back by decode_block_fields
+    """
+    return b"".join((
+        bytes((ENCODING_VERSION,)),
+        encode_int(block.index),
+        encode_str(block.timestamp),
+        encode_str(block.previous_hash),
+        encode_str(block.hash),
+        encode_int(block.nonce),
+        encode_int(block.difficulty),
+        _U32.pack(len(block.transactions)),
+        *map(encode_transaction, block.transactions),
+    ))
+
+
+def decode_str(data, offset: int):
+    """
+    Decode a length-prefixed string
+
+    Args:
+    data (bytes | mmap): the buffer
+    offset (int): where the string starts
+
+    Returns:
+    tuple[str, int]: the string and the offset right after it
+    """
+    (length,) = _U32.unpack_from(data, offset)
+    start = offset + _U32.size
+    return str(data[start:start + length], "utf-8"), start + length
+
+
+def decode_int(data, offset: int):
+    """
+    Decode a signed 64 bits integer
+
+    Returns:
+    tuple[int, int]: the integer and the offset right after it
+    """
+    return _I64.unpack_from(data, offset)[0], offset + _I64.size
+
+
+def decode_number(data, offset: int):
+    """
+    Decode a number encoded by encode_number, keeping its type
+
+    Returns:
+    tuple[int | float, int]: the number and the offset right after it
+    """
+    tag = data[offset:offset + 1]
+    if tag == _TAG_FLOAT:
+        return _F64.unpack_from(data, offset + 1)[0], offset + 1 + _F64.size
+    if tag == _TAG_INT:
+        return decode_int(data, offset + 1)
+    if tag == _TAG_BIG_INT:
+        (length,) = _U32.unpack_from(data, offset + 1)
+        start = offset + 1 + _U32.size
+        return int.from_bytes(data[start:start + length], "big", signed=True), start + length
+    raise ValueError(f"Unknown number tag {tag!r}")
+
+
+def decode_transaction_fields(data, offset: int):
+    """
+    Decode a transaction encoded by encode_transaction
+
+    Returns:
+    tuple[tuple, int]: (sender, receiver, (token name, token symbol, token value), amount, timestamp)
+    and the offset right after the transaction
+    """
+    offset += _U32.size
+    sender, offset = decode_str(data, offset)
+    receiver, offset = decode_str(data, offset)
+    name, offset = decode_str(data, offset)
+    symbol, offset = decode_str(data, offset)
+    value = _F64.unpack_from(data, offset)[0]
+    amount, offset = decode_number(data, offset + _F64.size)
+    timestamp, offset = decode_str(data, offset)
+    return (sender, receiver, (name, symbol, value), amount, timestamp), offset
+
+
+def decode_block_fields(data, offset: int = 0, with_transactions: bool = True):
+    """
+    Decode a block encoded by encode_block
+
+    Args:
+    data (bytes | mmap): the buffer
+    offset (int): where the block starts
+    with_transactions (bool): False stops after the header (cheap access to the hash)
+
+    Returns:
+    tuple: (index, timestamp, previous_hash, hash, nonce, difficulty, transactions fields)
+    """
+    version = data[offset]
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Unsupported encoding version {version}")
+    index, offset = decode_int(data, offset + 1)
+    timestamp, offset = decode_str(data, offset)
+    previous_hash, offset = decode_str(data, offset)
+    block_hash, offset = decode_str(data, offset)
+    nonce, offset = decode_int(data, offset)
+    difficulty, offset = decode_int(data, offset)
+    transactions = []
+    if with_transactions:
+        (count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        for _ in range(count):
+            fields, offset = decode_transaction_fields(data, offset)
+            transactions.append(fields)
+    return index, timestamp, previous_hash, block_hash, nonce, difficulty, transactions
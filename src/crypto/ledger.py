@@ -0,0 +1,210 @@
+from dataclasses import dataclass, field
+from .block import Block
+
+SNAPSHOT_INTERVAL = 1000
+
+
+@dataclass
+class SpendReport:
+    """
+    Result of checking transactions against the balances, truthy when none was rejected.
+
+    Attributes:
+    accepted (list[Transaction]): the transactions that can go in a block, in order
+    rejected (list[tuple]): (position, transaction, reason) of each rejected transaction
+    """
+    accepted: list = field(default_factory=list)
+    rejected: list = field(default_factory=list)
+
+    def __bool__(self):
+        return not self.rejected
+
+
+def apply_transactions(balances: dict, transactions: list):
+    """
+    Move the amounts of transactions between the balances of their sender and receiver
+
+    Args:
+    balances (dict): (account, token symbol) -> balance, updated in place
+    transactions (list[Transaction]): the transactions
+    """
+    for tx in transactions:
+        symbol = tx.token.symbol
+        sender = (tx.sender, symbol)
+        receiver = (tx.receiver, symbol)
+        balances[sender] = balances.get(sender, 0) - tx.amount
+        balances[receiver] = balances.get(receiver, 0) + tx.amount
+
+
+class Ledger:
+    """
+    Account balances keyed by (account, token symbol), updated block by block.
+
+    Every snapshot_interval blocks a copy of the balances is kept, so the state at any
+    height is rebuilt from the nearest snapshot plus a short replay instead of from genesis.
+
+    Attributes:
+    applied (int): number of blocks applied (the position of the next block)
+    tip_hash (str): hash of the last applied block (None if no block was applied)
+    snapshot_interval (int): blocks between two snapshots
+    """
+
+    def __init__(self, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        if not isinstance(snapshot_interval, int) or snapshot_interval < 1:
+            raise ValueError("Snapshot interval must be a positive integer")
+        self.snapshot_interval = snapshot_interval
+        self._balances = {}
+        self._applied = 0
+        self._tip_hash = None
+        # applied -> (tip hash, balances copy)
+        self._snapshots = {}
+
+    @property
+    def applied(self):
+        return self._applied
+
+    @property
+    def tip_hash(self):
+        return self._tip_hash
+
+    def apply(self, block: Block):
+        """
+        Apply the transactions of the next block
+
+        Args:
+        block (Block): the block at position applied
+        """
+        apply_transactions(self._balances, block.transactions)
+        self._applied += 1
+        self._tip_hash = block.hash
+        if self._applied % self.snapshot_interval == 0:
+            self._snapshots[self._applied] = (self._tip_hash, dict(self._balances))
+
+    def balance(self, account: str, symbol: str):
+        """
+        Get the balance of an account in a token
+
+        Args:
+        account (str): the account
+        symbol (str): the token symbol
+
+        Returns:
+        float: the balance (0 if the account never used the token)
+        """
+        return self._balances.get((account, symbol), 0)
+
+    def balances(self, account: str = None):
+        """
+        Get the balances of an account, or all of them
+
+        Args:
+        account (str): the account (None for every account)
+
+        Returns:
+        dict: token symbol -> balance for an account, (account, symbol) -> balance otherwise
+        """
+        if account is None:
+            return dict(self._balances)
+        return {symbol: balance for (owner, symbol), balance in self._balances.items() if owner == account}
+
+    def check_transactions(self, transactions: list, issuers=()):
+        """
+        Check transactions in order against the current balances, as if they were applied one
+        after the other: the pending debits and credits of the accepted ones are tracked in a
+        separate map, so each check is O(1) and the balances are left untouched.
+        Every rejected transaction is reported with its reason, nothing is raised.
+
+        Args:
+        transactions (list[Transaction]): the candidate transactions
+        issuers (iterable[str]): accounts allowed to go below zero (they issue the tokens)
+
+        Returns:
+        SpendReport: the accepted and the rejected transactions
+        """
+        issuers = frozenset(issuers)
+        balances = self._balances
+        pending = {}
+        report = SpendReport()
+        for position, tx in enumerate(transactions):
+            amount = tx.amount
+            if not amount > 0:
+                report.rejected.append((position, tx, f"amount must be positive, got {amount}"))
+                continue
+            sender = (tx.sender, tx.token.symbol)
+            available = balances.get(sender, 0) + pending.get(sender, 0)
+            if tx.sender not in issuers and available < amount:
+                report.rejected.append((position, tx, f"insufficient {tx.token.symbol} balance: {tx.sender} has {available}, needs {amount}"))
+                continue
+            receiver = (tx.receiver, tx.token.symbol)
+            pending[sender] = pending.get(sender, 0) - amount
+            pending[receiver] = pending.get(receiver, 0) + amount
+            report.accepted.append(tx)
+        return report
+
+    def _nearest_snapshot(self, applied: int, blocks: list):
+        """
+        Latest snapshot taken at most applied blocks in whose tip is still in blocks
+        """
+        for count in sorted(self._snapshots, reverse=True):
+            tip_hash, balances = self._snapshots[count]
+            if count <= applied and count <= len(blocks) and blocks[count - 1].hash == tip_hash:
+                return count, balances
+        return 0, {}
+
+    def state_at(self, height: int, blocks: list):
+        """
+        Rebuild the balances right after the block at position height
+
+        Args:
+        height (int): position of the block in blocks
+        blocks (list[Block]): the chain the ledger was applied from
+
+        Returns:
+        dict: (account, token symbol) -> balance
+        """
+        if not 0 <= height < len(blocks):
+            raise IndexError(f"No block at height {height}")
+        applied = height + 1
+        if applied == self._applied and blocks[applied - 1].hash == self._tip_hash:
+            return dict(self._balances)
+        start, balances = self._nearest_snapshot(applied, blocks)
+        balances = dict(balances)
+        for block in blocks[start:applied]:
+            apply_transactions(balances, block.transactions)
+        return balances
+
+    def revert(self, block: Block, previous: Block = None):
+        """
+        Undo the last applied block (e.g. when a reorganisation drops it), in O(its transactions)
+
+        Args:
+        block (Block): the last applied block
+        previous (Block): the block before it, the new tip (None if it was the first block)
+        """
+        if not self._applied or block.hash != self._tip_hash:
+            raise ValueError("Block is not the last applied block")
+        self._snapshots.pop(self._applied, None)
+        balances = self._balances
+        for tx in reversed(block.transactions):
+            symbol = tx.token.symbol
+            sender = (tx.sender, symbol)
+            receiver = (tx.receiver, symbol)
+            balances[sender] = balances.get(sender, 0) + tx.amount
+            balances[receiver] = balances.get(receiver, 0) - tx.amount
+        self._applied -= 1
+        self._tip_hash = previous.hash if previous is not None else None
+
+    def rewind(self, blocks: list):
+        """
+        Go back to the part of blocks the ledger still agrees with (after a truncation or a
+        replaced block): the nearest valid snapshot is restored and the later ones dropped.
+        The blocks after it have to be applied again.
+
+        Args:
+        blocks (list[Block]): the chain as it is now
+        """
+        start, balances = self._nearest_snapshot(self._applied, blocks)
+        self._snapshots = {count: snapshot for count, snapshot in self._snapshots.items() if count <= start}
+        self._balances = dict(balances)
+        self._applied = start
+        self._tip_hash = blocks[start - 1].hash if start else None
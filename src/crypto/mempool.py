@@ -0,0 +1,242 @@
+import heapq
+from .encoding import encode_transaction
+from .transactions import Transaction
+
+# encoded bytes of pending transactions kept at most, the lowest priority ones are evicted beyond
+MAX_POOL_BYTES = 64 << 20
+ORDERS = ("fee", "timestamp")
+# transactions too big for the bytes left skipped in a row before a block is considered full
+MAX_SKIPPED = 64
+
+
+class _Reversed:
+    """
+    Wrap a heap key so that heapq pops the greatest key first
+    """
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+class _Entry:
+    __slots__ = ("transaction", "fee", "size", "rank")
+
+    def __init__(self, transaction, fee, size, rank):
+        self.transaction = transaction
+        self.fee = fee
+        self.size = size
+        # the smallest rank is drained first
+        self.rank = rank
+
+
+class Mempool:
+    """
+    Pending transactions waiting for a block.
+
+    Transactions are drained by priority: highest fee first, or oldest timestamp first,
+    ties in arrival order. A transaction already pending or already in the chain is refused (same txid).
+    The pool holds at most max_pool_bytes of encoded transactions, beyond that the lowest
+    priority ones are evicted. Two heaps (best first, worst first) give both ends in O(log n),
+    removed entries are dropped from the heaps lazily.
+
+    Attributes:
+    blockchain (BlockChain): the chain the blocks are built on
+    order (str): 'fee' or 'timestamp'
+    max_pool_bytes (int): memory cap, in encoded transaction bytes
+    issuers (set[str]): when given, build_block drops the overspends (see BlockChain.check_transactions)
+    on_reject (callable): called with (transaction, reason) for each overspend dropped by build_block
+    """
+
+    def __init__(self, blockchain=None, order: str = "fee", max_pool_bytes: int = MAX_POOL_BYTES, issuers=None,
+                 on_reject=None):
+        if order not in ORDERS:
+            raise ValueError(f"Order must be one of {ORDERS}")
+        if not isinstance(max_pool_bytes, int) or max_pool_bytes < 1:
+            raise ValueError("Pool size must be a positive integer")
+        self.blockchain = blockchain
+        self.order = order
+        self.max_pool_bytes = max_pool_bytes
+        self.issuers = None if issuers is None else set(issuers)
+        self.on_reject = on_reject
+        self._entries = {}
+        self._best = []
+        self._worst = []
+        self._bytes = 0
+        self._arrivals = 0
+        # lower bound of the pending sizes (the smallest size ever added)
+        self._min_size = float("inf")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, transaction: Transaction):
+        return transaction.txid in self._entries
+
+    @property
+    def bytes(self):
+        """
+        Encoded size of the pending transactions
+        """
+        return self._bytes
+
+    def add(self, transaction: Transaction, fee: float = 0):
+        """
+        Add a pending transaction
+
+        Args:
+        transaction (Transaction): the transaction
+        fee (float): the fee offered, used by the 'fee' order
+
+        Returns:
+        bool: False if the transaction is already pending or in the bound chain, or has a lower priority than everything kept in a full pool
+        """
+        if not isinstance(transaction, Transaction):
+            raise TypeError("Transaction must be an instance of Transaction class")
+        if not isinstance(fee, (int, float)):
+            raise TypeError("Fee must be a number (float or int)")
+        key = transaction.txid
+        if key in self._entries or self._in_chain(key):
+            return False
+        size = len(encode_transaction(transaction))
+        if size > self.max_pool_bytes:
+            return False
+        self._arrivals += 1
+        priority = -fee if self.order == "fee" else transaction.timestamp
+        entry = _Entry(transaction, fee, size, (priority, self._arrivals))
+
+        # make room by evicting lower priority transactions, never a higher priority one:
+        # they are only evicted once they are known to free enough bytes
+        victims = []
+        freed = 0
+        while self._bytes - freed + entry.size > self.max_pool_bytes:
+            worst_key = self._peek(self._worst, lambda item: item[0].key)
+            if worst_key is None or not entry.rank < self._entries[worst_key].rank:
+                for item in victims:
+                    heapq.heappush(self._worst, item)
+                return False
+            victims.append(heapq.heappop(self._worst))
+            freed += self._entries[worst_key].size
+        for _, victim_key in victims:
+            self._remove(victim_key)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._min_size = min(self._min_size, entry.size)
+        heapq.heappush(self._best, (entry.rank, key))
+        heapq.heappush(self._worst, (_Reversed(entry.rank), key))
+        return True
+
+    def _in_chain(self, txid: str):
+        if self.blockchain is None:
+            return False
+        try:
+            self.blockchain.find_transaction(txid)
+        except KeyError:
+            return False
+        return True
+
+    def _peek(self, heap: list, rank_of):
+        """
+        Key of the live entry on top of a heap, dropping the stale ones (None if the heap is empty)
+        """
+        while heap:
+            item = heap[0]
+            entry = self._entries.get(item[1])
+            if entry is not None and entry.rank == rank_of(item):
+                return item[1]
+            heapq.heappop(heap)
+        return None
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        # stale heap items are dropped when they reach the top, or all at once when they pile up
+        if len(self._best) > 2 * len(self._entries) + 64:
+            live = self._entries.items()
+            self._best = [(entry.rank, key) for key, entry in live]
+            self._worst = [(_Reversed(entry.rank), key) for key, entry in live]
+            heapq.heapify(self._best)
+            heapq.heapify(self._worst)
+        return entry
+
+    def remove(self, transactions: list):
+        """
+        Drop pending transactions, e.g. the ones of a block received from elsewhere
+
+        Args:
+        transactions (list[Transaction]): the transactions (the ones not pending are ignored)
+        """
+        for transaction in transactions:
+            key = transaction.txid
+            if key in self._entries:
+                self._remove(key)
+
+    def pop_transactions(self, max_txs: int = None, max_bytes: int = None):
+        """
+        Take the highest priority transactions fitting in the limits out of the pool.
+        A transaction too big for the bytes left is skipped (and kept) so smaller ones can still fit.
+        The search stops once the bytes left are below the smallest pending size, or after
+        MAX_SKIPPED transactions in a row did not fit, so a full block never scans the whole pool.
+
+        Args:
+        max_txs (int): maximum number of transactions (None for no limit)
+        max_bytes (int): maximum encoded size of the transactions (None for no limit)
+
+        Returns:
+        list[Transaction]: the transactions, in priority order
+        """
+        selected = []
+        skipped = []
+        budget = max_bytes
+        skipped_in_row = 0
+        while max_txs is None or len(selected) < max_txs:
+            if budget is not None and (budget < self._min_size or skipped_in_row >= MAX_SKIPPED):
+                break
+            key = self._peek(self._best, lambda item: item[0])
+            if key is None:
+                break
+            item = heapq.heappop(self._best)
+            entry = self._entries[key]
+            if budget is not None and entry.size > budget:
+                skipped.append(item)
+                skipped_in_row += 1
+                continue
+            skipped_in_row = 0
+            self._remove(key)
+            selected.append(entry.transaction)
+            if budget is not None:
+                budget -= entry.size
+        for item in skipped:
+            heapq.heappush(self._best, item)
+        return selected
+
+    def build_block(self, max_txs: int = None, max_bytes: int = None):
+        """
+        Drain the highest priority transactions into a new block following the last block of the chain.
+        With issuers set, overspending transactions are dropped from the pool instead of included,
+        each one is reported to on_reject with the reason.
+        The block is not appended: add it with blockchain.extend([block]).
+
+        Args:
+        max_txs (int): maximum number of transactions in the block (None for no limit)
+        max_bytes (int): maximum encoded size of its transactions (None for no limit)
+
+        Returns:
+        Block: the new block
+        """
+        if self.blockchain is None:
+            raise ValueError("Mempool is not bound to a blockchain")
+        # an empty chain fails before the pool is drained
+        self.blockchain.get_last()
+        transactions = self.pop_transactions(max_txs, max_bytes)
+        if self.issuers is not None:
+            report = self.blockchain.check_transactions(transactions, self.issuers)
+            transactions = report.accepted
+            if self.on_reject is not None:
+                for _, transaction, reason in report.rejected:
+                    self.on_reject(transaction, reason)
+        return self.blockchain.new_block(transactions)
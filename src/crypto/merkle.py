@@ -0,0 +1,139 @@
+import hashlib
+from .encoding import encode_transaction
+
+# Leaves and inner nodes are hashed with a different prefix so an inner node
+# can never be presented as a transaction (second preimage attack).
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+# hashers already fed with a prefix: copying one is cheaper than concatenating the prefix to every input
+_LEAF_HASHER = hashlib.sha256(_LEAF_PREFIX)
+_NODE_HASHER = hashlib.sha256(_NODE_PREFIX)
+
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+
+def leaf_hash(transaction) -> bytes:
+    """
+    Hash of a transaction as a leaf of the Merkle tree
+
+    Args:
+    transaction (Transaction): the transaction
+
+    Returns:
+    bytes: the SHA-256 digest of the leaf
+    """
+    hasher = _LEAF_HASHER.copy()
+    hasher.update(encode_transaction(transaction))
+    return hasher.digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    hasher = _NODE_HASHER.copy()
+    hasher.update(left)
+    hasher.update(right)
+    return hasher.digest()
+
+
+class MerkleTree:
+    """
+    Merkle tree over the transactions of a block
+
+    A level with an odd number of nodes promotes its last node unchanged to the
+    next level (no duplication, so two different lists can't share a root).
+
+    Attributes:
+    root (str): hex digest of the root (EMPTY_ROOT when there are no leaves)
+    """
+
+    def __init__(self, leaves: list):
+        """
+        Args:
+        leaves (list[bytes]): the leaf digests, in transaction order
+        """
+        level = list(leaves)
+        self._levels = [level]
+        while len(level) > 1:
+            # _node_hash inlined over the (left, right) pairs
+            upper = []
+            pairs = iter(level)
+            for left, right in zip(pairs, pairs):
+                hasher = _NODE_HASHER.copy()
+                hasher.update(left)
+                hasher.update(right)
+                upper.append(hasher.digest())
+            if len(level) % 2:
+                upper.append(level[-1])
+            self._levels.append(upper)
+            level = upper
+
+    @classmethod
+    def from_transactions(cls, transactions: list):
+        """
+        Build the tree of a list of transactions (their cached txids are the leaves).
+        The missing txids are computed and cached here in one loop, without a call per transaction.
+
+        Args:
+        transactions (list[Transaction]): the transactions
+
+        Returns:
+        MerkleTree: the tree
+        """
+        leaves = []
+        for transaction in transactions:
+            # Transaction.txid_bytes and leaf_hash inlined: the cache is filled the same way
+            leaf = transaction._txid
+            if leaf is None:
+                hasher = _LEAF_HASHER.copy()
+                hasher.update(encode_transaction(transaction))
+                leaf = transaction._txid = hasher.digest()
+            leaves.append(leaf)
+        return cls(leaves)
+
+    def __len__(self):
+        return len(self._levels[0])
+
+    @property
+    def root(self):
+        if not self._levels[0]:
+            return EMPTY_ROOT
+        return self._levels[-1][0].hex()
+
+    def proof(self, index: int):
+        """
+        Inclusion proof of the leaf at index
+
+        Args:
+        index (int): position of the transaction in the block
+
+        Returns:
+        list[tuple[str, bool]]: (sibling hex digest, True if the sibling is on the left) from the leaf up to the root
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("Transaction index out of range")
+        path = []
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            # a promoted node has no sibling on this level
+            if sibling < len(level):
+                path.append((level[sibling].hex(), sibling < index))
+            index //= 2
+        return path
+
+
+def verify_proof(transaction, proof: list, merkle_root: str) -> bool:
+    """
+    Check that a transaction belongs to a block knowing only its Merkle root, in O(log n)
+
+    Args:
+    transaction (Transaction): the transaction to check
+    proof (list[tuple[str, bool]]): the proof given by Block.merkle_proof
+    merkle_root (str): the Merkle root of the block
+
+    Returns:
+    bool: True if the proof links the transaction to the root
+    """
+    current = leaf_hash(transaction)
+    for sibling, is_left in proof:
+        sibling = bytes.fromhex(sibling)
+        current = _node_hash(sibling, current) if is_left else _node_hash(current, sibling)
+    return current.hex() == merkle_root
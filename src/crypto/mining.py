@@ -0,0 +1,154 @@
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from .encoding import encode_block_prefix, encode_int
+
+MAX_NONCE = 2 ** 63 - 1
+
+# how many nonces a worker tries between two looks at the stop event
+_CHECK_EVERY = 4096
+
+# set by the first worker finding a nonce, shared through the pool initializer
+_stop_event = None
+
+
+@dataclass
+class MiningResult:
+    """
+    Result of a nonce search
+
+    Attributes:
+    nonce (int): the nonce found (None if the searched range had no solution)
+    hash (str): the hash of the block with this nonce (None if not found)
+    attempts (int): number of hashes computed, all workers included
+    seconds (float): wall time of the search
+    workers (int): number of processes used
+    """
+    nonce: int
+    hash: str
+    attempts: int
+    seconds: float
+    workers: int = 1
+
+    @property
+    def hashes_per_sec(self):
+        return self.attempts / self.seconds if self.seconds else 0.0
+
+    @property
+    def hashes_per_sec_per_core(self):
+        return self.hashes_per_sec / self.workers
+
+
+def target_bytes(difficulty: int) -> bytes:
+    """
+    Threshold a digest must be below to have difficulty leading zero bits
+
+    Args:
+    difficulty (int): number of leading zero bits, between 1 and 256
+
+    Returns:
+    bytes: the 32 bytes big-endian target (digests compare as numbers when compared as bytes)
+    """
+    return (1 << (256 - difficulty)).to_bytes(33, "big")[1:] if difficulty else b"\xff" * 32
+
+
+def search_nonces(prefix: bytes, target: bytes, start: int, stop: int):
+    """
+    Try every nonce in [start, stop) until a hash is below the target.
+    The SHA-256 state of the fixed prefix is computed once, then copied for each attempt
+    so only the nonce bytes are hashed.
+
+    Args:
+    prefix (bytes): the encoded header prefix (crypto.encoding.encode_block_prefix)
+    target (bytes): the target from target_bytes
+    start (int): first nonce
+    stop (int): last nonce (excluded)
+
+    Returns:
+    tuple[int, int]: the nonce found (None if none) and the number of attempts
+    """
+    copy = hashlib.sha256(prefix).copy
+    pack = encode_int
+    for base in range(start, stop, _CHECK_EVERY):
+        if _stop_event is not None and _stop_event.is_set():
+            return None, base - start
+        for nonce in range(base, min(base + _CHECK_EVERY, stop)):
+            hasher = copy()
+            hasher.update(pack(nonce))
+            if hasher.digest() < target:
+                return nonce, nonce - start + 1
+    return None, stop - start
+
+
+def _init_worker(event):
+    global _stop_event
+    _stop_event = event
+
+
+def mine(block, workers: int = 1, start_nonce: int = 0, max_nonce: int = MAX_NONCE, chunk_size: int = 1 << 16):
+    """
+    Search a nonce giving the block a hash with block.difficulty leading zero bits.
+    With several workers the nonce space is cut into chunks handed to a process pool,
+    the search stops everywhere as soon as one worker finds a solution.
+    When found, the nonce and the hash are set on the block.
+
+    Args:
+    block (Block): the block to mine
+    workers (int): number of processes, 1 searches in this process
+    start_nonce (int): first nonce tried
+    max_nonce (int): last nonce tried (excluded)
+    chunk_size (int): nonces per task handed to a worker
+
+    Returns:
+    MiningResult: the nonce found and the hash rate
+    """
+    if workers < 1:
+        raise ValueError("Workers must be a positive integer")
+    prefix = encode_block_prefix(block)
+    target = target_bytes(block.difficulty)
+    start = time.perf_counter()
+
+    if workers == 1:
+        nonce, attempts = search_nonces(prefix, target, start_nonce, max_nonce)
+    else:
+        nonce, attempts = _mine_parallel(prefix, target, workers, start_nonce, max_nonce, chunk_size)
+
+    result = MiningResult(nonce, None, attempts, time.perf_counter() - start, workers)
+    if nonce is not None:
+        block.nonce = nonce
+        block.hash = block.compute_hash()
+        result.hash = block.hash
+    return result
+
+
+def _mine_parallel(prefix, target, workers, start_nonce, max_nonce, chunk_size):
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    event = context.Event()
+    chunks = iter(range(start_nonce, max_nonce, chunk_size))
+    found = None
+    attempts = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(event,)) as executor:
+        def submit(chunk_start):
+            return executor.submit(search_nonces, prefix, target, chunk_start, min(chunk_start + chunk_size, max_nonce))
+
+        # two chunks per worker in flight so no worker waits for the next one
+        pending = {submit(chunk_start) for chunk_start, _ in zip(chunks, range(workers * 2))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                nonce, tried = future.result()
+                attempts += tried
+                if nonce is not None and found is None:
+                    found = nonce
+                    event.set()
+                    for other in pending:
+                        other.cancel()
+            if found is None:
+                for chunk_start, _ in zip(chunks, range(len(done))):
+                    pending.add(submit(chunk_start))
+    return found, attempts
@@ -0,0 +1,218 @@
+import sqlite3
+from .block import Block
+from .tokens import Token
+from .transactions import Transaction
+
+# amount has no declared type on purpose: without affinity SQLite keeps ints
+# as INTEGER and floats as REAL, so 5 and 5.0 come back as they were stored
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    block_index INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    previous_hash TEXT NOT NULL,
+    hash TEXT NOT NULL UNIQUE,
+    nonce INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    value REAL NOT NULL,
+    UNIQUE (name, symbol, value)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    block_id INTEGER NOT NULL REFERENCES blocks (id),
+    position INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    token_id INTEGER NOT NULL REFERENCES tokens (id),
+    amount NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tokens_symbol ON tokens (symbol);
+CREATE INDEX IF NOT EXISTS idx_transactions_sender ON transactions (sender, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_receiver ON transactions (receiver, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_token ON transactions (token_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_block ON transactions (block_id, position);
+"""
+
+_SELECT_TRANSACTIONS = """
+SELECT t.sender, t.receiver, k.name, k.symbol, k.value, t.amount, t.timestamp
+FROM transactions t JOIN tokens k ON k.id = t.token_id
+"""
+
+
+class SQLiteRepository:
+    """
+    BlockChain persistence in SQLite, with indexed transaction queries
+    (by sender, receiver, token symbol and timestamp)
+
+    Attributes:
+    path (str): the database file (':memory:' for an in-memory database)
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a database in WAL mode
+
+        Args:
+        path (str): the database file
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._token_ids = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the database
+        """
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+
+    def _last_hash(self):
+        row = self._connection.execute("SELECT hash FROM blocks ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def _token_id(self, token: Token):
+        key = (token.name, token.symbol, token.value)
+        token_id = self._token_ids.get(key)
+        if token_id is None:
+            self._connection.execute("INSERT OR IGNORE INTO tokens (name, symbol, value) VALUES (?, ?, ?)", key)
+            token_id = self._connection.execute(
+                "SELECT id FROM tokens WHERE name = ? AND symbol = ? AND value = ?", key).fetchone()[0]
+            self._token_ids[key] = token_id
+        return token_id
+
+    def save_blocks(self, blocks: list):
+        """
+        Insert blocks and their transactions in one database transaction, with executemany.
+        The blocks must follow the last saved block.
+
+        Args:
+        blocks (list[Block]): the blocks, in order
+        """
+        blocks = list(blocks)
+        previous_hash = self._last_hash()
+        for block in blocks:
+            if not isinstance(block, Block):
+                raise TypeError("Block must be an instance of Block class")
+            if previous_hash is not None and block.previous_hash != previous_hash:
+                raise ValueError("Block's previous hash does not match the last block's hash")
+            previous_hash = block.hash
+
+        try:
+            with self._connection:
+                first_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM blocks").fetchone()[0]
+                self._connection.executemany(
+                    "INSERT INTO blocks (id, block_index, timestamp, previous_hash, hash, nonce, difficulty) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(first_id + i, block.index, block.timestamp, block.previous_hash, block.hash, block.nonce, block.difficulty)
+                     for i, block in enumerate(blocks)])
+                self._connection.executemany(
+                    "INSERT INTO transactions (block_id, position, sender, receiver, token_id, amount, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(first_id + i, position, tx.sender, tx.receiver, self._token_id(tx.token), tx.amount, tx.timestamp)
+                     for i, block in enumerate(blocks) for position, tx in enumerate(block.transactions)])
+        except sqlite3.Error:
+            # tokens inserted by the rolled back transaction are gone
+            self._token_ids.clear()
+            raise
+
+    def save_blockchain(self, blockchain):
+        """
+        Save the blocks of a blockchain that are not in the database yet
+
+        Args:
+        blockchain (BlockChain): the blockchain
+        """
+        self.save_blocks(blockchain.blocks[len(self):])
+
+    def find_transactions(self, sender: str = None, receiver: str = None, symbol: str = None, start: str = None, end: str = None):
+        """
+        Query transactions, every given filter must match (indexed lookups)
+
+        Args:
+        sender (str): the sender
+        receiver (str): the receiver
+        symbol (str): the token symbol
+        start (str): the earliest timestamp (included)
+        end (str): the latest timestamp (included)
+
+        Returns:
+        list[Transaction]: the matching transactions, in chain order
+        """
+        conditions = []
+        params = []
+        for column, value in (("t.sender = ?", sender), ("t.receiver = ?", receiver), ("k.symbol = ?", symbol),
+                              ("t.timestamp >= ?", start), ("t.timestamp <= ?", end)):
+            if value is not None:
+                conditions.append(column)
+                params.append(value)
+        query = _SELECT_TRANSACTIONS
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY t.block_id, t.position"
+        return [self._transaction(row) for row in self._connection.execute(query, params)]
+
+    def transactions_by_sender(self, sender: str):
+        """
+        Get all the transactions sent by an account
+
+        Args:
+        sender (str): the sender
+
+        Returns:
+        list[Transaction]: the transactions
+        """
+        return self.find_transactions(sender=sender)
+
+    def transactions_by_token(self, symbol: str, start: str = None, end: str = None):
+        """
+        Get all the transfers of a token, optionally between two timestamps
+
+        Args:
+        symbol (str): the token symbol
+        start (str): the earliest timestamp (included)
+        end (str): the latest timestamp (included)
+
+        Returns:
+        list[Transaction]: the transactions
+        """
+        return self.find_transactions(symbol=symbol, start=start, end=end)
+
+    def get_block(self, block_hash: str):
+        """
+        Get a block with its transactions by hash
+
+        Args:
+        block_hash (str): the hash of the block
+
+        Returns:
+        Block: the block, with its stored hash
+        """
+        row = self._connection.execute(
+            "SELECT id, block_index, timestamp, previous_hash, hash, nonce, difficulty FROM blocks WHERE hash = ?",
+            (block_hash,)).fetchone()
+        if row is None:
+            raise KeyError(f"No block with hash {block_hash}")
+        transactions = [self._transaction(tx) for tx in self._connection.execute(
+            _SELECT_TRANSACTIONS + " WHERE t.block_id = ? ORDER BY t.position", (row[0],))]
+        return Block.restore(row[1], row[2], transactions, row[3], row[4], row[5], row[6])
+
+    @staticmethod
+    def _transaction(row):
+        sender, receiver, name, symbol, value, amount, timestamp = row
+        return Transaction(sender, receiver, Token.intern(name, symbol, value), amount, timestamp)
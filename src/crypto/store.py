@@ -0,0 +1,217 @@
+import mmap
+import os
+import struct
+from .block import Block
+from .block_chain import BlockChain
+from .encoding import encode_block, decode_block_fields
+from .tokens import Token
+from .transactions import Transaction
+
+SEGMENT_FILE = "blocks.seg"
+INDEX_FILE = "blocks.idx"
+SEGMENT_MAGIC = b"BLKSEG01"
+
+_U32 = struct.Struct(">I")
+_OFFSET = struct.Struct(">Q")
+
+
+def decode_block(data, offset: int = 0):
+    """
+    Decode a block encoded by crypto.encoding.encode_block, keeping its stored hash
+
+    Args:
+    data (bytes): the buffer holding the record
+    offset (int): where the record starts
+
+    Returns:
+    Block: the block
+    """
+    index, timestamp, previous_hash, block_hash, nonce, difficulty, transactions = decode_block_fields(data, offset)
+    transactions = [
+        Transaction(sender, receiver, Token.intern(*token), amount, tx_timestamp)
+        for sender, receiver, token, amount, tx_timestamp in transactions
+    ]
+    return Block.restore(index, timestamp, transactions, previous_hash, block_hash, nonce, difficulty)
+
+
+class BlockStore:
+    """
+    Append-only block storage
+
+    Blocks are encoded (crypto.encoding.encode_block) and appended to a segment file as
+    length-prefixed records. A sidecar index holds the offset of every record, so opening
+    the store only maps both files and any block is decoded by index without touching the others.
+
+    Attributes:
+    directory (str): the folder holding the segment and the index
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) a store, the files are memory-mapped lazily
+
+        Args:
+        directory (str): the folder holding the segment and the index
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._segment = open(os.path.join(directory, SEGMENT_FILE), "a+b")
+        self._index = open(os.path.join(directory, INDEX_FILE), "a+b")
+        self._segment_map = None
+        self._index_map = None
+        if self._segment.seek(0, os.SEEK_END) == 0:
+            self._segment.write(SEGMENT_MAGIC)
+            self._segment.flush()
+        self._recover()
+        self._last_hash = self._read_hash(len(self) - 1) if len(self) else None
+
+    def _recover(self):
+        """
+        Drop what a crash may have left after the last indexed record
+        (a record is written before its offset, so the index is authoritative)
+        """
+        index_size = self._index.seek(0, os.SEEK_END)
+        segment_size = self._segment.seek(0, os.SEEK_END)
+        self._count = index_size // _OFFSET.size
+        end = len(SEGMENT_MAGIC)
+        while self._count:
+            self._index.seek((self._count - 1) * _OFFSET.size)
+            (offset,) = _OFFSET.unpack(self._index.read(_OFFSET.size))
+            if offset + _U32.size <= segment_size:
+                self._segment.seek(offset)
+                (length,) = _U32.unpack(self._segment.read(_U32.size))
+                if offset + _U32.size + length <= segment_size:
+                    end = offset + _U32.size + length
+                    break
+            # the record of this offset never reached the disk
+            self._count -= 1
+        if index_size != self._count * _OFFSET.size:
+            self._index.truncate(self._count * _OFFSET.size)
+        if segment_size > end:
+            self._segment.truncate(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Unmap and close the files
+        """
+        for mapped in (self._segment_map, self._index_map):
+            if mapped is not None:
+                mapped.close()
+        self._segment_map = self._index_map = None
+        self._segment.close()
+        self._index.close()
+
+    def __len__(self):
+        return self._count
+
+    def _maps(self, position: int):
+        """
+        Return the segment and index maps, re-mapping them when position was appended after the last mapping
+        """
+        if self._index_map is None or (position + 1) * _OFFSET.size > len(self._index_map):
+            for mapped in (self._segment_map, self._index_map):
+                if mapped is not None:
+                    mapped.close()
+            self._segment.flush()
+            self._index.flush()
+            self._segment_map = mmap.mmap(self._segment.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._segment_map, self._index_map
+
+    def _record(self, position: int):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Block store index out of range")
+        segment, index = self._maps(position)
+        (offset,) = _OFFSET.unpack_from(index, position * _OFFSET.size)
+        return segment, offset + _U32.size
+
+    def _read_hash(self, position: int):
+        segment, offset = self._record(position)
+        return decode_block_fields(segment, offset, with_transactions=False)[3]
+
+    def __getitem__(self, position: int):
+        """
+        Decode the block stored at a position, its stored hash is kept as it is
+
+        Args:
+        position (int): the position in the store (negative counts from the end)
+
+        Returns:
+        Block: the block
+        """
+        segment, offset = self._record(position)
+        return decode_block(segment, offset)
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self[position]
+
+    def get_last(self):
+        """
+        Get the last stored block
+
+        Returns:
+        Block: the last block
+        """
+        if not self._count:
+            raise ValueError("Block store is empty")
+        return self[-1]
+
+    def append(self, block: Block, sync: bool = False):
+        """
+        Append a block, it must link to the last stored block
+
+        Args:
+        block (Block): the block to append
+        sync (bool): fsync the files before returning
+        """
+        if not isinstance(block, Block):
+            raise TypeError("Block must be an instance of Block class")
+        if self._last_hash is not None and block.previous_hash != self._last_hash:
+            raise ValueError("Block's previous hash does not match the last block's hash")
+        record = encode_block(block)
+        offset = self._segment.seek(0, os.SEEK_END)
+        self._segment.write(_U32.pack(len(record)) + record)
+        self._segment.flush()
+        self._index.write(_OFFSET.pack(offset))
+        self._index.flush()
+        if sync:
+            os.fsync(self._segment.fileno())
+            os.fsync(self._index.fileno())
+        self._count += 1
+        self._last_hash = block.hash
+
+    def extend(self, blocks: list, sync: bool = False):
+        """
+        Append several blocks
+
+        Args:
+        blocks (list[Block]): the blocks, in order
+        sync (bool): fsync the files once all the blocks are written
+        """
+        for block in blocks:
+            self.append(block)
+        if sync:
+            os.fsync(self._segment.fileno())
+            os.fsync(self._index.fileno())
+
+    def load_blockchain(self):
+        """
+        Decode every stored block into an in-memory BlockChain, keeping the stored hashes
+        (BlockChain.validate re-checks them)
+
+        Returns:
+        BlockChain: the blockchain
+        """
+        if not self._count:
+            raise ValueError("Block store is empty")
+        blocks = list(self)
+        return BlockChain(blocks, blocks[0])
@@ -1,9 +1,17 @@
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 
-@dataclass
+# shared tokens kept by Token.intern, the least recently used ones are dropped beyond
+# (the value is a price: a long run can see a new one on every transaction)
+MAX_INTERNED_TOKENS = 4096
+# (name, symbol, value) -> shared Token, least recently used first, see Token.intern
+_interned = OrderedDict()
+
+@dataclass(slots=True)
 class Token:
     """
     Handle tokens 
+    (slotted: no per-instance __dict__, the fields are still type-checked at construction)
     
     Attributes:
     name (str): the name of the token
@@ -13,6 +21,10 @@ class Token:
     _name: str 
     _symbol: str
     _value: float
+    # shared by Token.intern: read-only
+    _interned: bool = field(default=False, init=False, repr=False, compare=False)
+    # canonical encoding cache (see crypto.encoding.encode_token), reset by every setter
+    _encoding: bytes = field(default=None, init=False, repr=False, compare=False)
 
 
     # Forcing symbol and name to be strings and value to be a float
@@ -20,6 +32,47 @@ class Token:
         self.name = self._name
         self.symbol = self._symbol
         self.value = self._value
+
+    @classmethod
+    def intern(cls, name: str, symbol: str, value: float):
+        """
+        Get the shared Token for these fields, created on first use.
+        Most transactions use a handful of tokens, sharing them saves one object per transaction.
+        The shared instances are read-only (their setters raise AttributeError): give a transaction
+        another token instead of changing a shared one. At most MAX_INTERNED_TOKENS are kept, the
+        least recently used is forgotten (the transactions holding it keep it, a new one is created
+        on its next use).
+
+        Args:
+        name (str): the name of the token
+        symbol (str): the symbol of the token
+        value (float): the price of 1 token
+
+        Returns:
+        Token: the shared token
+        """
+        key = (name, symbol, value)
+        try:
+            token = _interned.get(key)
+        except TypeError:
+            # unhashable fields: let the constructor report them
+            return cls(name, symbol, value)
+        if token is None:
+            token = _interned[key] = cls(name, symbol, value)
+            token._interned = True
+            if len(_interned) > MAX_INTERNED_TOKENS:
+                _interned.popitem(last=False)
+        else:
+            try:
+                _interned.move_to_end(key)
+            except KeyError:
+                # forgotten meanwhile by another thread
+                pass
+        return token
+
+    def _check_writable(self):
+        if self._interned:
+            raise AttributeError("Interned tokens are shared and cannot be modified")
     
     @property
     def name(self):
@@ -37,17 +90,23 @@ class Token:
     def name(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Token name must be a string")
+        self._check_writable()
         self._name = value
+        self._encoding = None
     
     @symbol.setter
     def symbol(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Token symbol must be a string")
+        self._check_writable()
         self._symbol = value
+        self._encoding = None
 
     @value.setter
     def value(self, value: float):
         if not isinstance(value, (int, float)):
             raise TypeError("Token value must be a number")
+        self._check_writable()
         self._value = float(value)
+        self._encoding = None
 
@@ -1,10 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from .merkle import leaf_hash
 from .tokens import Token
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """
     Class representing a transaction in the blockchain.
+    (slotted: no per-instance __dict__, the fields are still type-checked at construction)
 
     Attributes:
     sender (str): the sender
@@ -12,12 +14,15 @@ class Transaction:
     token (Token): the token used in the transaction
     amount (float): the amount sent (in tokens)
     timestamp (datetime): datetime of the transaction
+    txid (str): identifier of the transaction, its Merkle leaf hash (cached)
     """
     _sender: str
     _receiver: str
     _token: Token
     _amount: float
     _timestamp: str
+    # leaf digest cache, reset by every setter
+    _txid: bytes = field(default=None, init=False, repr=False, compare=False)
     
     # Forcing good types
     def __post_init__(self):
@@ -26,6 +31,21 @@ class Transaction:
         self.token = self._token
         self.amount = self._amount
         self.timestamp = self._timestamp
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Build a transaction from its JSON representation (as in template.json), the token is interned
+
+        Args:
+        data (dict): the transaction
+
+        Returns:
+        Transaction: the transaction
+        """
+        token = data['token']
+        return cls(data['sender'], data['receiver'], Token.intern(token['name'], token['symbol'], token['value']),
+                   data['amount'], data['timestamp'])
     
     @property
     def sender(self):
@@ -46,33 +66,51 @@ class Transaction:
     @property
     def timestamp(self):
         return self._timestamp
+
+    @property
+    def txid_bytes(self):
+        """
+        SHA-256 of the canonical encoding, as hashed in the Merkle tree (computed once)
+        """
+        if self._txid is None:
+            self._txid = leaf_hash(self)
+        return self._txid
+
+    @property
+    def txid(self):
+        return self.txid_bytes.hex()
     
     @sender.setter
     def sender(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Sender must be a string")
         self._sender = value
+        self._txid = None
     
     @receiver.setter
     def receiver(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Receiver must be a string")
         self._receiver = value
+        self._txid = None
 
     @token.setter
     def token(self, value: Token):
         if not isinstance(value, Token):
             raise TypeError("Token must be an instance of Token class")
         self._token = value
+        self._txid = None
 
     @amount.setter
     def amount(self, value: float):
         if not isinstance(value, (int, float)):
             raise TypeError("Amount must be a number (float or int)")
         self._amount = value
+        self._txid = None
 
     @timestamp.setter
     def timestamp(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Timestamp must be a string")
         self._timestamp = value
+        self._txid = None
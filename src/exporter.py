@@ -0,0 +1,136 @@
+import gzip
+import json
+import lzma
+import os
+
+# compression name -> (file extension, opener)
+COMPRESSIONS = {
+    'gzip': ('.gz', gzip.open),
+    'lzma': ('.xz', lzma.open)
+}
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def results_file_name(name, compression=None):
+    """
+    Add the extension of a compression to a results file name
+
+    Args:
+    name (str): the file name, without compression extension
+    compression (str): 'gzip', 'lzma' or None
+
+    Returns:
+    str: the file name
+    """
+    if compression is None:
+        return name
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of {sorted(COMPRESSIONS)}")
+    return name + COMPRESSIONS[compression][0]
+
+
+def open_results(file_path, mode='r'):
+    """
+    Open a results file as text, compressed files are (de)compressed on the fly according to their extension
+
+    Args:
+    file_path (str): the path to the file
+    mode (str): 'r' or 'w'
+
+    Returns:
+    file: the text file object
+    """
+    for extension, opener in COMPRESSIONS.values():
+        if file_path.endswith(extension):
+            return opener(file_path, mode + 't', encoding='utf-8')
+    return open(file_path, mode, encoding='utf-8', buffering=WRITE_BUFFER_SIZE if mode == 'w' else -1)
+
+
+def block_to_dict(block):
+    """
+    Convert a Block object to a dictionary for JSON
+
+    Args:
+    block (Block): the block to convert
+
+    Returns:
+    dict: a dictionary representation of the block
+    """
+    return {
+        'index': block.index,
+        'timestamp': block.timestamp,
+        'transactions': [
+            {
+                'sender': tx.sender,
+                'receiver': tx.receiver,
+                'token': {
+                    'name': tx.token.name,
+                    'symbol': tx.token.symbol,
+                    'value': tx.token.value
+                },
+                'amount': tx.amount,
+                'timestamp': tx.timestamp
+            } for tx in block.transactions
+        ],
+        'previous_hash': block.previous_hash,
+        'hash': block.hash,
+        'nonce': block.nonce,
+        'difficulty': block.difficulty
+    }
+
+
+def write_blockchain(blockchain, f, compact=False):
+    """
+    Stream a blockchain as {"genesis": ..., "blocks": [...]} JSON, one block at a time:
+    only one block is converted to a dictionary at once, whatever the length of the chain.
+    The indented output is the same as json.dump(..., indent=2).
+
+    Args:
+    blockchain (BlockChain): the blockchain to write
+    f (file): a text file object
+    compact (bool): no indentation nor spaces, for smaller files
+    """
+    if compact:
+        encoder = json.JSONEncoder(separators=(',', ':'))
+        genesis, first, separator, close, close_empty = encoder.encode(block_to_dict(blockchain.genesis)), '', ',', ']}', ']}'
+        f.write('{"genesis":%s,"blocks":[' % genesis)
+    else:
+        encoder = json.JSONEncoder(indent=2)
+        # encoded JSON strings never hold raw newlines, every newline is indentation
+        genesis = encoder.encode(block_to_dict(blockchain.genesis)).replace('\n', '\n  ')
+        first, separator, close, close_empty = '\n    ', ',\n    ', '\n  ]\n}', ']\n}'
+        f.write('{\n  "genesis": %s,\n  "blocks": [' % genesis)
+
+    written = 0
+    for block in blockchain.blocks:
+        chunk = encoder.encode(block_to_dict(block))
+        if not compact:
+            chunk = chunk.replace('\n', '\n    ')
+        f.write(separator if written else first)
+        f.write(chunk)
+        written += 1
+    f.write(close if written else close_empty)
+
+
+def export_blockchain(blockchain, file_path, compact=False):
+    """
+    Write a blockchain to a results file, compressed when its name ends with .gz or .xz.
+    The file is replaced atomically: an existing file (often the snapshot the chain was resumed
+    from) stays whole until the new one is completely written.
+
+    Args:
+    blockchain (BlockChain): the blockchain to write
+    file_path (str): the path to the file
+    compact (bool): no indentation nor spaces, for smaller files
+    """
+    # the temporary file keeps the extension, so it is compressed the same way
+    directory, name = os.path.split(file_path)
+    tmp_path = os.path.join(directory, '.tmp.' + name)
+    try:
+        with open_results(tmp_path, 'w') as f:
+            write_blockchain(blockchain, f, compact)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -1,13 +1,166 @@
 #!/usr/bin/env python 
+import argparse
+import collections
 import datetime
+import itertools
 import json
+import lzma
 import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from crypto.block_chain import BlockChain
 from crypto.block import Block
 from crypto.transactions import Transaction
 from crypto.tokens import Token
+from checkpoint import Checkpoint
+from exporter import COMPRESSIONS, export_blockchain, open_results, results_file_name
 from time import sleep
 
+JSON_BUFFER_SIZE = 1 << 16
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+CHECKPOINT_FILE = 'checkpoint.json'
+# parsed files waiting for the committer thread
+COMMIT_QUEUE_SIZE = 8
+
+def transaction_from_dict(tx):
+    """
+    Build a transaction from its JSON representation
+
+    Args:
+    tx (dict): the transaction, as in template.json
+
+    Returns:
+    Transaction: the transaction object
+    """
+    return Transaction.from_dict(tx)
+
+
+class _JsonStream:
+    """
+    Minimal incremental JSON reader: the file is read by chunks and values are
+    decoded one by one with json.JSONDecoder.raw_decode, so only the value being
+    decoded has to fit in memory.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = self._f.read(JSON_BUFFER_SIZE)
+        if not chunk:
+            self._eof = True
+        # drop what was already consumed
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self):
+        """
+        Skip whitespaces and return the next character ('' at the end of the file)
+        """
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos:self._pos + 1]
+            self._fill()
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """
+        Decode the next JSON value, reading more of the file until it is complete
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def _iter_json_array(f, key):
+    """
+    Yield the items of the array stored under key in the top-level object of a JSON file
+    """
+    stream = _JsonStream(f)
+    stream.expect('{')
+    if stream.peek() == '}':
+        raise KeyError(key)
+    while True:
+        name = stream.value()
+        stream.expect(':')
+        if name != key:
+            stream.value()
+        else:
+            stream.expect('[')
+            if stream.peek() == ']':
+                return
+            while True:
+                yield stream.value()
+                if stream.expect(',]') == ']':
+                    return
+        if stream.expect(',}') == '}':
+            raise KeyError(key)
+
+
+def iter_transactions(file_path):
+    """
+    Stream the transactions of a file, one at a time, with bounded memory.
+    JSON Lines files (.jsonl, one transaction per line) and JSON files shaped like template.json are supported.
+
+    Args:
+    file_path (str): the path to the file
+
+    Returns:
+    generator: the transactions objects
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if file_path.endswith(JSON_LINES_EXTENSIONS):
+            for line in f:
+                if line.strip():
+                    yield transaction_from_dict(json.loads(line))
+        else:
+            for tx in _iter_json_array(f, 'transactions'):
+                yield transaction_from_dict(tx)
+
+
+def iter_transaction_chunks(file_path, chunk_size):
+    """
+    Stream the transactions of a file by lists of at most chunk_size transactions
+
+    Args:
+    file_path (str): the path to the file
+    chunk_size (int): maximum number of transactions per list
+
+    Returns:
+    generator: lists of transactions objects
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    transactions = iter_transactions(file_path)
+    while True:
+        chunk = list(itertools.islice(transactions, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def load_transactions(file_path):
     """
     Load transactions from a JSON 
@@ -18,16 +171,140 @@ def load_transactions(file_path):
     Returns:
     list: list of transactions objects
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
+    return list(iter_transactions(file_path))
+
+def _split(transactions, chunk_size):
+    """
+    Split a list of transactions in lists of at most chunk_size transactions (one list if chunk_size is None or 0,
+    like the lazy path of parse_transaction_files)
+    """
+    if not chunk_size:
+        return [transactions]
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    return [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+
+
+def parse_transaction_files(file_paths, workers=1, chunk_size=None):
+    """
+    Parse transaction files, in a process pool when workers > 1.
+    Files are yielded in the order of file_paths whatever the order they are parsed in,
+    at most 2 * workers files are parsed ahead of the consumer.
+
+    Args:
+    file_paths (list): the files to parse
+    workers (int): number of processes, 1 streams each file lazily in the consumer's thread
+    chunk_size (int): maximum number of transactions per list (None for one list per file)
+
+    Returns:
+    generator: (file_path, iterable of lists of transactions objects) for each file
+    """
+    if workers <= 1:
+        for path in file_paths:
+            yield path, iter_transaction_chunks(path, chunk_size) if chunk_size else [load_transactions(path)]
+        return
+
+    paths = iter(file_paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque((path, executor.submit(load_transactions, path)) for path in itertools.islice(paths, workers * 2))
+        while pending:
+            path, future = pending.popleft()
+            transactions = future.result()
+            for next_path in itertools.islice(paths, 1):
+                pending.append((next_path, executor.submit(load_transactions, next_path)))
+            yield path, _split(transactions, chunk_size)
+
+
+def commit_transaction_files(blockchain, parsed_files, log=print):
+    """
+    Append one block per list of transactions from a single committer thread, in the order
+    the files are produced, while the calling thread keeps collecting the parsed files.
+
+    Args:
+    blockchain (BlockChain): the blockchain to append to
+    parsed_files (iterable): (file_path, iterable of lists of transactions) as given by parse_transaction_files
+    log (callable): called with a message for each file and block
+
+    Returns:
+    int: the number of blocks appended
+    """
+    pending = queue.Queue(maxsize=COMMIT_QUEUE_SIZE)
+    errors = []
+    appended = []
+
+    def committer():
+        while (item := pending.get()) is not None:
+            # after an error the remaining files are only drained
+            if errors:
+                continue
+            try:
+                file_path, chunks = item
+                log(f"Processing {os.path.basename(file_path)}...")
+                for transactions in chunks:
+                    block = blockchain.new_block(transactions)
+                    blockchain.extend([block])
+                    appended.append(block)
+                    log(f"Added block {block.index} with {len(transactions)} transactions")
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=committer, name="block-committer")
+    thread.start()
+    try:
+        for item in parsed_files:
+            if errors:
+                break
+            pending.put(item)
+    finally:
+        pending.put(None)
+        thread.join()
+    if errors:
+        raise errors[0]
+    return len(appended)
+
+def load_blockchain(file_path, trust_stored_hashes=False):
+    """
+    Load a blockchain saved by main(), without re-hashing the blocks on construction
+
+    Args:
+    file_path (str): the path to the results JSON (.gz and .xz files are decompressed)
+    trust_stored_hashes (bool): keep the stored hashes without verifying them
+
+    Returns:
+    BlockChain: the blockchain
+    """
+    with open_results(file_path) as f:
         data = json.load(f)
-    
-    transactions = []
-    for tx in data['transactions']:
-        token = Token(tx['token']['name'], tx['token']['symbol'], tx['token']['value'])
-        transaction = Transaction(tx['sender'], tx['receiver'], token, tx['amount'], tx['timestamp'])
-        transactions.append(transaction)
-    
-    return transactions
+    return BlockChain.from_dict(data, trust_stored_hashes)
+
+
+def resume_blockchain(checkpoint, results_root):
+    """
+    Reload the chain recorded by a checkpoint. Its stored hashes are trusted (its tip must be the
+    block recorded by the checkpoint), so a run does not hash the history again: only the blocks
+    appended afterwards are validated. --full rebuilds and validates everything.
+
+    Args:
+    checkpoint (Checkpoint): the checkpoint of the previous run
+    results_root (str): the results folder
+
+    Returns:
+    BlockChain: the chain, None if it is missing, cannot be read or does not end with the recorded block
+    """
+    if checkpoint is None or checkpoint.chain_file is None:
+        return None
+    chain_file = os.path.join(results_root, checkpoint.chain_file)
+    if not os.path.exists(chain_file):
+        return None
+    try:
+        blockchain = load_blockchain(chain_file, trust_stored_hashes=True)
+    except (OSError, EOFError, lzma.LZMAError, ValueError, KeyError, TypeError):
+        # a truncated or corrupted snapshot: the chain is rebuilt from the files
+        return None
+    if not blockchain.blocks or blockchain.get_last().hash != checkpoint.last_block_hash:
+        return None
+    return blockchain
+
 
 def create_blockchain(transactions):
     """
@@ -45,7 +322,7 @@ def create_blockchain(transactions):
     for i, tx in enumerate(transactions):
         previous_hash = blockchain.get_last().hash
         block = Block(i + 1, datetime.datetime.now().isoformat(), [tx], previous_hash, "")
-        blockchain.blocks.append(block)
+        blockchain.extend([block])
     
     return blockchain
 
@@ -94,70 +371,86 @@ def log_blockchain(blockchain, file_path):
         f.write("=" * 70 + "\n")
 
 
-def main():
+def _positive_int(value):
+    """
+    argparse type of the options that must be at least 1
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line options
+
+    Args:
+    argv (list): the arguments (defaults to sys.argv)
+
+    Returns:
+    argparse.Namespace: the options, as main() keyword arguments
+    """
+    parser = argparse.ArgumentParser(description="Blockchain simulation by @MathieuAudibert")
+    parser.add_argument('--chunk-size', type=_positive_int, default=None,
+                        help="maximum number of transactions per block (default: one block per file)")
+    parser.add_argument('--workers', type=_positive_int, default=1,
+                        help="processes parsing the transactions files in parallel (default: 1)")
+    parser.add_argument('--full', action='store_true',
+                        help="ignore the checkpoint and rebuild the chain from all the files")
+    parser.add_argument('--compact', action='store_true',
+                        help="write the results JSON without indentation")
+    parser.add_argument('--compress', choices=sorted(COMPRESSIONS), default=None,
+                        help="compress the results JSON (.gz or .xz)")
+    return parser.parse_args(argv)
+
+
+def main(chunk_size=None, workers=1, full=False, compact=False, compress=None):
     # useful variables
     today_str = datetime.datetime.now().strftime('%d-%m-%Y')
     transactions_dir = os.path.join(os.path.dirname(__file__), 'transactions')
-    results_dir = os.path.join(os.path.dirname(__file__), 'results', today_str)
+    results_root = os.path.join(os.path.dirname(__file__), 'results')
+    results_dir = os.path.join(results_root, today_str)
+    checkpoint_path = os.path.join(results_root, CHECKPOINT_FILE)
     os.makedirs(results_dir, exist_ok=True)
 
-    # get all transactions files (except template)
-    files = [f for f in os.listdir(transactions_dir) if f.endswith('.json') and f != 'template.json']
+    # get all transactions files (except template), in a deterministic order
+    files = sorted(f for f in os.listdir(transactions_dir) if f.endswith(('.json',) + JSON_LINES_EXTENSIONS) and f != 'template.json')
     print(f"[{today_str}]: Blockchain simulation by @MathieuAudibert")
-    print(f"[{today_str}]: Creating blockchain from all transaction files...")
-    
-    # create the genesis block and the blockchain
-    genesis_block = Block(0, datetime.datetime.now().isoformat(), [], "0", "Genesis")
-    blockchain = BlockChain([genesis_block], genesis_block)
-    
-    # process each transaction file
-    for i, filename in enumerate(files):
-        print(f"[{today_str}]: Processing {filename}...")
-        file_path = os.path.join(transactions_dir, filename)
-        transactions = load_transactions(file_path)
-        
-        previous_hash = blockchain.get_last().hash
-        block = Block(i + 1, datetime.datetime.now().isoformat(), transactions, previous_hash, "")
-        blockchain.blocks.append(block)
-        print(f"[{today_str}]: Added block {i + 1} with {len(transactions)} transactions")
 
-    #FIXME: a l'exterieur de la fonction main ? / outside main function ? 
-    def block_to_dict(block):
-        """
-        Convert a Block object to a dictionary for JSON 
-        
-        Args:
-        block (Block): the block to convert
+    # resume from the last checkpoint, unless a full rebuild is asked
+    checkpoint = None if full else Checkpoint.load(checkpoint_path)
+    blockchain = resume_blockchain(checkpoint, results_root)
+    if blockchain is None:
+        print(f"[{today_str}]: Creating blockchain from all transaction files...")
+        checkpoint = Checkpoint()
+        genesis_block = Block(0, datetime.datetime.now().isoformat(), [], "0", "Genesis")
+        blockchain = BlockChain([genesis_block], genesis_block)
+    else:
+        files = [f for f in files if not checkpoint.is_ingested(transactions_dir, f)]
+        print(f"[{today_str}]: Resuming blockchain from {checkpoint.chain_file} ({len(files)} new or changed files)...")
 
-        Returns:
-        dict: a dictionary representation of the block
-        """
-        return {
-            'index': block.index,
-            'timestamp': block.timestamp,
-            'transactions': [
-                {
-                    'sender': tx.sender,
-                    'receiver': tx.receiver,
-                    'token': {
-                        'name': tx.token.name,
-                        'symbol': tx.token.symbol,
-                        'value': tx.token.value
-                    },
-                    'amount': tx.amount,
-                    'timestamp': tx.timestamp
-                } for tx in block.transactions
-            ],
-            'previous_hash': block.previous_hash,
-            'hash': block.hash
-        }
-    blockchain_data = {
-        'genesis': block_to_dict(blockchain.genesis),
-        'blocks': [block_to_dict(b) for b in blockchain.blocks]
-    }
-    result_file = os.path.join(results_dir, f'blockchain-{today_str}.json')
-    with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump(blockchain_data, f, indent=2)
+    # parse the files (in parallel with several workers), blocks are chained in the files order
+    file_paths = [os.path.join(transactions_dir, filename) for filename in files]
+    parsed_files = parse_transaction_files(file_paths, workers, chunk_size)
+    commit_transaction_files(blockchain, parsed_files, log=lambda message: print(f"[{today_str}]: {message}"))
+
+    # only the blocks appended by this run are checked, a resumed chain is verified up to its recorded tip
+    report = blockchain.validate()
+    if not report:
+        raise ValueError(f"Block {blockchain.blocks[report.position].index} is invalid: {report.reason}")
+
+    # the chain is streamed block by block, memory stays flat whatever its length
+    result_name = results_file_name(f'blockchain-{today_str}.json', compress)
+    result_file = os.path.join(results_dir, result_name)
+    export_blockchain(blockchain, result_file, compact)
+
+    # the checkpoint is written once the chain is saved
+    for filename in files:
+        checkpoint.record(transactions_dir, filename)
+    checkpoint.chain_file = os.path.join(today_str, result_name)
+    checkpoint.last_block_hash = blockchain.get_last().hash
+    checkpoint.save(checkpoint_path)
 
     # useful infos
     print(f"[{today_str}]: Blockchain created successfully!")
@@ -171,4 +464,4 @@ def main():
     log_blockchain(blockchain, os.path.join(logs_dir, 'blocks.txt'))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(**vars(parse_args()))
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Network module for blockchain implementation
+
+This module contains the networked components:
+- IngestionServer: asyncio service receiving transactions and sealing blocks
+- SyncServer: asyncio service serving the chain to other nodes
+- sync_from, sync_with_peers: header-first download of the blocks of another node
+"""
+
+from .ingest import IngestionServer
+from .sync import SyncServer, sync_from, sync_with_peers
+
+__all__ = [
+    'IngestionServer',
+    'SyncServer',
+    'sync_from',
+    'sync_with_peers'
+]
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import datetime
+import json
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.transactions import Transaction
+
+# longest accepted line (one JSON transaction)
+MAX_LINE_BYTES = 1 << 20
+
+
+def build_block(index: int, timestamp: str, transactions: list, previous_hash: str):
+    """
+    Build and hash a block, run in the executor (module level so a process pool can pickle it)
+
+    Returns:
+    Block: the hashed block
+    """
+    block = Block(index, timestamp, transactions, previous_hash, "")
+    # the hash is lazy: compute it here, off the event loop
+    block.hash
+    return block
+
+
+class IngestionServer:
+    """
+    asyncio service receiving transactions as newline-delimited JSON (one transaction per
+    line, shaped like template.json) over TCP or a Unix socket.
+
+    Each line is answered with {"txid": ...} once the transaction is buffered, or {"error": ...}.
+    The buffer is sealed into a block on the chain every interval_ms milliseconds or as soon
+    as it holds max_txs transactions, whichever comes first. Blocks are built and hashed in an
+    executor so the event loop keeps serving clients, and appended on the loop one at a time.
+    A batch whose block cannot be built goes back to the buffer, and a failed background seal
+    is logged without stopping the timer.
+
+    Attributes:
+    blockchain (BlockChain): the chain the blocks are sealed onto
+    max_txs (int): transactions that trigger a seal
+    interval_ms (int): milliseconds between two timed seals
+    executor (Executor): where blocks are hashed (None for the loop's default thread pool)
+    address: the listening (host, port), or the socket path, once started
+    """
+
+    def __init__(self, blockchain: BlockChain, max_txs: int = 1000, interval_ms: int = 500, executor=None, on_block=None,
+                 log=print):
+        """
+        Args:
+        blockchain (BlockChain): the chain, it must hold at least its genesis block
+        max_txs (int): transactions that trigger a seal
+        interval_ms (int): milliseconds between two timed seals
+        executor (Executor): where blocks are hashed (None for the loop's default thread pool)
+        on_block (callable): called with each sealed block
+        log (callable): called with a message when a background seal fails
+        """
+        if not isinstance(max_txs, int) or max_txs < 1:
+            raise ValueError("Max transactions must be a positive integer")
+        if not isinstance(interval_ms, (int, float)) or interval_ms <= 0:
+            raise ValueError("Interval must be a positive number of milliseconds")
+        self.blockchain = blockchain
+        self.max_txs = max_txs
+        self.interval_ms = interval_ms
+        self.executor = executor
+        self.on_block = on_block
+        self.log = log
+        self.address = None
+        self._buffer = []
+        self._server = None
+        self._timer = None
+        self._seal_lock = None
+        self._seals = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """
+        Start listening, on a Unix socket when path is given (port 0 picks a free port)
+
+        Args:
+        host (str): the TCP host
+        port (int): the TCP port
+        path (str): the Unix socket path
+        """
+        self._seal_lock = asyncio.Lock()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE_BYTES)
+            self.address = path
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        self._timer = asyncio.create_task(self._seal_periodically())
+
+    async def close(self):
+        """
+        Stop listening and seal what is still buffered
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._seals:
+            await asyncio.gather(*self._seals)
+        await self.seal()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def pending(self):
+        """
+        Number of buffered transactions
+        """
+        return len(self._buffer)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                writer.write(self._receive(line))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            # the client went away or sent an oversized line
+            pass
+        finally:
+            writer.close()
+
+    def _receive(self, line: bytes):
+        """
+        Buffer the transaction of a line and return the answer line
+        """
+        try:
+            transaction = Transaction.from_dict(json.loads(line))
+            # computed before buffering: a transaction that cannot be encoded never reaches a block
+            txid = transaction.txid
+        except (ValueError, KeyError, TypeError) as e:
+            return json.dumps({"error": f"{type(e).__name__}: {e}"}).encode() + b"\n"
+        self._buffer.append(transaction)
+        # a running seal keeps going while full blocks are buffered
+        if len(self._buffer) >= self.max_txs and not self._seals:
+            self._schedule_seal()
+        return json.dumps({"txid": txid}).encode() + b"\n"
+
+    def _schedule_seal(self):
+        task = asyncio.create_task(self._seal_logged(full_blocks_only=True))
+        self._seals.add(task)
+        task.add_done_callback(self._seals.discard)
+
+    async def _seal_logged(self, full_blocks_only: bool = False):
+        # a failed background seal is logged, its batch is back in the buffer for the next one
+        try:
+            await self.seal(full_blocks_only)
+        except Exception as e:
+            self.log(f"Sealing failed, {self.pending} transactions stay buffered: {type(e).__name__}: {e}")
+
+    async def _seal_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval_ms / 1000)
+            await self._seal_logged()
+
+    async def seal(self, full_blocks_only: bool = False):
+        """
+        Seal the buffered transactions (max_txs at most per block) onto the chain.
+        If a block cannot be built or appended, its transactions go back to the front of the buffer
+        and the error is raised.
+
+        Args:
+        full_blocks_only (bool): leave the last max_txs - 1 transactions at most for the timer
+
+        Returns:
+        list[Block]: the sealed blocks
+        """
+        sealed = []
+        async with self._seal_lock:
+            loop = asyncio.get_running_loop()
+            while len(self._buffer) >= (self.max_txs if full_blocks_only else 1):
+                transactions = self._buffer[:self.max_txs]
+                del self._buffer[:self.max_txs]
+                last = self.blockchain.get_last()
+                try:
+                    block = await loop.run_in_executor(self.executor, build_block, last.index + 1,
+                                                       datetime.datetime.now().isoformat(), transactions, last.hash)
+                    # appends only happen here, under the lock, so the tip cannot move meanwhile
+                    self.blockchain.extend([block])
+                except BaseException:
+                    self._buffer[:0] = transactions
+                    raise
+                sealed.append(block)
+                if self.on_block is not None:
+                    self.on_block(block)
+        return sealed
+
+
+async def serve(host: str, port: int, path: str, max_txs: int, interval_ms: int):
+    genesis_block = Block(0, datetime.datetime.now().isoformat(), [], "0", "Genesis")
+    blockchain = BlockChain([genesis_block], genesis_block)
+    server = IngestionServer(blockchain, max_txs, interval_ms,
+                             on_block=lambda block: print(f"Sealed block {block.index} with {len(block.transactions)} transactions"))
+    await server.start(host, port, path)
+    print(f"Listening on {server.address}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transactions ingestion server (newline-delimited JSON)")
+    parser.add_argument('--host', default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--unix', default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument('--max-txs', type=int, default=1000, help="transactions per block (default: 1000)")
+    parser.add_argument('--interval-ms', type=int, default=500, help="milliseconds between two seals (default: 500)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_txs, args.interval_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import asyncio
+import json
+import struct
+from crypto.block_chain import BlockChain
+from crypto.encoding import encode_block
+from crypto.store import decode_block
+
+HEADER_BATCH = 2000
+BODY_BATCH = 250
+CONNECTIONS = 4
+# longest line or body payload exchanged
+STREAM_LIMIT = 1 << 26
+
+_U32 = struct.Struct(">I")
+
+
+class SyncServer:
+    """
+    Serves a blockchain to other nodes over TCP.
+
+    Requests are JSON lines, answered with a JSON line:
+    - {"op": "tip"} -> {"height", "index", "hash"} of the last block (height is its position)
+    - {"op": "headers", "start", "count"} -> {"headers": [[index, previous_hash, hash], ...]} from position start
+    - {"op": "blocks", "start", "count"} -> {"count", "bytes"} followed by bytes of length-prefixed
+      block records (crypto.encoding.encode_block)
+    A malformed request (invalid JSON, missing or invalid fields) is answered with {"error": message},
+    like an unknown operation. A connection can send any number of requests.
+
+    Attributes:
+    blockchain (BlockChain): the served chain
+    address (tuple): the listening (host, port), once started
+    """
+
+    def __init__(self, blockchain: BlockChain):
+        self.blockchain = blockchain
+        self.address = None
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start listening (port 0 picks a free port)
+
+        Args:
+        host (str): the host
+        port (int): the port
+        """
+        self._server = await asyncio.start_server(self._handle, host, port, limit=STREAM_LIMIT)
+        self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """
+        Stop listening
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                writer.write(self._answer(line))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client went away or sent an oversized line
+            pass
+        finally:
+            writer.close()
+
+    def _answer(self, line: bytes):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _line({"error": f"Invalid JSON request: {e}"})
+        try:
+            return self._dispatch(request)
+        except (KeyError, TypeError, ValueError) as e:
+            return _line({"error": str(e.args[0]) if e.args else type(e).__name__})
+
+    def _dispatch(self, request):
+        if not isinstance(request, dict):
+            raise TypeError("Request must be a JSON object")
+        blocks = self.blockchain.blocks
+        op = request.get("op")
+        if op == "tip":
+            if not blocks:
+                return _line({"height": -1, "index": None, "hash": None})
+            return _line({"height": len(blocks) - 1, "index": blocks[-1].index, "hash": blocks[-1].hash})
+        if op in ("headers", "blocks"):
+            missing = [name for name in ("start", "count") if name not in request]
+            if missing:
+                raise KeyError(f"Missing field {missing[0]!r}")
+            start, count = request["start"], request["count"]
+            if type(start) is not int or type(count) is not int:
+                raise TypeError("Start and count must be integers")
+            if start < 0 or count < 0:
+                raise ValueError("Start and count must not be negative")
+            selected = blocks[start:start + count]
+            if op == "headers":
+                return _line({"headers": [[block.index, block.previous_hash, block.hash] for block in selected]})
+            records = [encode_block(block) for block in selected]
+            payload = b"".join(_U32.pack(len(record)) + record for record in records)
+            return _line({"count": len(records), "bytes": len(payload)}) + payload
+        return _line({"error": f"Unknown operation {op!r}"})
+
+
+def _line(message: dict):
+    return json.dumps(message).encode() + b"\n"
+
+
+class _Peer:
+    """
+    One connection to a SyncServer
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int):
+        return cls(*await asyncio.open_connection(host, port, limit=STREAM_LIMIT))
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def request(self, **message):
+        self._writer.write(_line(message))
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Peer closed the connection")
+        answer = json.loads(line)
+        if "error" in answer:
+            raise ValueError(answer["error"])
+        return answer
+
+    async def tip(self):
+        return await self.request(op="tip")
+
+    async def headers(self, start: int, count: int):
+        return (await self.request(op="headers", start=start, count=count))["headers"]
+
+    async def blocks(self, start: int, count: int):
+        answer = await self.request(op="blocks", start=start, count=count)
+        payload = await self._reader.readexactly(answer["bytes"])
+        blocks = []
+        offset = 0
+        for _ in range(answer["count"]):
+            (length,) = _U32.unpack_from(payload, offset)
+            blocks.append(decode_block(payload, offset + _U32.size))
+            offset += _U32.size + length
+        return blocks
+
+
+async def fetch_tip(host: str, port: int):
+    """
+    Ask a node for its tip
+
+    Args:
+    host (str): the node host
+    port (int): the node port
+
+    Returns:
+    dict: {"height", "index", "hash"} of its last block
+    """
+    peer = await _Peer.connect(host, port)
+    try:
+        return await peer.tip()
+    finally:
+        await peer.close()
+
+
+async def _download_headers(peer: _Peer, blockchain: BlockChain, stop: int, batch: int):
+    """
+    Download the headers of positions [len(blocks), stop) and check that they link to our tip and to each other
+    """
+    previous = blockchain.blocks[-1] if blockchain.blocks else None
+    previous_hash = previous.hash if previous else None
+    previous_index = previous.index if previous else None
+    headers = []
+    while len(blockchain.blocks) + len(headers) < stop:
+        received = await peer.headers(len(blockchain.blocks) + len(headers), min(batch, stop - len(blockchain.blocks) - len(headers)))
+        if not received:
+            break
+        for index, header_previous_hash, block_hash in received:
+            if previous_hash is not None and header_previous_hash != previous_hash:
+                raise ValueError(f"Peer header {index} does not link to the previous block")
+            if previous_index is not None and index != previous_index + 1:
+                raise ValueError(f"Peer header {index} does not follow index {previous_index}")
+            previous_hash, previous_index = block_hash, index
+        headers.extend(received)
+    return headers
+
+
+async def sync_from(blockchain: BlockChain, host: str, port: int, header_batch: int = HEADER_BATCH,
+                    body_batch: int = BODY_BATCH, connections: int = CONNECTIONS):
+    """
+    Append the blocks a node has beyond our tip, header first: the headers are downloaded in
+    large batches on one connection and their links checked, then the bodies are fetched in
+    parallel over a pool of connections. Each body must match its header, and the blocks are
+    validated (hashes recomputed) as they are appended in order. Both chains must share their
+    first blocks (the same genesis): a peer on another branch is refused. Our own blocks are
+    validated first, so an invalid block found while appending is always one of the peer's.
+
+    Args:
+    blockchain (BlockChain): our chain, extended in place
+    host (str): the node host
+    port (int): the node port
+    header_batch (int): headers per request
+    body_batch (int): blocks per request
+    connections (int): connections fetching bodies in parallel
+
+    Returns:
+    int: the number of blocks appended
+    """
+    report = blockchain.validate()
+    if not report:
+        raise ValueError(f"Local block {blockchain.blocks[report.position].index} is invalid: {report.reason}")
+    start = len(blockchain.blocks)
+    peer = await _Peer.connect(host, port)
+    try:
+        tip = await peer.tip()
+        if tip["height"] < start:
+            return 0
+        headers = await _download_headers(peer, blockchain, tip["height"] + 1, header_batch)
+    finally:
+        await peer.close()
+    if not headers:
+        return 0
+
+    stop = start + len(headers)
+    ranges = asyncio.Queue()
+    for range_start in range(start, stop, body_batch):
+        ranges.put_nowait((range_start, min(range_start + body_batch, stop)))
+    bodies = {}
+
+    def append_ready():
+        # append the contiguous blocks received so far, in order
+        ready = []
+        while (position := len(blockchain.blocks) + len(ready)) in bodies:
+            ready.append(bodies.pop(position))
+        if not ready:
+            return
+        blockchain.extend(ready)
+        # the blocks before start were validated up front, only the peer's blocks are checked here
+        report = blockchain.validate()
+        if not report:
+            invalid = blockchain.blocks[report.position]
+            blockchain.truncate(report.position)
+            raise ValueError(f"Peer block {invalid.index} is invalid: {report.reason}")
+
+    async def fetch_bodies():
+        worker = await _Peer.connect(host, port)
+        try:
+            while not ranges.empty():
+                range_start, range_stop = ranges.get_nowait()
+                blocks = await worker.blocks(range_start, range_stop - range_start)
+                if len(blocks) != range_stop - range_start:
+                    raise ValueError("Peer sent fewer blocks than announced")
+                for position, block in enumerate(blocks, range_start):
+                    if block.hash != headers[position - start][2]:
+                        raise ValueError(f"Peer block {block.index} does not match its header")
+                    bodies[position] = block
+                append_ready()
+        finally:
+            await worker.close()
+
+    tasks = [asyncio.create_task(fetch_bodies()) for _ in range(max(1, min(connections, ranges.qsize())))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return len(blockchain.blocks) - start
+
+
+async def sync_with_peers(blockchain: BlockChain, peers: list, **options):
+    """
+    Sync from the peer with the longest chain (peers that cannot be reached are skipped)
+
+    Args:
+    blockchain (BlockChain): our chain, extended in place
+    peers (list[tuple[str, int]]): the (host, port) of the other nodes
+    options: passed to sync_from
+
+    Returns:
+    int: the number of blocks appended
+    """
+    tips = await asyncio.gather(*(fetch_tip(host, port) for host, port in peers), return_exceptions=True)
+    reachable = [(tip["height"], peer) for tip, peer in zip(tips, peers) if not isinstance(tip, BaseException)]
+    if not reachable:
+        return 0
+    height, (host, port) = max(reachable, key=lambda item: item[0])
+    if height < len(blockchain.blocks):
+        return 0
+    return await sync_from(blockchain, host, port, **options)
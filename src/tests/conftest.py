@@ -38,6 +38,54 @@ def sample_blockchain(sample_block):
     return BlockChain([genesis_block, sample_block], genesis_block)
 
 
+@pytest.fixture
+def make_transaction(sample_token):
+    """Factory of transactions (in the sample token by default), told apart by their amount"""
+    def make(amount, timestamp=date_test, sender="Alice", receiver="Bob", token=None):
+        return Transaction(sender, receiver, token or sample_token, amount, timestamp)
+    return make
+
+
+@pytest.fixture
+def make_transaction_data(make_transaction):
+    """Factory of transactions like make_transaction, as the dictionaries of the transaction files"""
+    def make(*args, **kwargs):
+        tx = make_transaction(*args, **kwargs)
+        return {
+            "sender": tx.sender,
+            "receiver": tx.receiver,
+            "token": {"name": tx.token.name, "symbol": tx.token.symbol, "value": tx.token.value},
+            "amount": tx.amount,
+            "timestamp": tx.timestamp
+        }
+    return make
+
+
+@pytest.fixture
+def grow_blockchain(make_transaction):
+    """Factory appending count valid blocks to a blockchain, block i with nonce i and holding transactions(i) (txs_per_block transactions by default)"""
+    def grow(blockchain, count, txs_per_block=1, transactions=None):
+        for _ in range(count):
+            last = blockchain.get_last()
+            index = last.index + 1
+            if transactions is None:
+                block_transactions = [make_transaction(index * txs_per_block + j) for j in range(txs_per_block)]
+            else:
+                block_transactions = transactions(index)
+            blockchain.extend([Block(index, date_test, block_transactions, last.hash, "", index)])
+        return blockchain
+    return grow
+
+
+@pytest.fixture
+def make_blockchain(grow_blockchain):
+    """Factory of valid blockchains of length blocks, genesis included (the options are the ones of grow_blockchain)"""
+    def make(length, **options):
+        genesis_block = Block(0, date_test, [], "0", "Genesis")
+        return grow_blockchain(BlockChain([genesis_block], genesis_block), length - 1, **options)
+    return make
+
+
 @pytest.fixture
 def temp_transactions_file():
     """Create a temporary transactions JSON file for testing"""
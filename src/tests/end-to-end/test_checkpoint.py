@@ -0,0 +1,155 @@
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import main
+from checkpoint import Checkpoint
+
+
+def write_transactions(directory, filename, sender, amount):
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"transactions": [{
+            "sender": sender,
+            "receiver": "Bob",
+            "token": {"name": "Bitcoin", "symbol": "BTC", "value": 1.0},
+            "amount": amount,
+            "timestamp": "2025-07-15T12:00:00"
+        }]}, f)
+    return path
+
+
+class TestCheckpoint:
+    """Tests for the resumable ingestion of main.py"""
+
+    @pytest.fixture
+    def transactions_dir(self, temp_directory):
+        path = os.path.join(temp_directory, "transactions")
+        os.makedirs(path)
+        return path
+
+    def run_main(self, temp_directory, **kwargs):
+        with patch('builtins.print'), patch('datetime.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "15-07-2025"
+            mock_datetime.now.return_value.isoformat.return_value = "2025-07-15T12:00:00"
+            with patch('os.path.dirname', return_value=temp_directory):
+                main.main(**kwargs)
+        with open(os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json")) as f:
+            return json.load(f)
+
+    def senders(self, blockchain_data):
+        return [tx["sender"] for block in blockchain_data["blocks"] for tx in block["transactions"]]
+
+    def test_checkpoint_is_written(self, temp_directory, transactions_dir):
+        """Test that a run records its files and the last block"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+
+        blockchain_data = self.run_main(temp_directory)
+
+        checkpoint = Checkpoint.load(os.path.join(temp_directory, "results", main.CHECKPOINT_FILE))
+        assert set(checkpoint.files) == {"a.json"}
+        assert checkpoint.last_block_hash == blockchain_data["blocks"][-1]["hash"]
+        assert checkpoint.chain_file == os.path.join("15-07-2025", "blockchain-15-07-2025.json")
+
+    def test_rerun_only_ingests_new_files(self, temp_directory, transactions_dir):
+        """Test that a second run appends the new file to the persisted chain"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+        first = self.run_main(temp_directory)
+        write_transactions(transactions_dir, "b.json", "Bruno", 2)
+
+        second = self.run_main(temp_directory)
+
+        assert self.senders(second) == ["Alice", "Bruno"]
+        assert second["blocks"][:2] == first["blocks"]
+        assert second["blocks"][2]["previous_hash"] == first["blocks"][-1]["hash"]
+
+    def test_rerun_without_changes_appends_nothing(self, temp_directory, transactions_dir):
+        """Test that unchanged and touched-only files are skipped"""
+        path = write_transactions(transactions_dir, "a.json", "Alice", 1)
+        first = self.run_main(temp_directory)
+        os.utime(path, ns=(1, 1))
+
+        second = self.run_main(temp_directory)
+
+        assert second["blocks"] == first["blocks"]
+
+    def test_rerun_ingests_changed_files(self, temp_directory, transactions_dir):
+        """Test that a file whose content changed is ingested again"""
+        path = write_transactions(transactions_dir, "a.json", "Alice", 1)
+        self.run_main(temp_directory)
+        write_transactions(transactions_dir, "a.json", "Alize", 1)
+        os.utime(path, ns=(1, 1))
+
+        second = self.run_main(temp_directory)
+
+        assert self.senders(second) == ["Alice", "Alize"]
+
+    def test_full_rebuild(self, temp_directory, transactions_dir):
+        """Test that full=True ignores the checkpoint"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+        self.run_main(temp_directory)
+
+        second = self.run_main(temp_directory, full=True)
+
+        assert self.senders(second) == ["Alice"]
+
+    def test_missing_chain_rebuilds(self, temp_directory, transactions_dir):
+        """Test that a checkpoint pointing to a missing chain is ignored"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+        self.run_main(temp_directory)
+        os.remove(os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json"))
+
+        second = self.run_main(temp_directory)
+
+        assert self.senders(second) == ["Alice"]
+
+    def test_unreadable_chain_rebuilds(self, temp_directory, transactions_dir):
+        """Test that a checkpoint pointing to a truncated chain is ignored"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+        self.run_main(temp_directory)
+        chain_file = os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json")
+        with open(chain_file, 'r+') as f:
+            f.truncate(os.path.getsize(chain_file) // 2)
+
+        checkpoint = Checkpoint.load(os.path.join(temp_directory, "results", main.CHECKPOINT_FILE))
+        assert main.resume_blockchain(checkpoint, os.path.join(temp_directory, "results")) is None
+        second = self.run_main(temp_directory)
+
+        assert self.senders(second) == ["Alice"]
+
+    def test_resume_does_not_hash_history(self, temp_directory, transactions_dir):
+        """Test that a resumed chain only validates the blocks appended by the run"""
+        for i in range(3):
+            write_transactions(transactions_dir, f"{i}.json", f"Sender{i}", i + 1)
+        self.run_main(temp_directory)
+        write_transactions(transactions_dir, "new.json", "Nina", 4)
+        validated = []
+        validate = main.BlockChain.validate
+
+        def counting_validate(blockchain, full=False):
+            report = validate(blockchain, full)
+            validated.append(report.checked)
+            return report
+
+        with patch.object(main.BlockChain, "validate", counting_validate):
+            second = self.run_main(temp_directory)
+
+        assert self.senders(second) == ["Sender0", "Sender1", "Sender2", "Nina"]
+        assert validated == [1]
+
+    def test_load_blockchain_rejects_tampered_block(self, temp_directory, transactions_dir):
+        """Test that a stored block whose content changed is rejected"""
+        write_transactions(transactions_dir, "a.json", "Alice", 1)
+        self.run_main(temp_directory)
+        chain_file = os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json")
+        with open(chain_file) as f:
+            data = json.load(f)
+        data["blocks"][1]["transactions"][0]["amount"] = 1000
+        with open(chain_file, 'w') as f:
+            json.dump(data, f)
+
+        with pytest.raises(ValueError, match="hash does not match its content"):
+            main.load_blockchain(chain_file)
@@ -0,0 +1,99 @@
+import pytest
+import gzip
+import json
+import lzma
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import main
+from exporter import block_to_dict, export_blockchain, open_results, results_file_name
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+
+date_test = "2025-07-15T12:00:00"
+
+
+def as_dict(blockchain):
+    return {'genesis': block_to_dict(blockchain.genesis), 'blocks': [block_to_dict(b) for b in blockchain.blocks]}
+
+
+class TestExporter:
+    """Tests for the streaming results exporter"""
+
+    @pytest.mark.parametrize("length", [0, 1, 5])
+    def test_indented_output_matches_json_dump(self, temp_directory, length, make_blockchain):
+        """Test that the streamed file is byte for byte the json.dump(indent=2) one"""
+        blockchain = make_blockchain(length) if length else BlockChain([], Block(0, date_test, [], "0", "Genesis"))
+        path = os.path.join(temp_directory, "chain.json")
+        export_blockchain(blockchain, path)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == json.dumps(as_dict(blockchain), indent=2)
+
+    def test_compact_output(self, temp_directory, make_blockchain):
+        """Test that the compact mode has no whitespace and the same content"""
+        blockchain = make_blockchain(4)
+        path = os.path.join(temp_directory, "chain.json")
+        export_blockchain(blockchain, path, compact=True)
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        assert "\n" not in content and ": " not in content
+        assert json.loads(content) == as_dict(blockchain)
+
+    @pytest.mark.parametrize("compression, opener", [("gzip", gzip.open), ("lzma", lzma.open)])
+    def test_compressed_output(self, temp_directory, compression, opener, make_blockchain):
+        """Test that compressed files are readable by gzip/lzma and by open_results"""
+        blockchain = make_blockchain(3)
+        path = os.path.join(temp_directory, results_file_name("chain.json", compression))
+        export_blockchain(blockchain, path)
+        with opener(path, 'rt', encoding='utf-8') as f:
+            assert json.load(f) == as_dict(blockchain)
+        with open_results(path) as f:
+            assert json.load(f) == as_dict(blockchain)
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_failed_export_keeps_previous_file(self, temp_directory, compression, make_blockchain):
+        """Test that a failed export leaves the existing file whole and no temporary file"""
+        path = os.path.join(temp_directory, results_file_name("chain.json", compression))
+        export_blockchain(make_blockchain(2), path)
+        with open(path, 'rb') as f:
+            previous = f.read()
+
+        def failing_write(blockchain, f, compact=False):
+            f.write('{"genesis": ')
+            raise OSError("No space left on device")
+
+        with patch('exporter.write_blockchain', failing_write), pytest.raises(OSError):
+            export_blockchain(make_blockchain(3), path)
+
+        with open(path, 'rb') as f:
+            assert f.read() == previous
+        assert os.listdir(temp_directory) == [os.path.basename(path)]
+        export_blockchain(make_blockchain(3), path)
+        with open_results(path) as f:
+            assert json.load(f) == as_dict(make_blockchain(3))
+
+    def test_unknown_compression(self):
+        """Test that an unknown compression is rejected"""
+        with pytest.raises(ValueError):
+            results_file_name("chain.json", "zip")
+
+    def test_main_resumes_from_compressed_chain(self, temp_directory):
+        """Test that a compressed, compact snapshot is recorded in the checkpoint and reloaded"""
+        transactions_dir = os.path.join(temp_directory, "transactions")
+        os.makedirs(transactions_dir)
+        for name, sender in (("a.json", "Alice"), ("b.json", "Carol")):
+            with open(os.path.join(transactions_dir, name), 'w', encoding='utf-8') as f:
+                json.dump({"transactions": [{"sender": sender, "receiver": "Bob",
+                                             "token": {"name": "Bitcoin", "symbol": "BTC", "value": 1.0},
+                                             "amount": 1, "timestamp": date_test}]}, f)
+            with patch('builtins.print'), patch('datetime.datetime') as mock_datetime:
+                mock_datetime.now.return_value.strftime.return_value = "15-07-2025"
+                mock_datetime.now.return_value.isoformat.return_value = date_test
+                with patch('os.path.dirname', return_value=temp_directory):
+                    main.main(compact=True, compress="gzip")
+
+        with gzip.open(os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json.gz"), 'rt') as f:
+            blockchain_data = json.load(f)
+        assert [tx["sender"] for block in blockchain_data["blocks"] for tx in block["transactions"]] == ["Alice", "Carol"]
@@ -0,0 +1,184 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from network import ingest
+from network.ingest import IngestionServer
+
+
+async def send(address, lines):
+    """Send lines to the server and return the answers."""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    writer.write(b"".join(line.encode() + b"\n" for line in lines))
+    await writer.drain()
+    # blank lines are not answered
+    answers = [json.loads(await reader.readline()) for line in lines if line.strip()]
+    writer.close()
+    await writer.wait_closed()
+    return answers
+
+
+class TestIngestionServer:
+    """Tests for the asyncio transactions ingestion server, against localhost"""
+
+    def test_seals_on_transaction_count(self, make_blockchain, make_transaction_data):
+        """Test that max_txs transactions seal full blocks without waiting for the timer"""
+        async def scenario():
+            blockchain = make_blockchain(1)
+            server = IngestionServer(blockchain, max_txs=3, interval_ms=60_000)
+            await server.start()
+            answers = await send(server.address, [json.dumps(make_transaction_data(i)) for i in range(7)])
+            for _ in range(100):
+                if len(blockchain.blocks) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            pending = server.pending
+            await server.close()
+            return blockchain, answers, pending
+
+        blockchain, answers, pending = asyncio.run(scenario())
+        assert all("txid" in answer for answer in answers)
+        assert pending == 1
+        # the last transaction is sealed on close
+        assert [len(block.transactions) for block in blockchain.blocks] == [0, 3, 3, 1]
+        assert [tx.amount for block in blockchain.blocks for tx in block.transactions] == list(range(7))
+        assert blockchain.validate()
+
+    def test_seals_on_timer(self, make_blockchain, make_transaction_data):
+        """Test that a partial block is sealed after interval_ms"""
+        async def scenario():
+            blockchain = make_blockchain(1)
+            sealed = []
+            async with IngestionServer(blockchain, max_txs=100, interval_ms=20, on_block=sealed.append) as server:
+                await server.start()
+                await send(server.address, [json.dumps(make_transaction_data(1)), json.dumps(make_transaction_data(2))])
+                for _ in range(100):
+                    if sealed:
+                        break
+                    await asyncio.sleep(0.01)
+            return blockchain, sealed
+
+        blockchain, sealed = asyncio.run(scenario())
+        assert len(sealed) == 1
+        assert blockchain.get_last() is sealed[0]
+        assert len(sealed[0].transactions) == 2
+
+    def test_invalid_lines_are_answered_with_errors(self, make_blockchain, make_transaction_data):
+        """Test that bad lines get an error answer and do not stop the connection"""
+        async def scenario():
+            blockchain = make_blockchain(1)
+            async with IngestionServer(blockchain, interval_ms=60_000) as server:
+                await server.start()
+                answers = await send(server.address, ["not json", json.dumps({"sender": "Alice"}), "", json.dumps(make_transaction_data(1))])
+            return blockchain, answers
+
+        blockchain, answers = asyncio.run(scenario())
+        assert answers[0]["error"].startswith("JSONDecodeError")
+        assert answers[1]["error"].startswith("KeyError")
+        assert "txid" in answers[2]
+        assert len(blockchain.blocks) == 2
+
+    def test_txid_answer(self, make_blockchain, make_transaction_data):
+        """Test that the answer is the txid of the transaction"""
+        async def scenario():
+            async with IngestionServer(make_blockchain(1), interval_ms=60_000) as server:
+                await server.start()
+                return server.blockchain, await send(server.address, [json.dumps(make_transaction_data(5))])
+
+        blockchain, answers = asyncio.run(scenario())
+        assert blockchain.find_transaction(answers[0]["txid"]) == (1, 0)
+
+    @pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="no Unix sockets")
+    def test_unix_socket_and_executor(self, temp_directory, make_blockchain, make_transaction_data):
+        """Test serving on a Unix socket and hashing in a given executor"""
+        async def scenario():
+            blockchain = make_blockchain(1)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                async with IngestionServer(blockchain, max_txs=2, interval_ms=60_000, executor=executor) as server:
+                    await server.start(path=os.path.join(temp_directory, "ingest.sock"))
+                    await send(server.address, [json.dumps(make_transaction_data(i)) for i in range(4)])
+            return blockchain
+
+        blockchain = asyncio.run(scenario())
+        assert [len(block.transactions) for block in blockchain.blocks] == [0, 2, 2]
+
+    def test_unencodable_transaction_is_answered_with_error(self, make_blockchain, make_transaction_data):
+        """Test that a transaction whose txid cannot be computed is refused and the connection goes on"""
+        async def scenario():
+            blockchain = make_blockchain(1)
+            async with IngestionServer(blockchain, interval_ms=60_000) as server:
+                await server.start()
+                answers = await send(server.address, [json.dumps(make_transaction_data(1, sender="\ud800")), json.dumps(make_transaction_data(1))])
+                pending = server.pending
+            return blockchain, answers, pending
+
+        blockchain, answers, pending = asyncio.run(scenario())
+        # a lone surrogate is valid JSON but has no UTF-8 encoding
+        assert answers[0]["error"].startswith("UnicodeEncodeError")
+        assert "txid" in answers[1]
+        assert pending == 1
+        assert [tx.amount for tx in blockchain.get_last().transactions] == [1]
+
+    def test_failed_seal_keeps_the_batch(self, make_blockchain, make_transaction_data, monkeypatch):
+        """Test that the transactions of a block that could not be built go back to the buffer, in order"""
+        def fail(*args):
+            raise RuntimeError("executor is gone")
+
+        async def scenario():
+            blockchain = make_blockchain(1)
+            async with IngestionServer(blockchain, max_txs=2, interval_ms=60_000) as server:
+                await server.start()
+                monkeypatch.setattr(ingest, "build_block", fail)
+                await send(server.address, [json.dumps(make_transaction_data(i)) for i in range(3)])
+                with pytest.raises(RuntimeError):
+                    await server.seal()
+                pending = server.pending
+                monkeypatch.undo()
+            return blockchain, pending
+
+        blockchain, pending = asyncio.run(scenario())
+        assert pending == 3
+        assert [tx.amount for block in blockchain.blocks for tx in block.transactions] == [0, 1, 2]
+
+    def test_timer_survives_failed_seal(self, make_blockchain, make_transaction_data, monkeypatch):
+        """Test that a failed timed seal is logged and the next tick seals the batch"""
+        build_block = ingest.build_block
+        failures = [RuntimeError("executor is gone")]
+
+        def fail_once(*args):
+            if failures:
+                raise failures.pop()
+            return build_block(*args)
+
+        monkeypatch.setattr(ingest, "build_block", fail_once)
+
+        async def scenario():
+            blockchain = make_blockchain(1)
+            messages, sealed = [], []
+            async with IngestionServer(blockchain, interval_ms=20, on_block=sealed.append, log=messages.append) as server:
+                await server.start()
+                await send(server.address, [json.dumps(make_transaction_data(i)) for i in range(2)])
+                for _ in range(100):
+                    if sealed:
+                        break
+                    await asyncio.sleep(0.01)
+            return messages, sealed
+
+        messages, sealed = asyncio.run(scenario())
+        assert len(messages) == 1 and "RuntimeError: executor is gone" in messages[0]
+        assert len(sealed) == 1
+        assert [tx.amount for tx in sealed[0].transactions] == [0, 1]
+
+    def test_invalid_arguments(self, make_blockchain):
+        """Test the seal thresholds checks"""
+        with pytest.raises(ValueError, match="Max transactions must be a positive integer"):
+            IngestionServer(make_blockchain(1), max_txs=0)
+        with pytest.raises(ValueError, match="Interval must be a positive number of milliseconds"):
+            IngestionServer(make_blockchain(1), interval_ms=0)
@@ -0,0 +1,136 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from network.sync import SyncServer, sync_from, sync_with_peers
+from crypto.block_chain import BlockChain
+
+
+async def serve_and_sync(source, target, **options):
+    async with SyncServer(source) as server:
+        await server.start()
+        return await sync_from(target, *server.address, **options)
+
+
+class TestSync:
+    """Tests for the header-first block sync between two nodes, against localhost"""
+
+    @pytest.mark.parametrize("connections", [1, 4])
+    def test_nodes_converge(self, connections, make_blockchain):
+        """Test that a node catches up with a longer chain, in small batches over several connections"""
+        source = make_blockchain(24, txs_per_block=3)
+        target = make_blockchain(1)
+
+        appended = asyncio.run(serve_and_sync(source, target, header_batch=5, body_batch=4, connections=connections))
+
+        assert appended == 23
+        assert [block.hash for block in target.blocks] == [block.hash for block in source.blocks]
+        assert target.blocks[7].transactions == source.blocks[7].transactions
+        assert target.validate()
+        assert target.balance("Bob", "BTC") == source.balance("Bob", "BTC")
+
+    def test_sync_only_fetches_missing_blocks(self, make_blockchain, grow_blockchain):
+        """Test that a node partly in sync only appends the blocks it lacks, and nothing when it is ahead"""
+        source = make_blockchain(11, txs_per_block=3)
+        target = make_blockchain(1)
+        target.extend(source.blocks[1:6])
+
+        assert asyncio.run(serve_and_sync(source, target, body_batch=2)) == 5
+        assert [block.hash for block in target.blocks] == [block.hash for block in source.blocks]
+        assert asyncio.run(serve_and_sync(source, target)) == 0
+
+        grow_blockchain(target, 2, txs_per_block=3)
+        assert asyncio.run(serve_and_sync(source, target)) == 0
+        assert len(target.blocks) == 13
+
+    def test_refuses_diverging_chain(self, make_blockchain):
+        """Test that headers that do not link to our tip are refused and nothing is appended"""
+        source = make_blockchain(6, txs_per_block=3)
+        target = make_blockchain(3)
+
+        with pytest.raises(ValueError, match="does not link"):
+            asyncio.run(serve_and_sync(source, target))
+        assert len(target.blocks) == 3
+
+    def test_refuses_tampered_block(self, monkeypatch, make_blockchain):
+        """Test that a block whose content does not match its hash is refused, the valid prefix is kept"""
+        truncated = []
+        truncate = BlockChain.truncate
+        monkeypatch.setattr(BlockChain, "truncate", lambda self, length: truncated.append(length) or truncate(self, length))
+        source = make_blockchain(7, txs_per_block=3)
+        source.blocks[4].transactions[0].amount = 1000.0
+        target = make_blockchain(1)
+
+        with pytest.raises(ValueError, match="Peer block 4 is invalid"):
+            asyncio.run(serve_and_sync(source, target, body_batch=1, connections=1))
+        assert [block.hash for block in target.blocks] == [block.hash for block in source.blocks[:4]]
+        assert target.validate()
+        # rolled back by truncate, which undoes the indexes, the ledger and the watermark
+        assert truncated == [4]
+        assert target._verified == 4
+        with pytest.raises(KeyError):
+            target.find_transaction(source.blocks[4].transactions[1].txid)
+
+    def test_refuses_to_sync_invalid_local_chain(self, monkeypatch, make_blockchain):
+        """Test that an invalid local block is reported as ours and nothing is downloaded nor rolled back"""
+        truncated = []
+        monkeypatch.setattr(BlockChain, "truncate", lambda self, length: truncated.append(length))
+        source = make_blockchain(6, txs_per_block=3)
+        target = make_blockchain(3, txs_per_block=3)
+        target.blocks[1].transactions[0].amount = 1000.0
+
+        with pytest.raises(ValueError, match="Local block 1 is invalid"):
+            asyncio.run(serve_and_sync(source, target))
+        assert len(target.blocks) == 3
+        assert truncated == []
+
+    @pytest.mark.parametrize("request_line", [
+        b'{"op": "headers", "count": 5}\n',
+        b'{"op": "blocks", "start": "0", "count": 5}\n',
+        b'{"op": "headers", "start": 0, "count": null}\n',
+        b'{"op": "blocks", "start": -1, "count": 5}\n',
+        b'[1, 2]\n',
+        b'{"op": "tip"\n',
+        b'\xff\n',
+    ])
+    def test_malformed_request_gets_error(self, request_line, make_blockchain):
+        """Test that a request with missing or invalid fields is answered with an error and the connection stays usable"""
+        async def scenario():
+            async with SyncServer(make_blockchain(3, txs_per_block=3)) as server:
+                await server.start()
+                reader, writer = await asyncio.open_connection(*server.address)
+                writer.write(request_line)
+                await writer.drain()
+                error = json.loads(await reader.readline())
+                writer.write(b'{"op": "tip"}\n')
+                await writer.drain()
+                tip = json.loads(await reader.readline())
+                writer.close()
+                await writer.wait_closed()
+            return error, tip
+
+        error, tip = asyncio.run(scenario())
+        assert "error" in error
+        assert tip["height"] == 2
+
+    def test_sync_with_peers_picks_longest_chain(self, make_blockchain, grow_blockchain):
+        """Test that the longest reachable peer is synced from, an unreachable one is skipped"""
+        async def scenario():
+            short, long = make_blockchain(4, txs_per_block=3), make_blockchain(4, txs_per_block=3)
+            grow_blockchain(long, 4, txs_per_block=3)
+            target = make_blockchain(1)
+            async with SyncServer(short) as first, SyncServer(long) as second, SyncServer(make_blockchain(1)) as closed:
+                await first.start()
+                await second.start()
+                await closed.start()
+                unreachable = closed.address
+                await closed.close()
+                appended = await sync_with_peers(target, [first.address, unreachable, second.address])
+            return long, target, appended
+
+        long, target, appended = asyncio.run(scenario())
+        assert appended == 7
+        assert target.get_last().hash == long.get_last().hash
@@ -0,0 +1,185 @@
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import main
+from crypto.tokens import Token
+
+
+@pytest.fixture
+def small_buffer(monkeypatch):
+    """Read files 7 characters at a time so every value is split across reads"""
+    monkeypatch.setattr(main, "JSON_BUFFER_SIZE", 7)
+
+
+class TestTransactionLoader:
+    """Tests for the streaming transaction loaders of main.py"""
+
+    def write(self, directory, filename, content):
+        path = os.path.join(directory, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_iter_transactions_json(self, temp_directory, small_buffer, make_transaction_data):
+        """Test streaming a pretty-printed JSON file with other keys around the transactions"""
+        data = {"meta": {"tags": ["a", "b"], "count": 12345}, "transactions": [make_transaction_data(i, sender=f"Sender{i}", token=Token("Bitcoin", "BTC", 102954.87)) for i in range(5)], "after": 1}
+        path = self.write(temp_directory, "txs.json", json.dumps(data, indent=2))
+
+        transactions = list(main.iter_transactions(path))
+
+        assert [tx.amount for tx in transactions] == [0, 1, 2, 3, 4]
+        assert transactions[2].sender == "Sender2"
+        assert transactions[2].token.value == pytest.approx(102954.87)
+
+    def test_iter_transactions_json_lines(self, temp_directory, make_transaction_data):
+        """Test streaming a JSON Lines file, blank lines are skipped"""
+        content = "\n".join(json.dumps(make_transaction_data(i, receiver=f"Receiver{i}")) for i in range(3)) + "\n\n"
+        path = self.write(temp_directory, "txs.jsonl", content)
+
+        assert [tx.receiver for tx in main.iter_transactions(path)] == ["Receiver0", "Receiver1", "Receiver2"]
+
+    def test_iter_transactions_empty_array(self, temp_directory, small_buffer):
+        """Test a file without transactions"""
+        path = self.write(temp_directory, "txs.json", '{"transactions": [ ]}')
+        assert list(main.iter_transactions(path)) == []
+
+    def test_iter_transactions_missing_key(self, temp_directory, small_buffer):
+        """Test a file without a transactions key"""
+        path = self.write(temp_directory, "txs.json", '{"other": [1, 2]}')
+        with pytest.raises(KeyError):
+            list(main.iter_transactions(path))
+
+    def test_iter_transactions_invalid_json(self, temp_directory, small_buffer, make_transaction_data):
+        """Test a truncated file"""
+        path = self.write(temp_directory, "txs.json", '{"transactions": [' + json.dumps(make_transaction_data(0)) + ',')
+        with pytest.raises(ValueError):
+            list(main.iter_transactions(path))
+
+    def test_iter_transaction_chunks(self, temp_directory, make_transaction_data):
+        """Test that chunks never exceed the chunk size"""
+        path = self.write(temp_directory, "txs.json", json.dumps({"transactions": [make_transaction_data(i) for i in range(7)]}))
+
+        chunks = list(main.iter_transaction_chunks(path, 3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        with pytest.raises(ValueError, match="Chunk size must be a positive integer"):
+            list(main.iter_transaction_chunks(path, 0))
+
+    @patch('builtins.print')
+    def test_main_with_chunk_size(self, mock_print, temp_directory, make_transaction_data):
+        """Test that main() caps the number of transactions per block"""
+        transactions_dir = os.path.join(temp_directory, "transactions")
+        os.makedirs(transactions_dir)
+        self.write(transactions_dir, "transactions1.json", json.dumps({"transactions": [make_transaction_data(i) for i in range(5)]}))
+
+        with patch('datetime.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "15-07-2025"
+            mock_datetime.now.return_value.isoformat.return_value = "2025-07-15T12:00:00"
+            with patch('os.path.dirname', return_value=temp_directory):
+                main.main(chunk_size=2)
+
+        with open(os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json")) as f:
+            blockchain_data = json.load(f)
+        assert [len(block["transactions"]) for block in blockchain_data["blocks"]] == [0, 2, 2, 1]
+        assert [block["index"] for block in blockchain_data["blocks"]] == [0, 1, 2, 3]
+
+    def test_parse_args(self):
+        """Test the command line options"""
+        assert main.parse_args([]).chunk_size is None
+        assert main.parse_args(["--chunk-size", "100"]).chunk_size == 100
+        assert main.parse_args([]).workers == 1
+        assert main.parse_args(["--workers", "4"]).workers == 4
+
+    @pytest.mark.parametrize("option", ["--chunk-size", "--workers"])
+    @pytest.mark.parametrize("value", ["0", "-1", "two"])
+    def test_parse_args_rejects_non_positive(self, option, value):
+        """Test that the chunk size and the workers must be at least 1"""
+        with patch('sys.stderr'), pytest.raises(SystemExit):
+            main.parse_args([option, value])
+
+
+class TestParallelParsing:
+    """Tests for the parallel parsing pipeline of main.py"""
+
+    @pytest.fixture
+    def write_files(self, make_transaction_data):
+        def write(directory, count):
+            paths = []
+            for i in range(count):
+                path = os.path.join(directory, f"transactions{i:02d}.json")
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump({"transactions": [make_transaction_data(i * 10 + j) for j in range(i + 1)]}, f)
+                paths.append(path)
+            return paths
+        return write
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_parse_transaction_files_keeps_order(self, temp_directory, workers, write_files):
+        """Test that the files come out in the given order"""
+        paths = write_files(temp_directory, 7)
+
+        parsed = list(main.parse_transaction_files(paths, workers=workers))
+
+        assert [path for path, _ in parsed] == paths
+        amounts = [[tx.amount for chunk in chunks for tx in chunk] for _, chunks in parsed]
+        assert amounts[3] == [30, 31, 32, 33]
+
+    def test_parse_transaction_files_chunks(self, temp_directory, write_files):
+        """Test that the pool results are split by chunk size"""
+        paths = write_files(temp_directory, 3)
+
+        parsed = list(main.parse_transaction_files(paths, workers=2, chunk_size=2))
+
+        assert [[len(chunk) for chunk in chunks] for _, chunks in parsed] == [[1], [2], [2, 1]]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parse_transaction_files_rejects_negative_chunk_size(self, temp_directory, workers, write_files):
+        """Test that a negative chunk size fails with both paths instead of yielding no transactions"""
+        paths = write_files(temp_directory, 2)
+
+        with pytest.raises(ValueError, match="Chunk size must be a positive integer"):
+            for _, chunks in main.parse_transaction_files(paths, workers=workers, chunk_size=-1):
+                list(chunks)
+
+    def test_commit_transaction_files_chains_in_order(self, temp_directory, write_files):
+        """Test that the committer thread appends one linked block per file"""
+        paths = write_files(temp_directory, 5)
+        blockchain = main.create_blockchain([])
+
+        appended = main.commit_transaction_files(blockchain, main.parse_transaction_files(paths, workers=2), log=lambda message: None)
+
+        assert appended == 5
+        assert [len(block.transactions) for block in blockchain.blocks] == [0, 1, 2, 3, 4, 5]
+        assert blockchain.validate()
+
+    def test_commit_transaction_files_raises_parsing_errors(self, temp_directory, write_files):
+        """Test that an error in the committer thread is raised to the caller"""
+        paths = write_files(temp_directory, 2)
+        with open(paths[1], 'w', encoding='utf-8') as f:
+            f.write('{"transactions": [')
+        blockchain = main.create_blockchain([])
+
+        with pytest.raises(ValueError):
+            main.commit_transaction_files(blockchain, main.parse_transaction_files(paths), log=lambda message: None)
+        assert len(blockchain.blocks) == 2
+
+    @patch('builtins.print')
+    def test_main_with_workers(self, mock_print, temp_directory, write_files):
+        """Test that main() gives the same chain with several workers"""
+        transactions_dir = os.path.join(temp_directory, "transactions")
+        os.makedirs(transactions_dir)
+        write_files(transactions_dir, 4)
+
+        with patch('datetime.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "15-07-2025"
+            mock_datetime.now.return_value.isoformat.return_value = "2025-07-15T12:00:00"
+            with patch('os.path.dirname', return_value=temp_directory):
+                main.main(workers=2)
+
+        with open(os.path.join(temp_directory, "results", "15-07-2025", "blockchain-15-07-2025.json")) as f:
+            blockchain_data = json.load(f)
+        assert [len(block["transactions"]) for block in blockchain_data["blocks"]] == [0, 1, 2, 3, 4]
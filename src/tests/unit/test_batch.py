@@ -0,0 +1,103 @@
+import pytest
+from crypto import batch as batch_module
+from crypto.batch import TransactionBatch, NO_TIME, to_epoch, from_epoch
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+BTC = Token("Bitcoin", "BTC", 1.0)
+ETH = Token("Ethereum", "ETH", 2.0)
+
+
+@pytest.fixture(params=["numpy", "pure python"])
+def backend(request, monkeypatch):
+    """Run the aggregations with NumPy (when installed) and without."""
+    if request.param == "numpy":
+        if batch_module.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(batch_module, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def transactions():
+    return [
+        Transaction("Alice", "Bob", BTC, 1.5, "2025-07-15T12:00:00"),
+        Transaction("Alice", "Carol", ETH, 2, "2025-07-15T13:00:00"),
+        Transaction("Bob", "Alice", BTC, 0.5, "2025-07-16T12:00:00.250000"),
+        Transaction("Carol", "Bob", ETH, 4.0, "2025-07-17T12:00:00"),
+    ]
+
+
+class TestTransactionBatch:
+    """Test cases for the columnar TransactionBatch."""
+
+    def test_dictionary_encoding(self, transactions):
+        """Test that accounts and tokens are stored once and referenced by id."""
+        batch = TransactionBatch.from_transactions(transactions)
+        assert len(batch) == 4
+        assert batch.accounts == ["Alice", "Bob", "Carol"]
+        assert batch.tokens == [BTC, ETH]
+        assert list(batch.sender_ids) == [0, 0, 1, 2]
+        assert list(batch.token_ids) == [0, 1, 0, 1]
+
+    def test_round_trip(self, transactions):
+        """Test that converting back gives equal transactions, int amounts stay ints."""
+        restored = TransactionBatch.from_transactions(transactions).to_transactions()
+        assert restored == transactions
+        assert type(restored[1].amount) is int
+        assert type(restored[0].amount) is float
+
+    def test_round_trip_of_values_the_columns_cannot_hold(self):
+        """Test huge ints, aware, non-canonical and non-ISO timestamps."""
+        transactions = [
+            Transaction("Alice", "Bob", BTC, 2 ** 70 + 1, "2025-07-15T12:00:00+02:00"),
+            Transaction("Alice", "Bob", BTC, 10 ** 400, "2025-07-15 12:00:00"),
+            Transaction("Alice", "Bob", BTC, True, "yesterday"),
+        ]
+        batch = TransactionBatch.from_transactions(transactions)
+        assert batch.to_transactions() == transactions
+        assert batch.timestamps[0] == to_epoch("2025-07-15T10:00:00")
+        assert batch.timestamps[2] == NO_TIME
+
+    def test_epoch_conversion(self):
+        """Test that naive timestamps are read as UTC microseconds."""
+        assert to_epoch("1970-01-01T00:00:01.5") == 1_500_000
+        assert from_epoch(1_500_000) == "1970-01-01T00:00:01.500000"
+        assert to_epoch("not a date") is None
+
+    def test_append_wrong_type(self):
+        """Test that only transactions are accepted."""
+        with pytest.raises(TypeError, match="Transaction must be an instance of Transaction class"):
+            TransactionBatch().append("not a transaction")
+
+    def test_sum_by_token(self, transactions, backend):
+        """Test the total volume per token symbol."""
+        batch = TransactionBatch.from_transactions(transactions)
+        assert batch.sum_by_token() == {"BTC": pytest.approx(2.0), "ETH": pytest.approx(6.0)}
+
+    def test_sum_by_account(self, transactions, backend):
+        """Test the totals per sender and per receiver, optionally for one token."""
+        batch = TransactionBatch.from_transactions(transactions)
+        assert batch.sum_by_account() == {"Alice": pytest.approx(3.5), "Bob": pytest.approx(0.5), "Carol": pytest.approx(4.0)}
+        assert batch.sum_by_account("receiver", symbol="ETH") == {"Bob": pytest.approx(4.0), "Carol": pytest.approx(2.0)}
+        with pytest.raises(ValueError, match="Side must be 'sender' or 'receiver'"):
+            batch.sum_by_account("issuer")
+
+    def test_between(self, transactions, backend):
+        """Test the time range filter, both bounds included."""
+        batch = TransactionBatch.from_transactions(transactions + [Transaction("Alice", "Bob", BTC, 1.0, "someday")])
+        selected = batch.between("2025-07-15T13:00:00", "2025-07-16T12:00:00.250000")
+        assert selected.to_transactions() == transactions[1:3]
+        assert len(batch.between(start="2025-07-16T00:00:00")) == 2
+        assert len(batch.between()) == 4
+        with pytest.raises(ValueError, match="Time bounds must be ISO 8601 timestamps"):
+            batch.between("someday")
+
+    def test_empty_batch(self, backend):
+        """Test the aggregations of an empty batch."""
+        batch = TransactionBatch()
+        assert batch.sum_by_token() == {}
+        assert batch.sum_by_account() == {}
+        assert batch.to_transactions() == []
+        assert len(batch.between()) == 0
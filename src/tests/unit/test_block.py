@@ -3,6 +3,7 @@ import datetime
 from crypto.block import Block
 from crypto.transactions import Transaction
 from crypto.tokens import Token
+from crypto.encoding import INT_MAX, INT_MIN
 
 
 class TestBlock:
@@ -143,4 +144,56 @@ class TestBlock:
         with pytest.raises(TypeError, match="Block previous hash must be a string"):
             Block(1, "2025-07-15T12:00:00", [], 123, "abc123")
         
-        # Note: Hash validation is not done in the constructor, so we skip that test 
\ No newline at end of file
+        # Note: Hash validation is not done in the constructor, so we skip that test 
+
+    def test_block_integers_must_fit_the_encoding(self):
+        """Test that an index or a nonce the canonical encoding cannot hold is refused."""
+        assert Block(INT_MAX, "2025-07-15T12:00:00", [], "0", "", INT_MIN).hash
+        with pytest.raises(ValueError, match="Block index must fit in a signed 64 bits integer"):
+            Block(INT_MAX + 1, "2025-07-15T12:00:00", [], "0", "")
+        with pytest.raises(ValueError, match="Block nonce must fit in a signed 64 bits integer"):
+            Block(1, "2025-07-15T12:00:00", [], "0", "", 1 << 64)
+
+class TestBlockHashCache:
+    """Test cases for the lazy, cached block hash."""
+
+    def test_hash_computed_on_first_access(self):
+        """Test that the hash is only computed when read, then cached."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        assert not block.is_hash_current()
+        assert block.hash == block.compute_hash()
+        assert block.is_hash_current()
+
+    def test_setters_invalidate_hash(self):
+        """Test that changing a hashed field through its setter gives a fresh hash on next access."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        changes = [
+            ("index", 2), ("timestamp", "2025-07-16T12:00:00"), ("previous_hash", "abc"), ("nonce", 7),
+            ("difficulty", 1), ("transactions", [Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00")]),
+        ]
+        for name, value in changes:
+            old_hash = block.hash
+            setattr(block, name, value)
+            assert not block.is_hash_current(), name
+            assert block.hash != old_hash
+            assert block.hash == block.compute_hash()
+
+    def test_genesis_and_stored_hashes_are_kept(self):
+        """Test that a genesis keeps its given hash and a restored block its stored one."""
+        genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+        genesis.timestamp = "2025-07-16T12:00:00"
+        assert genesis.hash == "Genesis"
+        restored = Block.restore(1, "2025-07-15T12:00:00", [], "0", "stored")
+        assert restored.is_hash_current()
+        assert restored.hash == "stored"
+        restored.nonce = 1
+        assert restored.hash == restored.compute_hash()
+
+    def test_equality_ignores_pending_hash(self):
+        """Test that a block whose hash was not read yet equals a hashed one with the same content."""
+        block1 = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        block2 = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        block1.hash
+        assert block1 == block2
+        assert block1.hash in repr(block2)
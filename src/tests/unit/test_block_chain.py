@@ -1,7 +1,10 @@
 import pytest
 import datetime
+import json
+import os
 from crypto.block_chain import BlockChain
 from crypto.block import Block
+from crypto.merkle import MerkleTree
 from crypto.transactions import Transaction
 from crypto.tokens import Token
 
@@ -115,4 +118,481 @@ class TestBlockChain:
         new_block = Block(1, "2025-07-15T12:01:00", [], "WrongHash", "")
         
         with pytest.raises(ValueError, match="Block's previous hash does not match the last block's hash"):
-            blockchain.add_block(new_block) 
\ No newline at end of file
+            blockchain.add_block(new_block) 
+
+
+class TestBlockChainValidation:
+    """Test cases for BlockChain.validate."""
+
+    def test_validate_valid_chain(self, make_blockchain):
+        """Test validating a valid chain."""
+        blockchain = make_blockchain(5)
+        report = blockchain.validate()
+        assert report
+        assert report.checked == 5
+
+    def test_validate_only_checks_new_blocks(self, make_blockchain):
+        """Test that a second validation only checks the appended blocks."""
+        blockchain = make_blockchain(5)
+        assert blockchain.validate()
+        last = blockchain.get_last()
+        blockchain.blocks.append(Block(5, "2025-07-15T12:00:00", [], last.hash, ""))
+        report = blockchain.validate()
+        assert report
+        assert report.checked == 1
+        assert blockchain.validate().checked == 0
+
+    def test_validate_full_rechecks_everything(self, make_blockchain):
+        """Test the audit mode."""
+        blockchain = make_blockchain(5)
+        assert blockchain.validate()
+        assert blockchain.validate(full=True).checked == 5
+
+    def test_validate_detects_broken_link(self, make_blockchain):
+        """Test a block whose previous hash does not match."""
+        blockchain = make_blockchain(4)
+        blockchain.blocks[2].previous_hash = "WrongHash"
+        report = blockchain.validate()
+        assert not report
+        assert report.position == 2
+        assert "previous hash" in report.reason
+
+    def test_validate_detects_tampered_transaction(self, make_blockchain):
+        """Test a transaction modified in place after the block was hashed."""
+        blockchain = make_blockchain(4)
+        # the hash of the last block is computed on first access
+        blockchain.blocks[3].hash
+        blockchain.blocks[3].transactions[0].amount = 1000.0
+        report = blockchain.validate()
+        assert not report
+        assert report.position == 3
+        assert "Merkle root" in report.reason
+
+    def test_validate_detects_tampered_header(self, make_blockchain):
+        """Test a block whose header changed after it was hashed: its hash follows, the next link breaks."""
+        blockchain = make_blockchain(4)
+        blockchain.blocks[1].timestamp = "2030-01-01T00:00:00"
+        report = blockchain.validate()
+        assert not report
+        assert report.position == 2
+        assert "previous hash does not match" in report.reason
+
+    def test_validate_audit_catches_change_behind_watermark(self, make_blockchain):
+        """Test that only the full mode catches a change in an already verified block."""
+        blockchain = make_blockchain(4)
+        assert blockchain.validate()
+        blockchain.blocks[1].timestamp = "2030-01-01T00:00:00"
+        assert blockchain.validate()
+        assert not blockchain.validate(full=True)
+
+    def test_validate_restarts_when_verified_tip_is_replaced(self, make_blockchain):
+        """Test that replacing the verified tip drops the watermark."""
+        blockchain = make_blockchain(4)
+        assert blockchain.validate()
+        blockchain.blocks[-1] = Block(3, "2025-07-15T12:00:00", [], "WrongHash", "")
+        report = blockchain.validate()
+        assert not report
+        assert report.position == 3
+
+
+class TestBlockChainParallelVerification:
+    """Test cases for BlockChain.verify_parallel."""
+
+    def test_verify_parallel_valid_chain(self, make_blockchain):
+        """Test a valid chain checked by several processes."""
+        blockchain = make_blockchain(50)
+        report = blockchain.verify_parallel(workers=2)
+        assert report
+        assert report.checked == 50
+
+    def test_verify_parallel_reports_first_broken_link(self, make_blockchain):
+        """Test that the first broken block is reported whatever range it is in."""
+        blockchain = make_blockchain(50)
+        blockchain.blocks[40].previous_hash = "WrongHash"
+        blockchain.blocks[12].timestamp = "2030-01-01T00:00:00"
+        report = blockchain.verify_parallel(workers=2)
+        assert not report
+        assert report.position == 13
+        assert "previous hash does not match" in report.reason
+
+    def test_verify_parallel_single_worker(self, make_blockchain):
+        """Test that one worker gives the same result as the sequential validation."""
+        blockchain = make_blockchain(10)
+        blockchain.blocks[5].previous_hash = "WrongHash"
+        report = blockchain.verify_parallel(workers=1)
+        assert report.position == 5
+
+    def test_verify_parallel_wrong_workers(self, make_blockchain):
+        """Test a negative number of workers."""
+        blockchain = make_blockchain(3)
+        with pytest.raises(ValueError, match="Workers must be a positive integer"):
+            blockchain.verify_parallel(workers=-1)
+
+
+class TestBlockChainIndex:
+    """Test cases for the lookups by hash and by index."""
+
+    def test_get_by_hash(self, make_blockchain):
+        """Test getting every block by its hash."""
+        blockchain = make_blockchain(10)
+        for block in blockchain.blocks:
+            assert blockchain.get_by_hash(block.hash) is block
+
+    def test_get_by_hash_missing(self, make_blockchain):
+        """Test getting a block with an unknown hash."""
+        blockchain = make_blockchain(3)
+        with pytest.raises(KeyError, match="No block with hash"):
+            blockchain.get_by_hash("unknown")
+
+    def test_get_by_index(self, make_blockchain):
+        """Test getting every block by its index."""
+        blockchain = make_blockchain(10)
+        for block in blockchain.blocks:
+            assert blockchain.get_by_index(block.index) is block
+
+    def test_get_by_index_missing(self, make_blockchain):
+        """Test getting a block with an unknown index."""
+        blockchain = make_blockchain(3)
+        with pytest.raises(IndexError, match="No block with index 3"):
+            blockchain.get_by_index(3)
+
+    def test_index_follows_direct_appends(self, make_blockchain):
+        """Test that blocks appended to the list directly are indexed too."""
+        blockchain = make_blockchain(3)
+        blockchain.get_by_index(0)
+        block = Block(3, "2025-07-15T12:00:00", [], blockchain.get_last().hash, "")
+        blockchain.blocks.append(block)
+        assert blockchain.get_by_hash(block.hash) is block
+
+    def test_index_follows_reassignment_and_truncation(self, make_blockchain):
+        """Test that the index is rebuilt when the list is reassigned or truncated."""
+        blockchain = make_blockchain(5)
+        last = blockchain.get_last()
+        assert blockchain.get_by_hash(last.hash) is last
+        del blockchain.blocks[3:]
+        with pytest.raises(KeyError):
+            blockchain.get_by_hash(last.hash)
+        other = make_blockchain(2)
+        blockchain.blocks = other.blocks
+        assert blockchain.get_by_index(1) is other.blocks[1]
+
+    def test_index_follows_replaced_block(self, make_blockchain):
+        """Test a block replaced in place behind the index."""
+        blockchain = make_blockchain(3)
+        assert blockchain.get_by_index(2).index == 2
+        replacement = Block(7, "2025-07-15T12:00:00", [], "0", "")
+        blockchain.blocks[2] = replacement
+        with pytest.raises(IndexError):
+            blockchain.get_by_index(2)
+        assert blockchain.get_by_index(7) is replacement
+
+
+class TestBlockChainExtend:
+    """Test cases for BlockChain.extend."""
+
+    def test_extend_appends_linked_blocks(self, make_blockchain):
+        """Test extending a chain with linked blocks."""
+        blockchain = make_blockchain(1)
+        other = make_blockchain(4)
+        blockchain.extend(other.blocks[1:])
+        assert len(blockchain.blocks) == 4
+        assert blockchain.get_by_hash(other.blocks[3].hash) is other.blocks[3]
+        assert blockchain.validate()
+
+    def test_extend_wrong_type(self, make_blockchain):
+        """Test extending with something else than blocks."""
+        blockchain = make_blockchain(1)
+        with pytest.raises(TypeError, match="All items in blocks must be Block instances"):
+            blockchain.extend(["not a block"])
+
+    def test_extend_broken_link_appends_nothing(self, make_blockchain):
+        """Test that a broken link in the batch leaves the chain untouched."""
+        blockchain = make_blockchain(1)
+        other = make_blockchain(4)
+        other.blocks[3].previous_hash = "WrongHash"
+        with pytest.raises(ValueError, match="Block's previous hash does not match the last block's hash"):
+            blockchain.extend(other.blocks[1:])
+        assert len(blockchain.blocks) == 1
+
+    def test_extend_trusted_skips_checks(self, make_blockchain):
+        """Test that trusted blocks are appended as they are, validate() still catches them."""
+        blockchain = make_blockchain(1)
+        block = Block(1, "2025-07-15T12:00:00", [], "WrongHash", "")
+        blockchain.extend([block], trusted=True)
+        assert blockchain.get_last() is block
+        assert not blockchain.validate()
+
+
+class TestBlockChainAppend:
+    """Test cases for appending single blocks as they are built."""
+
+    def test_add_block_keeps_block(self, make_blockchain):
+        """Test that add_block appends the caller's block, with its timestamp and hash."""
+        blockchain = make_blockchain(2)
+        assert blockchain.validate()
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 1.0, "2025-07-15T12:00:00")
+        block = Block(2, "2025-07-15T12:05:00", [tx], blockchain.get_last().hash, "")
+        blockchain.add_block(block)
+        assert blockchain.get_last() is block
+        assert block.timestamp == "2025-07-15T12:05:00"
+        # the block was verified on append, validate() has nothing left to check
+        assert blockchain.validate().checked == 0
+
+    def test_add_block_hashes_once(self, monkeypatch, make_blockchain):
+        """Test that a block not hashed yet gets one Merkle tree and one header hash on append."""
+        blockchain = make_blockchain(2)
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 1.0, "2025-07-15T12:00:00")
+        block = blockchain.new_block([tx])
+        calls = []
+        compute_hash = Block.compute_hash
+        from_transactions = MerkleTree.from_transactions
+        monkeypatch.setattr(Block, "compute_hash", lambda self: calls.append("hash") or compute_hash(self))
+        monkeypatch.setattr(MerkleTree, "from_transactions", lambda transactions: calls.append("tree") or from_transactions(transactions))
+        blockchain.add_block(block)
+        assert sorted(calls) == ["hash", "tree"]
+
+    def test_add_block_checks_cached_hash(self, make_blockchain):
+        """Test that a hash already read is checked against the content."""
+        blockchain = make_blockchain(2)
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 1.0, "2025-07-15T12:00:00")
+        block = blockchain.new_block([tx])
+        block.hash
+        tx.amount = 5.0
+        with pytest.raises(ValueError, match="Merkle root does not match"):
+            blockchain.add_block(block)
+
+    def test_add_block_verifies_block(self, make_blockchain):
+        """Test that a block whose index, content or hash is wrong is refused."""
+        blockchain = make_blockchain(2)
+        last = blockchain.get_last()
+        with pytest.raises(ValueError, match="index does not follow"):
+            blockchain.add_block(Block(5, "2025-07-15T12:00:00", [], last.hash, ""))
+        tampered = Block(2, "2025-07-15T12:00:00", [], last.hash, "")
+        tampered.hash = "0" * 64
+        with pytest.raises(ValueError, match="Block 2 is invalid: hash does not match the block content"):
+            blockchain.add_block(tampered)
+        assert len(blockchain.blocks) == 2
+
+    def test_new_block(self, make_blockchain):
+        """Test that the builder follows the last block without appending."""
+        blockchain = make_blockchain(3)
+        block = blockchain.new_block([], "2025-07-15T13:00:00")
+        assert block.index == 3
+        assert block.previous_hash == blockchain.get_last().hash
+        assert block.timestamp == "2025-07-15T13:00:00"
+        assert block.hash == block.compute_hash()
+        assert len(blockchain.blocks) == 3
+
+    def test_append_transactions(self, make_blockchain):
+        """Test that the built block is appended, indexed and applied."""
+        blockchain = make_blockchain(2)
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 1.0, "2025-07-15T12:00:00")
+        block = blockchain.append_transactions([tx])
+        assert blockchain.get_last() is block
+        assert blockchain.find_transaction(tx.txid) == (2, 0)
+        assert blockchain.balance("Carol", "BTC") == pytest.approx(1.0)
+        assert blockchain.validate(full=True)
+
+    def test_genesis_creation(self):
+        """Test that an empty chain gets a genesis block."""
+        genesis_block = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+        blockchain = BlockChain([], genesis_block)
+        blockchain.genesis_creation()
+        assert blockchain.get_last().is_genesis()
+        assert blockchain.append_transactions([]).index == 1
+
+def chain_to_dict(blockchain):
+    """Results JSON of a blockchain, as written by main.py."""
+    def block_to_dict(block):
+        return {
+            'index': block.index,
+            'timestamp': block.timestamp,
+            'transactions': [{'sender': tx.sender, 'receiver': tx.receiver,
+                              'token': {'name': tx.token.name, 'symbol': tx.token.symbol, 'value': tx.token.value},
+                              'amount': tx.amount, 'timestamp': tx.timestamp} for tx in block.transactions],
+            'previous_hash': block.previous_hash,
+            'hash': block.hash,
+            'nonce': block.nonce,
+            'difficulty': block.difficulty
+        }
+    return {'genesis': block_to_dict(blockchain.genesis), 'blocks': [block_to_dict(b) for b in blockchain.blocks]}
+
+
+class TestBlockChainFromDict:
+    """Test cases for rebuilding a BlockChain from its results JSON."""
+
+    def test_from_dict_round_trip(self, make_blockchain):
+        """Test that the rebuilt chain equals the saved one and is already verified."""
+        blockchain = make_blockchain(5)
+        loaded = BlockChain.from_dict(chain_to_dict(blockchain))
+        assert loaded.blocks == blockchain.blocks
+        assert loaded.blocks[0] is loaded.genesis
+        assert loaded.validate().checked == 0
+
+    def test_from_dict_rejects_tampered_block(self, make_blockchain):
+        """Test that the verify mode catches a block whose content no longer matches its hash."""
+        data = chain_to_dict(make_blockchain(4))
+        data['blocks'][2]['transactions'][0]['amount'] = 1000.0
+        with pytest.raises(ValueError, match="Block 2 hash does not match its content"):
+            BlockChain.from_dict(data)
+
+    def test_from_dict_trusted_does_not_hash(self, monkeypatch, make_blockchain):
+        """Test that trust_stored_hashes keeps the stored hashes without computing any."""
+        data = chain_to_dict(make_blockchain(4))
+        data['blocks'][2]['transactions'][0]['amount'] = 1000.0
+        monkeypatch.setattr(Block, "compute_hash", lambda self: pytest.fail("hash computed"))
+        loaded = BlockChain.from_dict(data, trust_stored_hashes=True)
+        assert loaded.blocks[2].hash == data['blocks'][2]['hash']
+
+    def test_from_dict_trusted_still_checks_links(self, make_blockchain):
+        """Test that the links are checked even when the hashes are trusted."""
+        data = chain_to_dict(make_blockchain(4))
+        data['blocks'][2]['previous_hash'] = "WrongHash"
+        with pytest.raises(ValueError, match="Block's previous hash does not match the last block's hash"):
+            BlockChain.from_dict(data, trust_stored_hashes=True)
+
+    def test_from_file(self, temp_directory, make_blockchain):
+        """Test loading a results JSON file."""
+        blockchain = make_blockchain(3)
+        path = os.path.join(temp_directory, "chain.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(chain_to_dict(blockchain), f)
+        assert BlockChain.from_file(path).blocks == blockchain.blocks
+
+
+class TestBlockChainLedger:
+    """Test cases for the balances kept by the blockchain."""
+
+    def test_add_block_updates_balances(self, make_blockchain):
+        """Test that add_block applies the block to the ledger right away."""
+        blockchain = make_blockchain(3)
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(3.0)
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 2.0, "2025-07-15T12:00:00")
+        blockchain.add_block(Block(3, "2025-07-15T12:00:00", [tx], blockchain.get_last().hash, ""))
+        assert blockchain.ledger.applied == 4
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(1.0)
+        assert blockchain.balance("Carol", "BTC") == pytest.approx(2.0)
+
+    def test_extend_is_applied_lazily(self, make_blockchain):
+        """Test that extended blocks reach the ledger on the next balance query."""
+        blockchain = make_blockchain(1)
+        blockchain.extend(make_blockchain(5).blocks[1:])
+        assert blockchain._ledger.applied == 0
+        assert blockchain.balance("Alice", "BTC") == pytest.approx(-10.0)
+
+    def test_state_at(self, make_blockchain):
+        """Test the balances at past heights."""
+        blockchain = make_blockchain(5)
+        assert blockchain.state_at(0) == {}
+        assert blockchain.state_at(2) == {("Alice", "BTC"): pytest.approx(-3.0), ("Bob", "BTC"): pytest.approx(3.0)}
+
+    def test_truncated_chain_rewinds_ledger(self, make_blockchain):
+        """Test that blocks removed from the list are undone in the ledger."""
+        blockchain = make_blockchain(5)
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(10.0)
+        del blockchain.blocks[3:]
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(3.0)
+
+    def test_check_transactions(self, make_blockchain):
+        """Test that candidate transactions are checked against the chain's balances."""
+        blockchain = make_blockchain(3)
+        token = Token("Bitcoin", "BTC", 1.0)
+        ok = Transaction("Bob", "Carol", token, 3.0, "2025-07-15T12:00:00")
+        overspend = Transaction("Carol", "Alice", token, 5.0, "2025-07-15T12:00:00")
+        report = blockchain.check_transactions([ok, overspend])
+        assert report.accepted == [ok]
+        assert report.rejected[0][0] == 1
+
+
+class TestBlockChainTransactionIndex:
+    """Test cases for the txid lookups."""
+
+    def test_find_transaction(self, make_blockchain):
+        """Test finding the block index and position of a transaction."""
+        blockchain = make_blockchain(4)
+        tx = blockchain.blocks[2].transactions[0]
+        assert blockchain.find_transaction(tx.txid) == (2, 0)
+        with pytest.raises(KeyError, match="No transaction with txid"):
+            blockchain.find_transaction("0" * 64)
+
+    def test_added_block_txids_are_indexed_on_lookup(self, make_blockchain):
+        """Test that add_block and append_transactions leave the txid index to the first lookup."""
+        blockchain = make_blockchain(2)
+        blockchain.find_transaction(blockchain.blocks[1].transactions[0].txid)
+        token = Token("Bitcoin", "BTC", 1.0)
+        transactions = [Transaction("Bob", "Carol", token, float(i), "2025-07-15T12:00:00") for i in range(3)]
+        blockchain.add_block(Block(2, "2025-07-15T12:00:00", transactions, blockchain.get_last().hash, ""))
+        blockchain.append_transactions([Transaction("Carol", "Dave", token, 1.0, "2025-07-15T12:00:00")])
+        assert blockchain._txids_indexed == 2
+        assert blockchain.find_transaction(transactions[2].txid) == (2, 2)
+        assert blockchain._txids_indexed == 4
+
+    def test_extended_and_truncated_chain(self, make_blockchain):
+        """Test that extended blocks are found and removed ones are not."""
+        blockchain = make_blockchain(1)
+        other = make_blockchain(5)
+        blockchain.extend(other.blocks[1:])
+        txid = other.blocks[4].transactions[0].txid
+        assert blockchain.find_transaction(txid) == (4, 0)
+        del blockchain.blocks[3:]
+        with pytest.raises(KeyError):
+            blockchain.find_transaction(txid)
+
+    def test_replaced_block(self, make_blockchain):
+        """Test that a block replaced in place is indexed again."""
+        blockchain = make_blockchain(3)
+        old_txid = blockchain.blocks[2].transactions[0].txid
+        blockchain.find_transaction(old_txid)
+        tx = Transaction("Carol", "Dave", Token("Bitcoin", "BTC", 1.0), 1.0, "2025-07-15T12:00:00")
+        blockchain.blocks[2] = Block(2, "2025-07-15T12:00:00", [tx], blockchain.blocks[1].hash, "")
+        with pytest.raises(KeyError):
+            blockchain.find_transaction(old_txid)
+        assert blockchain.find_transaction(tx.txid) == (2, 0)
+
+
+class TestBlockChainTruncate:
+    """Test cases for dropping the last blocks with their derived state."""
+
+    def test_truncate_undoes_derived_state(self, make_blockchain):
+        """Test that the indexes, the ledger and the watermark go back to the kept blocks without a rebuild."""
+        blockchain = make_blockchain(6)
+        assert blockchain.validate()
+        dropped_txid = blockchain.blocks[4].transactions[0].txid
+        kept_txid = blockchain.blocks[2].transactions[0].txid
+        blockchain.find_transaction(kept_txid)
+        blockchain.get_by_index(5)
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(15.0)
+
+        dropped = blockchain.truncate(3)
+
+        assert [block.index for block in dropped] == [3, 4, 5]
+        assert len(blockchain.blocks) == 3
+        assert blockchain.ledger.applied == 3
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(3.0)
+        assert blockchain._indexed == 3 and blockchain._verified == 3
+        with pytest.raises(KeyError):
+            blockchain.find_transaction(dropped_txid)
+        with pytest.raises(IndexError):
+            blockchain.get_by_index(4)
+        assert blockchain.find_transaction(kept_txid) == (2, 0)
+        assert blockchain.validate().checked == 0
+
+    def test_truncate_then_extend(self, make_blockchain):
+        """Test that blocks appended after a truncation are indexed and applied."""
+        blockchain = make_blockchain(5)
+        blockchain.balance("Bob", "BTC")
+        tx = Transaction("Bob", "Carol", Token("Bitcoin", "BTC", 1.0), 2.0, "2025-07-15T12:00:00")
+        blockchain.truncate(2)
+        blockchain.extend([Block(2, "2025-07-15T12:00:00", [tx], blockchain.get_last().hash, "")])
+        assert blockchain.balance("Carol", "BTC") == pytest.approx(2.0)
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(-1.0)
+        assert blockchain.find_transaction(tx.txid) == (2, 0)
+        assert blockchain.validate()
+
+    def test_truncate_beyond_length(self, make_blockchain):
+        """Test that nothing is dropped when the chain is not longer than length, and that length is checked."""
+        blockchain = make_blockchain(3)
+        assert blockchain.truncate(3) == []
+        assert len(blockchain.blocks) == 3
+        with pytest.raises(ValueError, match="Length must be a non-negative integer"):
+            blockchain.truncate(-1)
@@ -0,0 +1,137 @@
+import pytest
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.block_tree import BlockTree
+from crypto.mining import mine
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+date_test = "2025-07-15T12:00:00"
+BTC = Token("Bitcoin", "BTC", 1.0)
+
+
+def child(parent, receiver="Bob", difficulty=0):
+    """A block on top of parent where Alice sends its index in BTC to receiver."""
+    tx = Transaction("Alice", receiver, BTC, float(parent.index + 1), date_test)
+    block = Block(parent.index + 1, date_test, [tx], parent.hash, "", 0, difficulty)
+    if difficulty:
+        mine(block)
+    return block
+
+
+def branch(parent, length, receiver):
+    blocks = []
+    for _ in range(length):
+        parent = child(parent, receiver)
+        blocks.append(parent)
+    return blocks
+
+
+class TestBlockTree:
+    """Test cases for the block tree and the reorganisations."""
+
+    def test_extends_active_chain(self, make_blockchain):
+        """Test that blocks on the tip extend the chain."""
+        blockchain = make_blockchain(1)
+        tree = BlockTree(blockchain)
+        blocks = branch(blockchain.genesis, 3, "Bob")
+        assert all(tree.add(block) for block in blocks)
+        assert blockchain.blocks[1:] == blocks
+        assert tree.tip is blocks[-1]
+        assert len(tree) == 4
+        assert tree.add(blocks[1]) is False
+
+    def test_keeps_side_branch(self, make_blockchain):
+        """Test that a shorter competing branch is kept without touching the chain."""
+        blockchain = make_blockchain(1)
+        tree = BlockTree(blockchain, prefer="length")
+        main = branch(blockchain.genesis, 3, "Bob")
+        side = branch(main[0], 2, "Carol")
+        for block in main + side:
+            tree.add(block)
+        assert blockchain.blocks[1:] == main
+        assert side[-1].hash in tree
+        assert tree.get(side[0].hash) is side[0]
+        # a tie keeps the first seen branch
+        assert tree.tips() == [main[-1], side[-1]]
+        assert blockchain.balance("Carol", "BTC") == 0
+
+    def test_reorganises_to_longer_branch(self, make_blockchain):
+        """Test that only the diverging suffix is switched, with the balances and indexes following."""
+        blockchain = make_blockchain(1)
+        reorgs = []
+        tree = BlockTree(blockchain, prefer="length", on_reorg=lambda *change: reorgs.append(change))
+        main = branch(blockchain.genesis, 4, "Bob")
+        for block in main:
+            tree.add(block)
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(10.0)
+        dropped_txid = main[3].transactions[0].txid
+        blockchain.find_transaction(dropped_txid)
+
+        side = branch(main[1], 3, "Carol")
+        assert [tree.add(block) for block in side] == [False, False, True]
+
+        assert blockchain.blocks == [blockchain.genesis] + main[:2] + side
+        assert reorgs == [(main[2:], side)]
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(3.0)
+        assert blockchain.balance("Carol", "BTC") == pytest.approx(12.0)
+        assert blockchain.get_by_index(5) is side[-1]
+        with pytest.raises(KeyError):
+            blockchain.find_transaction(dropped_txid)
+        assert blockchain.validate()
+
+        # and back when the first branch overtakes again
+        extra = branch(main[-1], 2, "Bob")
+        assert [tree.add(block) for block in extra] == [False, True]
+        assert blockchain.blocks[1:] == main + extra
+        assert reorgs[-1] == (side, main[2:] + extra)
+        assert blockchain.balance("Carol", "BTC") == 0
+        assert blockchain.balance("Bob", "BTC") == pytest.approx(21.0)
+
+    def test_prefers_cumulative_work(self, make_blockchain):
+        """Test that a shorter branch with more work wins over a longer one."""
+        blockchain = make_blockchain(1)
+        tree = BlockTree(blockchain)
+        light = branch(blockchain.genesis, 3, "Bob")
+        for block in light:
+            tree.add(block)
+        heavy = child(blockchain.genesis, "Carol", difficulty=4)
+        assert tree.add(heavy) is True
+        assert blockchain.blocks == [blockchain.genesis, heavy]
+        assert tree.work(heavy.hash) == 17
+        assert tree.work(light[-1].hash) == 4
+
+    def test_follows_blocks_appended_directly(self, make_blockchain):
+        """Test that blocks extended on the chain behind the tree are known to it."""
+        blockchain = make_blockchain(1)
+        tree = BlockTree(blockchain)
+        blocks = branch(blockchain.genesis, 2, "Bob")
+        blockchain.extend(blocks)
+        block = child(blocks[-1])
+        assert tree.add(block) is True
+        assert blockchain.get_last() is block
+
+    def test_rejects_invalid_blocks(self, make_blockchain):
+        """Test that orphans and blocks not matching their content are refused."""
+        blockchain = make_blockchain(1)
+        tree = BlockTree(blockchain)
+        orphan = child(child(blockchain.genesis))
+        with pytest.raises(ValueError, match="does not match any known block"):
+            tree.add(orphan)
+        tampered = child(blockchain.genesis)
+        tampered.hash
+        tampered.transactions[0].amount = 100.0
+        with pytest.raises(ValueError, match="Block 1 is invalid"):
+            tree.add(tampered)
+        with pytest.raises(TypeError):
+            tree.add("block")
+        assert len(tree) == 1
+
+    def test_invalid_arguments(self, make_blockchain):
+        """Test the constructor checks."""
+        with pytest.raises(TypeError):
+            BlockTree([])
+        with pytest.raises(ValueError, match="Preference must be one of"):
+            BlockTree(make_blockchain(1), prefer="age")
+        with pytest.raises(ValueError, match="Blockchain is empty"):
+            BlockTree(BlockChain([], Block(0, date_test, [], "0", "Genesis")))
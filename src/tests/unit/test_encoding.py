@@ -0,0 +1,92 @@
+import pytest
+import struct
+from crypto.block import Block
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+from crypto.store import BlockStore
+from crypto.encoding import (
+    ENCODING_VERSION,
+    encode_str,
+    encode_number,
+    decode_number,
+    encode_token,
+    encode_transaction,
+    encode_block_header,
+)
+
+
+class TestEncoding:
+    """Test cases for the canonical encoding."""
+
+    def test_encode_str_is_length_prefixed(self):
+        """Test that strings are prefixed by their UTF-8 length."""
+        assert encode_str("abc") == b"\x00\x00\x00\x03abc"
+        assert encode_str("é") == b"\x00\x00\x00\x02" + "é".encode("utf-8")
+
+    def test_encode_number_tags_int_and_float(self):
+        """Test that an int and a float with the same value encode differently."""
+        assert encode_number(5) != encode_number(5.0)
+        assert encode_number(5)[:1] == b"i"
+        assert encode_number(5.0)[:1] == b"f"
+
+    @pytest.mark.parametrize("value", [2 ** 63, -2 ** 63 - 1, 2 ** 64, -2 ** 70, 10 ** 400])
+    def test_encode_number_of_any_size(self, value):
+        """Test that integers outside of 64 bits are encoded and decoded back."""
+        data = encode_number(value)
+        assert data[:1] == b"I"
+        assert decode_number(data + b"tail", 0) == (value, len(data))
+
+    def test_encode_number_keeps_64_bits_encoding(self):
+        """Test that the integers of 64 bits are still written on 8 bytes."""
+        assert encode_number(2 ** 63 - 1) == b"i" + b"\x7f" + b"\xff" * 7
+        assert encode_number(-2 ** 63) == b"i" + b"\x80" + b"\x00" * 7
+        assert encode_number(-1) == b"i" + b"\xff" * 8
+
+    def test_huge_amount_hashes_and_stores(self, temp_directory):
+        """Test that a transaction with an amount outside of 64 bits can be hashed, stored and read back."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        genesis = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+        block = Block(1, "2025-07-15T12:00:00", [Transaction("Alice", "Bob", token, 10 ** 30, "2025-07-15T12:00:00")], genesis.hash, "")
+        assert block.transactions[0].txid and block.hash
+        with BlockStore(temp_directory) as store:
+            store.extend([genesis, block])
+            assert store[1] == block
+            assert store[1].transactions[0].amount == 10 ** 30
+            assert store[1].hash == block.compute_hash()
+
+    def test_encode_transaction_is_unambiguous(self):
+        """Test that moving characters between fields changes the encoding."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        tx1 = Transaction("ab", "c", token, 1.0, "2025-07-15T12:00:00")
+        tx2 = Transaction("a", "bc", token, 1.0, "2025-07-15T12:00:00")
+        assert encode_transaction(tx1) != encode_transaction(tx2)
+
+    @pytest.mark.parametrize("amount, encoded_amount", [(1.5, encode_number(1.5)), (7, encode_number(7)), (10 ** 30, encode_number(10 ** 30))])
+    def test_encode_transaction_layout(self, amount, encoded_amount):
+        """Test the fields of an encoded transaction, in order, after its total length."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        data = b"".join((encode_str("Chloé"), encode_str("Bob"), encode_str("Bitcoin"), encode_str("BTC"),
+                         struct.pack(">d", 1.0), encoded_amount, encode_str("2025-07-15T12:00:00")))
+        transaction = Transaction("Chloé", "Bob", token, amount, "2025-07-15T12:00:00")
+        assert encode_transaction(transaction) == struct.pack(">I", len(data)) + data
+
+    def test_token_encoding_follows_its_fields(self):
+        """Test that the cached token encoding is dropped when a field changes."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        encoded = encode_token(token)
+        assert encode_token(token) is encoded
+        token.value = 2.0
+        assert encode_token(token) == encode_token(Token("Bitcoin", "BTC", 2.0)) != encoded
+        token.symbol = "XBT"
+        assert encode_token(token) == encode_token(Token("Bitcoin", "XBT", 2.0))
+
+    def test_encode_block_header_starts_with_version(self):
+        """Test that the header starts with the encoding version."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        assert encode_block_header(block)[0] == ENCODING_VERSION
+
+    def test_block_hash_does_not_depend_on_repr(self, sample_transaction, monkeypatch):
+        """Test that the block hash does not use the transactions repr."""
+        block = Block(1, "2025-07-15T12:00:00", [sample_transaction], "0", "")
+        monkeypatch.setattr(Transaction, "__repr__", lambda self: "changed")
+        assert block.compute_hash() == block.hash
@@ -0,0 +1,144 @@
+import pytest
+from crypto.block import Block
+from crypto.ledger import Ledger, apply_transactions
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+date_test = "2025-07-15T12:00:00"
+BTC = Token("Bitcoin", "BTC", 1.0)
+ETH = Token("Ethereum", "ETH", 2.0)
+
+
+@pytest.fixture
+def build_blocks(make_blockchain, make_transaction):
+    """Genesis, then one block per i where Alice sends i BTC to Bob and Bob 1 ETH to Carol."""
+    def transactions(i):
+        return [make_transaction(i), make_transaction(1, sender="Bob", receiver="Carol", token=ETH)]
+    return lambda length: make_blockchain(length, transactions=transactions).blocks
+
+
+def replay(blocks):
+    balances = {}
+    for block in blocks:
+        apply_transactions(balances, block.transactions)
+    return balances
+
+
+class TestLedger:
+    """Test cases for the balances ledger."""
+
+    def test_apply(self, build_blocks):
+        """Test that blocks move amounts per (account, symbol)."""
+        ledger = Ledger()
+        for block in build_blocks(4):
+            ledger.apply(block)
+        assert ledger.applied == 4
+        assert ledger.balance("Alice", "BTC") == -6
+        assert ledger.balance("Bob", "BTC") == 6
+        assert ledger.balances("Bob") == {"BTC": 6, "ETH": -3}
+        assert ledger.balance("Carol", "BTC") == 0
+
+    def test_snapshots(self, build_blocks):
+        """Test that a snapshot is kept every snapshot_interval blocks."""
+        ledger = Ledger(snapshot_interval=3)
+        for block in build_blocks(10):
+            ledger.apply(block)
+        assert sorted(ledger._snapshots) == [3, 6, 9]
+
+    def test_state_at_matches_replay(self, build_blocks):
+        """Test that the state at every height equals a replay from genesis."""
+        blocks = build_blocks(12)
+        ledger = Ledger(snapshot_interval=4)
+        for block in blocks:
+            ledger.apply(block)
+        for height in range(len(blocks)):
+            assert ledger.state_at(height, blocks) == replay(blocks[:height + 1])
+        with pytest.raises(IndexError):
+            ledger.state_at(12, blocks)
+
+    def test_rewind(self, build_blocks):
+        """Test that a truncated chain rewinds the ledger to the nearest snapshot left."""
+        blocks = build_blocks(12)
+        ledger = Ledger(snapshot_interval=4)
+        for block in blocks:
+            ledger.apply(block)
+        del blocks[7:]
+        ledger.rewind(blocks)
+        assert ledger.applied == 4
+        assert ledger.tip_hash == blocks[3].hash
+        assert sorted(ledger._snapshots) == [4]
+        assert ledger.balances() == replay(blocks[:4])
+
+    def test_revert(self, build_blocks):
+        """Test that reverting the last blocks undoes them and drops their snapshots."""
+        blocks = build_blocks(10)
+        ledger = Ledger(snapshot_interval=4)
+        for block in blocks:
+            ledger.apply(block)
+        for position in range(9, 5, -1):
+            ledger.revert(blocks[position], blocks[position - 1])
+        assert ledger.applied == 6
+        assert ledger.tip_hash == blocks[5].hash
+        assert sorted(ledger._snapshots) == [4]
+        assert ledger.balances() == replay(blocks[:6])
+        with pytest.raises(ValueError, match="Block is not the last applied block"):
+            ledger.revert(blocks[9], blocks[8])
+
+    def test_invalid_snapshot_interval(self):
+        """Test that the snapshot interval must be positive."""
+        with pytest.raises(ValueError, match="Snapshot interval must be a positive integer"):
+            Ledger(snapshot_interval=0)
+
+
+class TestLedgerSpendCheck:
+    """Test cases for the overspend checks."""
+
+    @pytest.fixture
+    def ledger(self):
+        ledger = Ledger()
+        ledger.apply(Block(0, date_test, [Transaction("Mint", "Alice", BTC, 10, date_test)], "0", "Genesis"))
+        return ledger
+
+    def test_accepts_covered_spends(self, ledger):
+        """Test that spends within the balance are accepted and the balances untouched."""
+        report = ledger.check_transactions([Transaction("Alice", "Bob", BTC, 4, date_test),
+                                            Transaction("Alice", "Carol", BTC, 6, date_test)])
+        assert report
+        assert len(report.accepted) == 2
+        assert ledger.balance("Alice", "BTC") == 10
+
+    def test_pending_debits(self, ledger):
+        """Test that the debits accepted earlier in the batch are counted."""
+        first = Transaction("Alice", "Bob", BTC, 7, date_test)
+        second = Transaction("Alice", "Carol", BTC, 7, date_test)
+        report = ledger.check_transactions([first, second])
+        assert report.accepted == [first]
+        assert report.rejected == [(1, second, "insufficient BTC balance: Alice has 3, needs 7")]
+        assert not report
+
+    def test_pending_credits(self, ledger):
+        """Test that an amount received earlier in the batch can be spent."""
+        transactions = [Transaction("Alice", "Bob", BTC, 5, date_test), Transaction("Bob", "Carol", BTC, 5, date_test)]
+        assert ledger.check_transactions(transactions).accepted == transactions
+
+    def test_reports_every_rejection(self, ledger):
+        """Test that all the invalid transactions are reported, with their reasons."""
+        transactions = [
+            Transaction("Alice", "Bob", BTC, -1, date_test),
+            Transaction("Alice", "Bob", ETH, 1, date_test),
+            Transaction("Alice", "Bob", BTC, 1, date_test),
+            Transaction("Bob", "Alice", BTC, 0, date_test),
+        ]
+        report = ledger.check_transactions(transactions)
+        assert report.accepted == [transactions[2]]
+        assert [(position, reason) for position, _, reason in report.rejected] == [
+            (0, "amount must be positive, got -1"),
+            (1, "insufficient ETH balance: Alice has 0, needs 1"),
+            (3, "amount must be positive, got 0"),
+        ]
+
+    def test_issuers_may_go_negative(self, ledger):
+        """Test that issuers are not limited by their balance."""
+        tx = Transaction("Mint", "Bob", ETH, 100, date_test)
+        assert ledger.check_transactions([tx]).rejected
+        assert ledger.check_transactions([tx], issuers={"Mint"}).accepted == [tx]
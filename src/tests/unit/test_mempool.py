@@ -0,0 +1,164 @@
+import pytest
+import heapq
+from crypto import mempool as mempool_module
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.encoding import encode_transaction
+from crypto.mempool import MAX_SKIPPED, Mempool
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+
+BTC = Token("Bitcoin", "BTC", 1.0)
+
+
+@pytest.fixture
+def blockchain():
+    genesis = Block(0, "2025-07-15T12:00:00", [Transaction("Mint", "Alice", BTC, 10.0, "2025-07-15T12:00:00")], "0", "Genesis")
+    return BlockChain([genesis], genesis)
+
+
+class TestMempool:
+    """Test cases for the pending transactions pool."""
+
+    def test_fee_order(self, make_transaction):
+        """Test that the highest fees are drained first, ties in arrival order."""
+        mempool = Mempool()
+        for i, fee in enumerate([1, 5, 3, 5]):
+            mempool.add(make_transaction(i), fee=fee)
+        assert [tx.amount for tx in mempool.pop_transactions()] == [1.0, 3.0, 2.0, 0.0]
+        assert len(mempool) == 0 and mempool.bytes == 0
+
+    def test_timestamp_order(self, make_transaction):
+        """Test that the oldest transactions are drained first."""
+        mempool = Mempool(order="timestamp")
+        mempool.add(make_transaction(0, "2025-07-15T12:00:02"))
+        mempool.add(make_transaction(1, "2025-07-15T12:00:00"))
+        mempool.add(make_transaction(2, "2025-07-15T12:00:01"))
+        assert [tx.amount for tx in mempool.pop_transactions()] == [1.0, 2.0, 0.0]
+
+    def test_deduplication(self, make_transaction):
+        """Test that a transaction already pending is refused."""
+        mempool = Mempool()
+        assert mempool.add(make_transaction(1))
+        assert not mempool.add(make_transaction(1), fee=10)
+        assert make_transaction(1) in mempool
+        assert len(mempool) == 1
+
+    def test_eviction(self, make_transaction):
+        """Test that a full pool evicts its lowest fee transactions for better ones only."""
+        size = len(encode_transaction(make_transaction(0)))
+        mempool = Mempool(max_pool_bytes=3 * size)
+        for i, fee in enumerate([2, 1, 3]):
+            assert mempool.add(make_transaction(i), fee=fee)
+        assert mempool.add(make_transaction(3), fee=5)
+        assert make_transaction(1) not in mempool
+        assert not mempool.add(make_transaction(4), fee=0)
+        assert mempool.bytes == 3 * size
+        assert [tx.amount for tx in mempool.pop_transactions()] == [3.0, 2.0, 0.0]
+
+    def test_eviction_is_all_or_nothing(self, make_transaction):
+        """Test that nothing is evicted when the lower priority transactions cannot free enough room."""
+        size = len(encode_transaction(make_transaction(0)))
+        mempool = Mempool(max_pool_bytes=3 * size)
+        for i, fee in enumerate([1, 5, 10]):
+            assert mempool.add(make_transaction(i), fee=fee)
+        bigger = make_transaction(3, sender="A" * 20)
+        assert size < len(encode_transaction(bigger)) <= 2 * size
+        assert not mempool.add(bigger, fee=3)
+        assert make_transaction(0) in mempool
+        assert mempool.bytes == 3 * size
+        # the evictions can still happen for a transaction outranking both
+        assert mempool.add(bigger, fee=6)
+        assert [tx.amount for tx in mempool.pop_transactions()] == [2, 3]
+
+    def test_pop_limits(self, make_transaction):
+        """Test the transactions and bytes limits, a transaction too big is kept for later."""
+        mempool = Mempool()
+        small = [make_transaction(i) for i in range(3)]
+        big = make_transaction(9, sender="A" * 100)
+        mempool.add(big, fee=10)
+        for tx in small:
+            mempool.add(tx, fee=1)
+        budget = 2 * len(encode_transaction(small[0]))
+        assert mempool.pop_transactions(max_bytes=budget) == small[:2]
+        assert mempool.pop_transactions(max_txs=1) == [big]
+        assert mempool.pop_transactions() == small[2:]
+
+    def test_full_block_does_not_scan_pool(self, monkeypatch, make_transaction):
+        """Test that a byte limit reached stops the search instead of skipping through the whole pool."""
+        mempool = Mempool()
+        for i in range(1000):
+            mempool.add(make_transaction(i), fee=i)
+        size = len(encode_transaction(make_transaction(0)))
+        popped = []
+        heappop = heapq.heappop
+        monkeypatch.setattr(mempool_module.heapq, "heappop", lambda heap: popped.append(heap) or heappop(heap))
+        assert len(mempool.pop_transactions(max_bytes=int(10.5 * size))) == 10
+        assert len(popped) == 10
+
+    def test_skips_in_row_are_capped(self, monkeypatch, make_transaction):
+        """Test that the search gives up after MAX_SKIPPED transactions in a row too big for the bytes left."""
+        mempool = Mempool()
+        small = make_transaction(0)
+        mempool.add(small, fee=0)
+        for i in range(1, 1000):
+            mempool.add(make_transaction(i, sender="A" * 100), fee=i)
+        popped = []
+        heappop = heapq.heappop
+        monkeypatch.setattr(mempool_module.heapq, "heappop", lambda heap: popped.append(heap) or heappop(heap))
+        assert mempool.pop_transactions(max_bytes=len(encode_transaction(small))) == []
+        assert len(popped) == MAX_SKIPPED
+        assert len(mempool) == 1000
+
+    def test_remove(self, make_transaction):
+        """Test dropping transactions included in a block received from elsewhere."""
+        mempool = Mempool()
+        for i in range(3):
+            mempool.add(make_transaction(i))
+        mempool.remove([make_transaction(1), make_transaction(7)])
+        assert mempool.pop_transactions() == [make_transaction(0), make_transaction(2)]
+
+    def test_build_block(self, blockchain, make_transaction):
+        """Test that a block is built on the last block of the chain."""
+        mempool = Mempool(blockchain)
+        for i in range(5):
+            mempool.add(make_transaction(i), fee=i)
+        block = mempool.build_block(max_txs=3)
+        assert block.index == 1
+        assert block.previous_hash == blockchain.get_last().hash
+        assert [tx.amount for tx in block.transactions] == [4.0, 3.0, 2.0]
+        blockchain.extend([block])
+        assert blockchain.validate()
+        assert len(mempool) == 2
+
+    def test_build_block_drops_overspends(self, blockchain, make_transaction):
+        """Test that with issuers set the overspending transactions are left out."""
+        rejected = []
+        mempool = Mempool(blockchain, issuers={"Mint"}, on_reject=lambda transaction, reason: rejected.append((transaction, reason)))
+        mempool.add(make_transaction(6), fee=2)
+        mempool.add(make_transaction(5), fee=1)
+        block = mempool.build_block()
+        assert block.transactions == [make_transaction(6)]
+        assert len(mempool) == 0
+        assert [transaction for transaction, _ in rejected] == [make_transaction(5)]
+        assert "Alice" in rejected[0][1]
+
+    def test_build_block_unbound(self):
+        """Test that a block needs a chain."""
+        with pytest.raises(ValueError, match="Mempool is not bound to a blockchain"):
+            Mempool().build_block()
+
+    def test_invalid_arguments(self):
+        """Test the argument checks."""
+        with pytest.raises(ValueError):
+            Mempool(order="size")
+        with pytest.raises(TypeError, match="Transaction must be an instance of Transaction class"):
+            Mempool().add("not a transaction")
+
+    def test_refuses_transactions_in_chain(self, blockchain, make_transaction):
+        """Test that a transaction already in the bound chain is not pending again."""
+        mempool = Mempool(blockchain)
+        mempool.add(make_transaction(1))
+        blockchain.extend([mempool.build_block()])
+        assert not mempool.add(make_transaction(1))
+        assert mempool.add(make_transaction(2))
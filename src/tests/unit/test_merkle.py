@@ -0,0 +1,57 @@
+import pytest
+from crypto.block import Block
+from crypto.merkle import MerkleTree, EMPTY_ROOT, verify_proof
+
+
+class TestMerkle:
+    """Test cases for the Merkle tree."""
+
+    def test_empty_tree_root(self):
+        """Test the root of a block without transactions."""
+        assert MerkleTree.from_transactions([]).root == EMPTY_ROOT
+        assert Block(1, "2025-07-15T12:00:00", [], "0", "").merkle_root == EMPTY_ROOT
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13])
+    def test_every_proof_verifies(self, count, make_transaction):
+        """Test that every transaction can be proven against the root."""
+        transactions = [make_transaction(i) for i in range(count)]
+        block = Block(1, "2025-07-15T12:00:00", transactions, "0", "")
+        for i, tx in enumerate(transactions):
+            assert verify_proof(tx, block.merkle_proof(i), block.merkle_root)
+
+    def test_proof_is_logarithmic(self, make_transaction):
+        """Test that the proof length grows with log2 of the number of transactions."""
+        block = Block(1, "2025-07-15T12:00:00", [make_transaction(i) for i in range(1024)], "0", "")
+        assert len(block.merkle_proof(0)) == 10
+
+    def test_proof_rejects_other_transaction(self, make_transaction):
+        """Test that a proof does not verify another transaction."""
+        transactions = [make_transaction(i) for i in range(4)]
+        block = Block(1, "2025-07-15T12:00:00", transactions, "0", "")
+        assert not verify_proof(transactions[1], block.merkle_proof(0), block.merkle_root)
+
+    def test_proof_index_out_of_range(self, make_transaction):
+        """Test asking a proof for a missing transaction."""
+        block = Block(1, "2025-07-15T12:00:00", [make_transaction(i) for i in range(2)], "0", "")
+        with pytest.raises(IndexError, match="Transaction index out of range"):
+            block.merkle_proof(2)
+
+    def test_odd_leaf_is_not_duplicated(self, make_transaction):
+        """Test that [a, b, c] and [a, b, c, c] have different roots."""
+        transactions = [make_transaction(i) for i in range(3)]
+        assert MerkleTree.from_transactions(transactions).root != MerkleTree.from_transactions(transactions + transactions[-1:]).root
+
+    def test_assigning_transactions_resets_root(self, make_transaction):
+        """Test that the cached root follows the transactions setter."""
+        block = Block(1, "2025-07-15T12:00:00", [make_transaction(i) for i in range(2)], "0", "")
+        old_root = block.merkle_root
+        block.transactions = [make_transaction(i) for i in range(3)]
+        assert block.merkle_root != old_root
+        assert block.merkle_root == block.compute_merkle_root()
+
+    def test_block_hash_covers_merkle_root(self, make_transaction):
+        """Test that blocks with different transactions have different hashes."""
+        transactions = [make_transaction(i) for i in range(3)]
+        block1 = Block(1, "2025-07-15T12:00:00", transactions[:2], "0", "")
+        block2 = Block(1, "2025-07-15T12:00:00", transactions, "0", "")
+        assert block1.hash != block2.hash
@@ -0,0 +1,68 @@
+import pytest
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.mining import mine, target_bytes
+
+
+class TestMining:
+    """Test cases for the proof of work."""
+
+    def test_block_default_nonce_and_difficulty(self):
+        """Test that blocks are not mined by default."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "")
+        assert block.nonce == 0
+        assert block.difficulty == 0
+        assert block.meets_difficulty()
+
+    def test_block_difficulty_validation(self):
+        """Test the nonce and difficulty setters."""
+        with pytest.raises(TypeError, match="Block nonce must be an integer"):
+            Block(1, "2025-07-15T12:00:00", [], "0", "", "1")
+        with pytest.raises(ValueError, match="Block difficulty must be between 0 and 256"):
+            Block(1, "2025-07-15T12:00:00", [], "0", "", 0, 257)
+
+    def test_nonce_changes_hash(self):
+        """Test that the nonce is covered by the hash."""
+        block1 = Block(1, "2025-07-15T12:00:00", [], "0", "", 1)
+        block2 = Block(1, "2025-07-15T12:00:00", [], "0", "", 2)
+        assert block1.hash != block2.hash
+
+    def test_target_bytes(self):
+        """Test the target of a few difficulties."""
+        assert target_bytes(8) == b"\x01" + b"\x00" * 31
+        assert target_bytes(256) == b"\x00" * 31 + b"\x01"
+
+    def test_mine_single_worker(self):
+        """Test mining in the current process."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "", 0, 8)
+        result = mine(block)
+        assert result.nonce == block.nonce
+        assert result.hash == block.hash == block.compute_hash()
+        assert block.hash.startswith("00")
+        assert block.meets_difficulty()
+        assert result.attempts == result.nonce + 1
+
+    def test_mine_several_workers(self):
+        """Test mining with a process pool."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "", 0, 10)
+        result = mine(block, workers=2, chunk_size=256)
+        assert result.nonce is not None
+        assert block.hash == block.compute_hash()
+        assert block.meets_difficulty()
+
+    def test_mine_without_solution(self):
+        """Test a range without any valid nonce."""
+        block = Block(1, "2025-07-15T12:00:00", [], "0", "", 0, 256)
+        old_hash = block.hash
+        result = mine(block, max_nonce=100)
+        assert result.nonce is None
+        assert result.attempts == 100
+        assert block.hash == old_hash
+
+    def test_validate_checks_difficulty(self):
+        """Test that validation rejects an unmined block with a difficulty."""
+        genesis_block = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+        block = Block(1, "2025-07-15T12:00:00", [], "Genesis", "", 0, 256)
+        report = BlockChain([genesis_block, block], genesis_block).validate()
+        assert not report
+        assert "difficulty" in report.reason
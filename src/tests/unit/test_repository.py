@@ -0,0 +1,88 @@
+import pytest
+import os
+from crypto.block import Block
+from crypto.block_chain import BlockChain
+from crypto.transactions import Transaction
+from crypto.tokens import Token
+from crypto.repository import SQLiteRepository
+
+
+@pytest.fixture
+def blockchain():
+    btc = Token("Bitcoin", "BTC", 1.0)
+    eth = Token("Ethereum", "ETH", 2.0)
+    genesis_block = Block(0, "2025-07-15T12:00:00", [], "0", "Genesis")
+    block1 = Block(1, "2025-07-15T12:10:00", [
+        Transaction("Alice", "Bob", btc, 10, "2025-07-15T12:01:00"),
+        Transaction("Bob", "Chloe", eth, 2.5, "2025-07-15T12:02:00"),
+    ], genesis_block.hash, "")
+    block2 = Block(2, "2025-07-16T12:10:00", [
+        Transaction("Alice", "Chloe", btc, 3.0, "2025-07-16T12:01:00"),
+    ], block1.hash, "")
+    return BlockChain([genesis_block, block1, block2], genesis_block)
+
+
+@pytest.fixture
+def repository(temp_directory):
+    with SQLiteRepository(os.path.join(temp_directory, "chain.db")) as repository:
+        yield repository
+
+
+class TestSQLiteRepository:
+    """Test cases for the SQLite repository."""
+
+    def test_save_blockchain(self, repository, blockchain):
+        """Test saving a whole chain, saving it again only adds the new blocks."""
+        repository.save_blockchain(blockchain)
+        assert len(repository) == 3
+        repository.save_blockchain(blockchain)
+        assert len(repository) == 3
+
+    def test_wal_mode(self, repository):
+        """Test that the database uses the write-ahead log."""
+        assert repository._connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_transactions_by_sender(self, repository, blockchain):
+        """Test querying the transactions of a sender."""
+        repository.save_blockchain(blockchain)
+        transactions = repository.transactions_by_sender("Alice")
+        assert transactions == [blockchain.blocks[1].transactions[0], blockchain.blocks[2].transactions[0]]
+        assert isinstance(transactions[0].amount, int)
+        assert isinstance(transactions[1].amount, float)
+
+    def test_transactions_by_token_between_dates(self, repository, blockchain):
+        """Test querying the transfers of a token between two dates."""
+        repository.save_blockchain(blockchain)
+        assert len(repository.transactions_by_token("BTC")) == 2
+        transactions = repository.transactions_by_token("BTC", start="2025-07-16T00:00:00", end="2025-07-16T23:59:59")
+        assert [tx.receiver for tx in transactions] == ["Chloe"]
+
+    def test_find_transactions_combined_filters(self, repository, blockchain):
+        """Test combining filters."""
+        repository.save_blockchain(blockchain)
+        assert [tx.sender for tx in repository.find_transactions(receiver="Chloe")] == ["Bob", "Alice"]
+        assert [tx.sender for tx in repository.find_transactions(receiver="Chloe", symbol="ETH")] == ["Bob"]
+        assert len(repository.find_transactions()) == 3
+
+    def test_get_block(self, repository, blockchain):
+        """Test reading a block back by hash."""
+        repository.save_blockchain(blockchain)
+        block = repository.get_block(blockchain.blocks[1].hash)
+        assert block == blockchain.blocks[1]
+        with pytest.raises(KeyError, match="No block with hash"):
+            repository.get_block("unknown")
+
+    def test_save_blocks_checks_link(self, repository, blockchain):
+        """Test that saved blocks must follow the last saved block."""
+        repository.save_blocks(blockchain.blocks[:1])
+        with pytest.raises(ValueError, match="Block's previous hash does not match the last block's hash"):
+            repository.save_blocks(blockchain.blocks[2:])
+        assert len(repository) == 1
+
+    def test_reopen(self, temp_directory, blockchain):
+        """Test that the data is still there after reopening the database."""
+        path = os.path.join(temp_directory, "chain.db")
+        with SQLiteRepository(path) as repository:
+            repository.save_blockchain(blockchain)
+        with SQLiteRepository(path) as repository:
+            assert len(repository.find_transactions(symbol="BTC")) == 2
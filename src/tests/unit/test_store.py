@@ -0,0 +1,92 @@
+import pytest
+import os
+from crypto.store import BlockStore, SEGMENT_FILE, INDEX_FILE
+
+
+@pytest.fixture
+def make_blocks(make_blockchain, make_transaction):
+    """Blocks with an int and a float amount and a non-ASCII account in each"""
+    def transactions(i):
+        return [make_transaction(i), make_transaction(i / 2, "2025-07-15T12:05:00", "Bob", "Chloé")]
+    return lambda count: make_blockchain(count, transactions=transactions).blocks
+
+
+class TestBlockStore:
+    """Test cases for the append-only block store."""
+
+    def test_append_and_read_back(self, temp_directory, make_blocks):
+        """Test that stored blocks are read back identical."""
+        blocks = make_blocks(5)
+        with BlockStore(temp_directory) as store:
+            store.extend(blocks)
+            assert len(store) == 5
+            for i, block in enumerate(blocks):
+                assert store[i] == block
+                assert store[i].hash == block.hash
+            assert store[-1] == blocks[-1]
+            assert isinstance(store[2].transactions[0].amount, int)
+            assert isinstance(store[2].transactions[1].amount, float)
+
+    def test_reopen(self, temp_directory, make_blocks):
+        """Test that a store is read back after being closed."""
+        blocks = make_blocks(4)
+        with BlockStore(temp_directory) as store:
+            store.extend(blocks)
+        with BlockStore(temp_directory) as store:
+            assert len(store) == 4
+            assert store.get_last() == blocks[-1]
+            assert list(store) == blocks
+
+    def test_read_while_appending(self, temp_directory, make_blocks):
+        """Test reading blocks appended after the files were mapped."""
+        blocks = make_blocks(3)
+        with BlockStore(temp_directory) as store:
+            store.append(blocks[0])
+            assert store[0] == blocks[0]
+            store.append(blocks[1])
+            store.append(blocks[2])
+            assert store[2] == blocks[2]
+
+    def test_append_checks_link(self, temp_directory, make_blocks):
+        """Test that a block must link to the last stored block."""
+        blocks = make_blocks(3)
+        with BlockStore(temp_directory) as store:
+            store.append(blocks[0])
+            with pytest.raises(ValueError, match="Block's previous hash does not match the last block's hash"):
+                store.append(blocks[2])
+            with pytest.raises(TypeError, match="Block must be an instance of Block class"):
+                store.append("not a block")
+
+    def test_index_out_of_range(self, temp_directory):
+        """Test reading a missing block."""
+        with BlockStore(temp_directory) as store:
+            with pytest.raises(IndexError, match="Block store index out of range"):
+                store[0]
+            with pytest.raises(ValueError, match="Block store is empty"):
+                store.get_last()
+
+    def test_recover_partial_record(self, temp_directory, make_blocks):
+        """Test that a record written without its index entry is dropped on open."""
+        blocks = make_blocks(3)
+        with BlockStore(temp_directory) as store:
+            store.extend(blocks[:2])
+        segment_size = os.path.getsize(os.path.join(temp_directory, SEGMENT_FILE))
+        with open(os.path.join(temp_directory, SEGMENT_FILE), "ab") as f:
+            f.write(b"\x00\x00\x01\x00garbage")
+        with open(os.path.join(temp_directory, INDEX_FILE), "ab") as f:
+            f.write(b"\x00\x00")
+        with BlockStore(temp_directory) as store:
+            assert len(store) == 2
+            assert os.path.getsize(os.path.join(temp_directory, SEGMENT_FILE)) == segment_size
+            store.append(blocks[2])
+            assert store[2] == blocks[2]
+
+    def test_load_blockchain(self, temp_directory, make_blocks):
+        """Test loading the whole store into a valid BlockChain."""
+        blocks = make_blocks(4)
+        with BlockStore(temp_directory) as store:
+            store.extend(blocks)
+            blockchain = store.load_blockchain()
+        assert blockchain.blocks == blocks
+        assert blockchain.genesis.hash == "Genesis"
+        assert blockchain.validate()
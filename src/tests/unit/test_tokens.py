@@ -1,5 +1,7 @@
 import pytest
+from crypto import tokens
 from crypto.tokens import Token
+from crypto.transactions import Transaction
 
 
 class TestToken:
@@ -63,4 +65,63 @@ class TestToken:
     def test_token_with_negative_value(self):
         """Test creating a token with negative value."""
         token = Token("Test", "TST", -5.0)
-        assert token.value == pytest.approx(-5.0) 
\ No newline at end of file
+        assert token.value == pytest.approx(-5.0) 
+    
+    def test_token_has_no_dict(self):
+        """Test that tokens are slotted."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        assert not hasattr(token, "__dict__")
+        with pytest.raises(AttributeError):
+            token.extra = 1
+
+    def test_token_intern(self):
+        """Test that interned tokens with the same fields are shared."""
+        token1 = Token.intern("Bitcoin", "BTC", 1.0)
+        token2 = Token.intern("Bitcoin", "BTC", 1)
+        token3 = Token.intern("Ethereum", "ETH", 1.0)
+        assert token1 is token2
+        assert token1 is not token3
+        assert token1 == Token("Bitcoin", "BTC", 1.0)
+        assert isinstance(token2.value, float)
+
+    def test_token_intern_is_bounded(self, monkeypatch):
+        """Test that the least recently used interned tokens are forgotten beyond the limit."""
+        monkeypatch.setattr(tokens, "MAX_INTERNED_TOKENS", 3)
+        monkeypatch.setattr(tokens, "_interned", type(tokens._interned)())
+        first = Token.intern("Bitcoin", "BTC", 1.0)
+        for price in range(2, 4):
+            Token.intern("Bitcoin", "BTC", float(price))
+        assert Token.intern("Bitcoin", "BTC", 1.0) is first
+        # the price 2.0 is now the least recently used
+        Token.intern("Bitcoin", "BTC", 4.0)
+        assert len(tokens._interned) == 3
+        assert Token.intern("Bitcoin", "BTC", 1.0) is first
+        assert ("Bitcoin", "BTC", 2.0) not in tokens._interned
+        forgotten = Token.intern("Bitcoin", "BTC", 2.0)
+        assert forgotten == Token("Bitcoin", "BTC", 2.0)
+        assert len(tokens._interned) == 3
+
+    def test_interned_token_is_read_only(self):
+        """Test that a shared token cannot be changed under the transactions using it."""
+        tx1 = Transaction.from_dict({"sender": "Alice", "receiver": "Bob", "amount": 1.0, "timestamp": "2025-07-15T12:00:00",
+                                     "token": {"name": "Bitcoin", "symbol": "BTC", "value": 1.0}})
+        tx2 = Transaction.from_dict({"sender": "Bob", "receiver": "Carol", "amount": 2.0, "timestamp": "2025-07-15T12:00:00",
+                                     "token": {"name": "Bitcoin", "symbol": "BTC", "value": 1.0}})
+        assert tx1.token is tx2.token
+        txid = tx1.txid
+        for name, value in (("name", "Y"), ("symbol", "Y"), ("value", 2.0)):
+            with pytest.raises(AttributeError, match="Interned tokens are shared and cannot be modified"):
+                setattr(tx1.token, name, value)
+        assert tx2.token == Token("Bitcoin", "BTC", 1.0)
+        assert tx1.txid == txid
+        # a token of its own is still writable
+        token = Token("Bitcoin", "BTC", 1.0)
+        token.name = "Y"
+        assert token.name == "Y"
+
+    def test_token_intern_validates_types(self):
+        """Test that interning keeps the constructor's validation."""
+        with pytest.raises(TypeError, match="Token name must be a string"):
+            Token.intern(123, "BTC", 1.0)
+        with pytest.raises(TypeError, match="Token symbol must be a string"):
+            Token.intern("Bitcoin", ["BTC"], 1.0)
@@ -1,7 +1,9 @@
 import pytest
 import datetime
+import pickle
 from crypto.transactions import Transaction
 from crypto.tokens import Token
+from crypto.merkle import leaf_hash
 
 
 class TestTransaction:
@@ -100,4 +102,32 @@ class TestTransaction:
         
         # Should not raise an exception for negative amounts
         transaction = Transaction("Alice", "Bob", token, -5.0, timestamp)
-        assert transaction.amount == pytest.approx(-5.0) 
\ No newline at end of file
+        assert transaction.amount == pytest.approx(-5.0) 
+    
+    def test_transaction_has_no_dict(self):
+        """Test that transactions are slotted and still pickle."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        transaction = Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00")
+        assert not hasattr(transaction, "__dict__")
+        assert pickle.loads(pickle.dumps(transaction)) == transaction
+
+    def test_txid(self):
+        """Test that the txid is the Merkle leaf hash, cached and reset by the setters."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        transaction = Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00")
+        txid = transaction.txid
+        assert txid == leaf_hash(transaction).hex()
+        assert transaction.txid_bytes is transaction.txid_bytes
+        assert Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00").txid == txid
+        transaction.amount = 2.0
+        assert transaction.txid != txid
+        assert transaction.txid == leaf_hash(transaction).hex()
+
+    def test_txid_not_in_equality_nor_repr(self):
+        """Test that the cached txid does not change equality or the representation."""
+        token = Token("Bitcoin", "BTC", 1.0)
+        transaction = Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00")
+        other = Transaction("Alice", "Bob", token, 1.0, "2025-07-15T12:00:00")
+        transaction.txid
+        assert transaction == other
+        assert "txid" not in repr(transaction)